@@ -17,6 +17,7 @@ from flask_cors import CORS
 
 from .auth.auth import requires_auth, AuthError
 from .booklist import booklist_bp
+from .cli import cache_cli, curated_cli
 from .di import di_config
 from .exceptions.invalid_request_error import InvalidRequestError
 from .exceptions.json_error import json_error
@@ -24,6 +25,8 @@ from .models.book import Book
 from .models.book_dto import setup_db, db
 from .ny_times import ny_times_bp
 from .search import search_bp
+from .services.local_cache import local_cache_stats
+from .services.upstream_client import upstream_pool_stats
 from .curated_picks import curated_picks_bp
 
 from .models.curated_list import CuratedList
@@ -53,6 +56,9 @@ def create_app(test_config=None):
     app.register_blueprint(shelf_bp)
     app.register_blueprint(curated_picks_bp)
 
+    app.cli.add_command(cache_cli)
+    app.cli.add_command(curated_cli)
+
     @app.after_request
     def after_request(response):
         response.headers.add('Access-Control-Allow-Headers', 'Content-Type, Authorization')
@@ -63,6 +69,17 @@ def create_app(test_config=None):
     def index():
         return 'Healthy'
 
+    @app.route('/stats')
+    @requires_auth('stats:get')
+    def stats(_):
+        return jsonify({
+            "success": True,
+            "upstreams": upstream_pool_stats(),
+            "local_caches": local_cache_stats(),
+            "quotas": {di_config.isbndb_rate_limiter.name: di_config.isbndb_rate_limiter.usage()},
+            "circuits": {name: breaker.stats() for name, breaker in di_config.circuit_breakers.items()},
+        })
+
     @app.errorhandler(400)
     def not_there(error):
         return jsonify({
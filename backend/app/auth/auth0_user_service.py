@@ -1,12 +1,12 @@
 """This module provides an implementation of UserService for Auth0 users."""
 from os import environ as env
 
-import requests
 from flask import request
 
 from app.auth.user_service import UserService
 from app.exceptions.invalid_request_error import InvalidRequestError
 from app.models.user import User
+from app.services.upstream_client import UpstreamClient
 
 # or from your models root
 AUTH0_DOMAIN = env.get('AUTH0_DOMAIN')
@@ -15,9 +15,13 @@ AUTH0_DOMAIN = env.get('AUTH0_DOMAIN')
 class Auth0UserService(UserService):
     """Concrete implementation of UserService for Auth0 users."""
 
+    def __init__(self, http_client: UpstreamClient):
+        """Initializes the Auth0UserService with a pooled HTTP client for the Auth0 API."""
+        self.http_client = http_client
+
     def fetch_userinfo(self, token) -> dict:
         """Fetches user information from Auth0 using the provided token."""
-        resp = requests.get(
+        resp = self.http_client.get(
             f'https://{AUTH0_DOMAIN}/userinfo',
             headers={"Authorization": f"{token}"}
         )
@@ -0,0 +1,37 @@
+"""
+This module declares the `flask cache` and `flask curated` command groups.
+
+It provides commands to maintain the caches, e.g. `flask cache warm` as a deploy step, and the curated lists.
+"""
+from pathlib import Path
+
+import click
+from flask.cli import AppGroup
+
+from app.cli.cache import refresh_nyt, warm_cache
+from app.cli.curated import import_picks
+
+cache_cli = AppGroup('cache', help='Maintain the caches.')
+curated_cli = AppGroup('curated', help='Maintain the curated lists.')
+
+
+@cache_cli.command('warm')
+@click.option('--restart', is_flag=True, help='Warm every book again, ignoring the checkpoint of an interrupted run.')
+def warm(restart: bool):
+    """Fill the book cache with the books stored, shelved or picked, in rate-limited ISBNdb bulk batches."""
+    warm_cache(restart=restart)
+
+
+@cache_cli.command('refresh-nyt')
+@click.option('--once', is_flag=True, help='Check the lists once instead of running until interrupted.')
+def refresh_nyt_lists(once: bool):
+    """Keep the scheduled NYT bestsellers lists fresh, refreshing them ahead of their next publication."""
+    refresh_nyt(once=once)
+
+
+@curated_cli.command('import')
+@click.argument('list_id', type=int)
+@click.argument('file', type=click.Path(exists=True, dir_okay=False, path_type=Path))
+def import_curated_picks(list_id: int, file: Path):
+    """Add the picks of a CSV or JSON FILE to the curated list LIST_ID, in one transaction."""
+    import_picks(list_id=list_id, path=file)
@@ -0,0 +1,95 @@
+"""
+This module provides the cache maintenance commands.
+
+Used by the `flask cache` command group.
+"""
+import click
+import inject
+import requests
+from sqlalchemy import select, union
+
+from app.config import CACHE_WARM_CHECKPOINT_EXPIRY_TIME, ISBNDB_BULK_CHUNK_SIZE
+from app.exceptions.invalid_request_error import InvalidRequestError
+from app.models.book_dto import BookDto, db
+from app.models.book_shelf import BookShelf
+from app.models.curated_pick import CuratedPick
+from app.redis_config import redis_cache_client
+from app.services.book_service_base import BookServiceBase
+from app.di import di_config
+from app.services.cache_warmer import CacheWarmer
+from app.utils.isbn_utils import to_isbn13
+
+
+@inject.params(book_service=BookServiceBase)
+def warm_cache(restart: bool, book_service: BookServiceBase):
+    """
+    Warms the book cache with the distinct ISBNs of the books, book_shelves and curated_picks tables.
+
+    An interrupted run resumes after the last warmed batch, unless restarted.
+    :param restart: ignores the checkpoint of an interrupted run.
+    :param book_service: BookServiceBase instance provided by the dependency injector.
+    """
+    warmer = CacheWarmer(
+        book_service=book_service,
+        redis_client=redis_cache_client,
+        batch_size=ISBNDB_BULK_CHUNK_SIZE,
+        checkpoint_ttl=CACHE_WARM_CHECKPOINT_EXPIRY_TIME,
+    )
+
+    isbn13s = _collect_isbn13s()
+    pending = warmer.pending(isbn13s, restart=restart)
+    click.echo(f'{len(isbn13s)} books, {len(isbn13s) - len(pending)} already warmed by an interrupted run.')
+
+    try:
+        with click.progressbar(length=len(pending), label='Warming books') as progress:
+            finished = warmer.warm(pending, on_batch=progress.update)
+
+    except InvalidRequestError as e:
+        raise click.ClickException(f'{e.message} Run the command again to resume.')
+
+    except requests.RequestException as e:
+        raise click.ClickException(f'{e} Run the command again to resume.')
+
+    if not finished:
+        raise click.ClickException('ISBNdb is unavailable. Run the command again to resume.')
+
+    click.echo('Book cache warmed.')
+
+
+def refresh_nyt(once: bool):
+    """
+    Runs a NYT refresh scheduler, which refreshes the lists only while elected leader among the running ones.
+
+    :param once: checks the lists once instead of running until interrupted.
+    """
+    scheduler = di_config.create_nyt_refresh_scheduler()
+    if not once:
+        click.echo(f'Keeping {len(scheduler.paths)} NYT lists fresh, checking every {scheduler.interval} s.')
+        try:
+            scheduler.run_forever()
+        except KeyboardInterrupt:
+            pass
+        return
+
+    try:
+        refreshed = scheduler.run_once()
+        leading = scheduler.is_leader
+    finally:
+        scheduler.resign()
+
+    if leading:
+        click.echo(f'{len(refreshed)} NYT lists refreshed.')
+    else:
+        click.echo('Another scheduler is leading, nothing refreshed.')
+
+
+def _collect_isbn13s() -> set[str]:
+    """Returns the distinct ISBN-13s stored, shelved or picked, curated picks stored with an ISBN-10 converted."""
+    statement = union(
+        select(BookDto.isbn13),
+        select(BookShelf.isbn13),
+        select(CuratedPick.isbn13).where(CuratedPick.isbn13.is_not(None)),
+        select(CuratedPick.isbn10).where(CuratedPick.isbn13.is_(None)),
+    )
+    isbns = db.session.execute(statement).scalars().all()
+    return {isbn13 for isbn13 in map(to_isbn13, isbns) if isbn13}
@@ -0,0 +1,37 @@
+"""
+This module provides the curated lists maintenance commands.
+
+Used by the `flask curated` command group.
+"""
+import json
+from pathlib import Path
+
+import click
+
+from app.curated_picks.curated_picks import import_curated_picks, pick_rows_from_csv, pick_rows_from_json
+from app.exceptions.invalid_request_error import InvalidRequestError
+
+
+def import_picks(list_id: int, path: Path):
+    """
+    Adds the picks of a JSON or CSV file to a curated list in one transaction, reporting the rows not added.
+
+    :param list_id: ID of the curated list.
+    :param path: .csv file with a header row naming the columns 'isbn13', 'isbn10' and 'position',
+    or JSON file holding {"picks": [...]}.
+    """
+    data = path.read_text(encoding='utf-8')
+    try:
+        rows = pick_rows_from_csv(data) if path.suffix.lower() == '.csv' else pick_rows_from_json(json.loads(data))
+        picks, errors = import_curated_picks(list_id, rows)
+
+    except json.JSONDecodeError as e:
+        raise click.ClickException(f'{path} is not valid JSON: {e}')
+
+    except InvalidRequestError as e:
+        raise click.ClickException(e.message)
+
+    for error in errors:
+        click.echo(f'Row {error["row"]}: {error["message"]}', err=True)
+
+    click.echo(f'{len(picks)} picks added to list {list_id}, {len(errors)} rows skipped.')
@@ -2,12 +2,138 @@ BASE_URL = 'https://api2.isbndb.com'
 
 SEARCH_ENDPOINT = f"{BASE_URL}/books/"
 GET_BOOK_ENDPOINT = f"{BASE_URL}/book/"
+BULK_BOOKS_ENDPOINT = f"{BASE_URL}/books"
+
+# Maximum ISBNs per bulk request; the ISBNdb basic plan accepts up to 100.
+ISBNDB_BULK_CHUNK_SIZE = 100
+# Bulk requests of one call running at once, e.g. when assembling a large curated list.
+ISBNDB_BULK_CONCURRENCY = 4
+# Threads of a worker running the blocking calls of the async services, shared by the requests of the worker.
+ASYNC_SERVICE_THREADS = 16
+# Seconds a curated picks response waits for its books; picks not resolved by then are flagged as failed.
+CURATED_PICKS_DEADLINE = 3
+# Seconds the assembled response of a curated list is kept; curator changes invalidate it right away,
+# the expiry only bounds how long the details of its books may lag behind.
+CURATED_LIST_EXPIRY_TIME = 3600
+# Longest sort key of a curated pick; a move needing a longer key rebalances the keys of the whole list instead.
+# Keys grow by a digit every 5 or so moves to the same spot, so a list is rarely rebalanced.
+CURATED_PICK_SORT_KEY_MAX_LENGTH = 16
+# Most rows of a curated picks import, all written by a single INSERT.
+CURATED_PICKS_IMPORT_MAX_ROWS = 1000
+
+# Seconds the checkpoint of an interrupted `flask cache warm` run is kept, the next run resumes after it.
+CACHE_WARM_CHECKPOINT_EXPIRY_TIME = 86400
+
+# ISBNdb plan limits, enforced by a token bucket in Redis shared by every worker and node.
+# Calls over ISBNDB_RATE_LIMIT per second queue for up to RATE_LIMIT_MAX_WAIT seconds, then are answered 429,
+# as are the calls over ISBNDB_DAILY_QUOTA per UTC day (0 for no quota). The daily ledgers of calls per
+# endpoint are kept for QUOTA_LEDGER_EXPIRY_TIME seconds.
+ISBNDB_RATE_LIMIT = 1
+ISBNDB_RATE_BURST = 1
+ISBNDB_DAILY_QUOTA = 2000
+RATE_LIMIT_MAX_WAIT = 5
+QUOTA_LEDGER_EXPIRY_TIME = 691200
 
 NY_TIMES_BOOKS_LIST_URL = 'https://api.nytimes.com/svc/books/v3/lists/'
 FICTION_PATH = 'combined-print-and-e-book-fiction.json'
 NON_FICTION_PATH = 'combined-print-and-e-book-nonfiction.json'
+# One call returns the catalog of the current lists; their books are fetched in full from their own endpoint.
+NYT_OVERVIEW_PATH = 'overview.json'
+
+# NYT lists are fresh until their next_published_date; `flask cache refresh-nyt` refreshes the NYT_SCHEDULED_PATHS
+# lists NYT_REFRESH_AHEAD_TIME seconds before, checking every NYT_REFRESH_INTERVAL seconds, so readers never wait
+# on NYT. Only the leader among the running schedulers refreshes; its leadership lapses after NYT_REFRESH_LEADER_TTL.
+# A refreshed list is not refreshed again for NYT_REFRESH_RETRY_TIME, as NYT answers an early refresh with the
+# same next_published_date. Any other list is fetched on its first request, and again once stale.
+NYT_SCHEDULED_PATHS = (FICTION_PATH, NON_FICTION_PATH)
+NYT_REFRESH_INTERVAL = 60
+NYT_REFRESH_AHEAD_TIME = 900
+NYT_REFRESH_LEADER_TTL = 180
+NYT_REFRESH_RETRY_TIME = 3600
 
 DEFAULT_PAGE = 1
 DEFAULT_LIMIT = 20
 
+# Page sizes whose pages of the NYT bestsellers lists are encoded ahead, whenever a list is cached.
+# Pages of other sizes are sliced from the decoded list.
+NYT_PRECOMPUTED_PAGE_LIMITS = (10, DEFAULT_LIMIT)
+
 REDIS_EXPIRY_TIME = 3600
+# ISBNdb search pages change more often than book details, so they expire sooner.
+SEARCH_CACHE_EXPIRY_TIME = 300
+
+# Redis cache format: keys are namespaced as '<prefix>:<kind>:v<version>:<id>'.
+# Bump CACHE_SCHEMA_VERSION whenever the encoded field layout changes.
+CACHE_KEY_PREFIX = 'adb'
+CACHE_SCHEMA_VERSION = 2
+# Stale-while-revalidate: entries stay fresh for their TTL, spread by +/- CACHE_TTL_JITTER,
+# then are served stale and refreshed in the background. Redis only drops them CACHE_STALE_FACTOR times their TTL
+# later, at most CACHE_STALE_MAX_TIME seconds, which only happens when every refresh failed meanwhile;
+# e.g. a book fresh for an hour is served stale for four, a search page fresh for five minutes for twenty.
+CACHE_TTL_JITTER = 0.1
+CACHE_STALE_FACTOR = 4
+CACHE_STALE_MAX_TIME = 86400
+BACKGROUND_REFRESH_WORKERS = 2
+BACKGROUND_REFRESH_LOCK_TTL = 30
+# Encoded payloads larger than this many bytes are zlib compressed.
+CACHE_COMPRESSION_THRESHOLD = 512
+
+# Negative cache of the ISBNs ISBNdb answered as not found, kept in Redis and in an in-process Bloom filter.
+# The filter wrongly rejects about MISSING_ISBNS_FILTER_ERROR_RATE of the lookups once it holds its capacity,
+# and is cleared every NEGATIVE_CACHE_EXPIRY_TIME seconds like the Redis entries.
+NEGATIVE_CACHE_EXPIRY_TIME = 21600
+MISSING_ISBNS_FILTER_CAPACITY = 100000
+MISSING_ISBNS_FILTER_ERROR_RATE = 0.0001
+
+# Request coalescing for cache misses: the Redis lock expires after SINGLE_FLIGHT_LOCK_TTL seconds,
+# workers not holding it poll the cache for up to SINGLE_FLIGHT_WAIT_TIME seconds.
+SINGLE_FLIGHT_LOCK_TTL = 15
+SINGLE_FLIGHT_WAIT_TIME = 2
+SINGLE_FLIGHT_POLL_INTERVAL = 0.05
+
+# In-process (L1) cache kept by each worker in front of Redis.
+LOCAL_CACHE_MAX_ENTRIES = 1024
+LOCAL_CACHE_EXPIRY_TIME = 60
+LOCAL_CACHE_INVALIDATION_CHANNEL = 'adb:cache:invalidate'
+
+# Per-user index of the shelf of every book, annotating list responses in one Redis lookup.
+# Kept in sync by the shelf endpoints, and rebuilt from the database once expired.
+SHELF_INDEX_EXPIRY_TIME = 86400
+
+# Upstream HTTP clients, one pooled session per upstream host.
+# Timeouts are in seconds; pool_maxsize bounds the kept-alive connections per host.
+# Failed upstream attempts (connection errors, timeouts, 429 and 5xx answers) are retried UPSTREAM_RETRIES times,
+# after a random delay of up to UPSTREAM_RETRY_BASE_DELAY * 2^attempt seconds, capped at UPSTREAM_RETRY_MAX_DELAY.
+# After CIRCUIT_BREAKER_FAILURE_THRESHOLD failed calls in a row the upstream circuit opens: calls fail fast and
+# responses are served from cached or persisted data, flagged as degraded, until a probe call succeeds
+# CIRCUIT_BREAKER_RESET_TIMEOUT seconds later.
+UPSTREAM_RETRIES = 2
+UPSTREAM_RETRY_BASE_DELAY = 0.2
+UPSTREAM_RETRY_MAX_DELAY = 2
+CIRCUIT_BREAKER_FAILURE_THRESHOLD = 5
+CIRCUIT_BREAKER_RESET_TIMEOUT = 30
+
+ISBNDB_UPSTREAM = 'isbndb'
+NY_TIMES_UPSTREAM = 'ny_times'
+AUTH0_UPSTREAM = 'auth0'
+
+UPSTREAMS = {
+    ISBNDB_UPSTREAM: {
+        'connect_timeout': 3.05,
+        'read_timeout': 10,
+        'pool_connections': 1,
+        'pool_maxsize': 10,
+    },
+    NY_TIMES_UPSTREAM: {
+        'connect_timeout': 3.05,
+        'read_timeout': 10,
+        'pool_connections': 1,
+        'pool_maxsize': 4,
+    },
+    AUTH0_UPSTREAM: {
+        'connect_timeout': 3.05,
+        'read_timeout': 5,
+        'pool_connections': 1,
+        'pool_maxsize': 4,
+    },
+}
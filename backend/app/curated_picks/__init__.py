@@ -1,5 +1,5 @@
 """This module provides a Flask blueprint for handling curated_picks routes."""
-from flask import Blueprint, request
+from flask import Blueprint, current_app, request
 from flask_cors import cross_origin
 
 from app.auth.auth import requires_auth
@@ -11,6 +11,8 @@ from app.curated_picks.curated_picks import (store_curated_list,
                                              delete_curated_list_by_id,
                                              delete_curated_pick_by_id,
                                              update_curated_pick_position,
+                                             store_curated_list_order,
+                                             store_curated_picks_import,
                                              )
 
 curated_picks_bp = Blueprint('curated_picks', __name__)
@@ -55,6 +57,32 @@ def delete_curated_list(_, list_id: int):
     return delete_curated_list_by_id(list_id)
 
 
+@curated_picks_bp.route('/curated-list/<int:list_id>/order', methods=['PUT'])
+@cross_origin()
+@requires_auth('booklist:curator')
+def reorder_curated_list(_, list_id: int):
+    """
+    Applies a whole new ordering of the picks of a curated list.
+
+    :return: JSON array of the picks in their new order if the request is successful, or aborts with an error response.
+    :rtype: dict or flask.Response
+    """
+    return store_curated_list_order(list_id, request)
+
+
+@curated_picks_bp.route('/curated-list/<int:list_id>/picks', methods=['POST'])
+@cross_origin()
+@requires_auth('booklist:curator')
+def add_curated_picks(_, list_id: int):
+    """
+    Adds many picks to a curated list at once, from JSON or CSV.
+
+    :return: JSON object of the added picks and of the errors of the rows not added, or aborts with an error response.
+    :rtype: dict or flask.Response
+    """
+    return store_curated_picks_import(list_id, request)
+
+
 @curated_picks_bp.route('/curated-lists')
 @cross_origin()
 @requires_auth('booklist:get')
@@ -110,11 +138,15 @@ def delete_curated_pick(_, pick_id: str):
 @curated_picks_bp.route('/curated-picks')
 @cross_origin()
 @requires_auth('booklist:get')
-def fetch_curated_picks(_):
+def fetch_curated_picks(payload):
     """
     Fetches curated picks.
 
     :return: JSON array of curated picks if the request is successful, or aborts with an error response.
     :rtype: list or flask.Response
     """
-    return get_curated_picks(lambda: request.args.get('list_id', type=int))
+    return current_app.ensure_sync(get_curated_picks)(
+        lambda: request.args.get('list_id', type=int),
+        request=request,
+        user_id=payload.get('sub'),
+    )
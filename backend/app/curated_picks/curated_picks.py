@@ -3,16 +3,26 @@ This module provides methods for managing curated lists and picks in a book appl
 
 It provides logic for the curated list and pick endpoints
 """
+import csv
+import io
+
 import inject
 from flask import abort, jsonify, Request
 from sqlalchemy import or_
 
+from app.config import CURATED_PICKS_DEADLINE, CURATED_PICKS_IMPORT_MAX_ROWS
 from app.exceptions.invalid_request_error import InvalidRequestError
-from app.models.book_dto import db
+from app.models.book_dto import BookDto, BookResponse, db
 from app.models.curated_list import CuratedList, CuratedListRequest
 from app.models.curated_pick import CuratedPickRequest, CuratedPick
-from app.services.book_service_base import BookServiceBase
-from app.utils.isbn_utils import is_valid_isbn
+from app.pagination.books import get_page_and_limit
+from app.services.async_book_service_base import AsyncBookServiceBase
+from app.services.cache_codec import page_field
+from app.services.curated_list_cache import CuratedListCache
+from app.services.shelf_index import ShelfIndex
+from app.utils.isbn_utils import is_valid_isbn, to_isbn13
+from app.utils.json_body import json_body_response, to_json_bytes
+from app.utils.sort_key_utils import is_sort_key
 
 
 def store_curated_list(request: Request):
@@ -57,12 +67,15 @@ def store_curated_list(request: Request):
         abort(422)
 
 
-def store_curated_list_update(request: Request):
+@inject.params(curated_list_cache=CuratedListCache)
+def store_curated_list_update(request: Request, curated_list_cache: CuratedListCache):
     """
     Updates a curated list.
 
     :param request:
     :type request: Request
+    :param curated_list_cache: CuratedListCache whose response of the list is invalidated
+    :type curated_list_cache: CuratedListCache
     :return: updated curated list JSON object if the request is successful, or aborts with an error response.
     """
     try:
@@ -75,6 +88,7 @@ def store_curated_list_update(request: Request):
                 curated_list.description = curated_list_request.description
 
                 curated_list.update()
+                curated_list_cache.bump(curated_list.id)
 
                 return jsonify({
                     "success": True,
@@ -91,12 +105,15 @@ def store_curated_list_update(request: Request):
         raise e
 
 
-def delete_curated_list_by_id(list_id: int):
+@inject.params(curated_list_cache=CuratedListCache)
+def delete_curated_list_by_id(list_id: int, curated_list_cache: CuratedListCache):
     """
     Deletes a curated list by ID.
 
     :param list_id: ID of the curated list to delete.
     :type list_id: int
+    :param curated_list_cache: CuratedListCache whose response of the list is invalidated
+    :type curated_list_cache: CuratedListCache
     :return: 204 status code if the request is successful, or aborts with an error response.
     :rtype: dict or flask.Response
     """
@@ -105,6 +122,7 @@ def delete_curated_list_by_id(list_id: int):
 
         if curated_list:
             curated_list.delete()
+            curated_list_cache.bump(list_id)
             return "", 204  # RESTful standard for successful DELETE
 
         else:
@@ -119,6 +137,184 @@ def delete_curated_list_by_id(list_id: int):
         abort(500)
 
 
+@inject.params(curated_list_cache=CuratedListCache)
+def store_curated_list_order(list_id: int, request: Request, curated_list_cache: CuratedListCache):
+    """
+    Applies a whole new ordering of the picks of a curated list, see CuratedPick.reorder.
+
+    :param list_id: ID of the curated list.
+    :type list_id: int
+    :param request: Request object which contains the JSON payload "picks", the ISBN-10 or ISBN-13 of every pick
+    of the list in its new order
+    :type request: Request
+    :param curated_list_cache: CuratedListCache whose response of the list is invalidated
+    :type curated_list_cache: CuratedListCache
+    :return: JSON array of the picks in their new order if the request is successful, or aborts with an error response.
+    :rtype: flask.Response
+    """
+    try:
+        if not request.is_json:
+            raise InvalidRequestError(code=404, message='Content type is not supported.')
+
+        pick_ids = request.get_json().get('picks')
+        if not isinstance(pick_ids, list) or not all(isinstance(pick_id, str) for pick_id in pick_ids):
+            raise InvalidRequestError(code=422, message="'picks' must be a list of ISBN-10 or ISBN-13.")
+
+        _validate_list_exist_or_404(list_id)
+
+        try:
+            picks = CuratedPick.reorder(list_id, [to_isbn13(pick_id) or pick_id for pick_id in pick_ids])
+        except ValueError as e:
+            raise InvalidRequestError(code=422, message=str(e))
+
+        curated_list_cache.bump(list_id)
+
+        return jsonify({
+            "success": True,
+            "picks": [CuratedPickRequest.from_model(pick).to_dict() for pick in picks],
+        })
+
+    except InvalidRequestError as e:
+        raise e
+
+    except Exception as e:
+        print(f'🧨 {e}')
+        db.session.rollback()
+        abort(500)
+
+
+def store_curated_picks_import(list_id: int, request: Request):
+    """
+    Adds many picks to a curated list at once, see import_curated_picks.
+
+    :param list_id: ID of the curated list.
+    :type list_id: int
+    :param request: Request object whose body is either JSON, {"picks": [{"isbn13", "isbn10", "position"}, ...]},
+    or CSV (text/csv) with a header row naming the same columns
+    :type request: Request
+    :return: JSON object of the added picks and of the errors of the rows not added, 201 if any pick was added,
+    else 422; or aborts with an error response.
+    :rtype: flask.Response
+    """
+    try:
+        if request.is_json:
+            rows = pick_rows_from_json(request.get_json())
+        elif request.mimetype == 'text/csv':
+            rows = pick_rows_from_csv(request.get_data(as_text=True))
+        else:
+            raise InvalidRequestError(code=404, message='Content type is not supported.')
+
+        picks, errors = import_curated_picks(list_id, rows)
+
+        return jsonify({
+            "success": not errors,
+            "picks": [_import_pick_to_dict(pick) for pick in picks],
+            "errors": errors,
+        }), 201 if picks else 422
+
+    except InvalidRequestError as e:
+        raise e
+
+    except Exception as e:
+        print(f'🧨 {e}')
+        db.session.rollback()
+        abort(500)
+
+
+@inject.params(curated_list_cache=CuratedListCache)
+def import_curated_picks(
+        list_id: int,
+        rows: list[dict],
+        curated_list_cache: CuratedListCache,
+) -> tuple[list[CuratedPick], list[dict]]:
+    """
+    Adds many picks to a curated list in one transaction, with a single INSERT.
+
+    The rows are validated in one pass and the books already picked are found with a single query.
+    A row that is invalid, repeats an earlier row or names a book already picked is reported, not added,
+    and does not stop the other rows.
+
+    :param list_id: ID of the curated list.
+    :param rows: picks to add, dictionaries with 'isbn13' and/or 'isbn10', and an optional 'position' from 1;
+    picks without a position are added last, in order.
+    :param curated_list_cache: CuratedListCache whose response of the list is invalidated.
+    :return: the added picks, with their ID and position; and the errors of the other rows,
+    as {"row": number from 1, "message": ...}.
+    :raise InvalidRequestError: if the list does not exist or there are too many rows.
+    """
+    if len(rows) > CURATED_PICKS_IMPORT_MAX_ROWS:
+        raise InvalidRequestError(code=422, message=f'At most {CURATED_PICKS_IMPORT_MAX_ROWS} picks can be imported at once.')
+
+    _validate_list_exist_or_404(list_id)
+
+    errors = []
+    pick_requests = {}
+    isbn13s = set()
+    for row_number, row in enumerate(rows, start=1):
+        try:
+            pick_request = _read_import_row(list_id, row)
+        except ValueError as e:
+            errors.append({"row": row_number, "message": str(e)})
+            continue
+
+        if pick_request.isbn13 in isbn13s:
+            errors.append({"row": row_number, "message": "The pick is repeated in an earlier row."})
+            continue
+
+        isbn13s.add(pick_request.isbn13)
+        pick_requests[row_number] = pick_request
+
+    existing = _get_picks_by_isbns(list(pick_requests.values()))
+    picks = []
+    for row_number, pick_request in pick_requests.items():
+        if pick_request.isbn13 in existing:
+            message = f"The book is already picked in list {existing[pick_request.isbn13].list_id}."
+            errors.append({"row": row_number, "message": message})
+            continue
+
+        picks.append(CuratedPick(
+            list_id=list_id,
+            isbn13=pick_request.isbn13,
+            isbn10=pick_request.isbn10,
+            position=pick_request.position,
+        ))
+
+    if picks:
+        CuratedPick.insert_all(list_id, picks)
+        curated_list_cache.bump(list_id)
+
+    return picks, sorted(errors, key=lambda error: error["row"])
+
+
+def pick_rows_from_json(payload) -> list[dict]:
+    """
+    Reads the rows of a curated picks import from its JSON payload.
+
+    :param payload: JSON object, {"picks": [{"isbn13", "isbn10", "position"}, ...]}.
+    :return: the rows, as given.
+    :raise InvalidRequestError: if the payload does not hold a list of objects.
+    """
+    rows = payload.get('picks') if isinstance(payload, dict) else None
+    if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+        raise InvalidRequestError(code=422, message="'picks' must be a list of objects.")
+
+    return rows
+
+
+def pick_rows_from_csv(data: str) -> list[dict]:
+    """
+    Reads the rows of a curated picks import from CSV.
+
+    :param data: CSV whose header row names the columns 'isbn13', 'isbn10' and 'position', in any order;
+    empty cells are missing values.
+    :return: a dictionary per data row.
+    """
+    return [
+        {column: value for column, value in row.items() if column and value}
+        for row in csv.DictReader(io.StringIO(data))
+    ]
+
+
 def get_curated_lists():
     """
     Fetches curated picks.
@@ -141,10 +337,13 @@ def get_curated_lists():
         abort(500)
 
 
-def store_curated_pick(request: Request):
+@inject.params(curated_list_cache=CuratedListCache)
+def store_curated_pick(request: Request, curated_list_cache: CuratedListCache):
     """
     Adds a curated pick.
 
+    The materialized response of its list in curated_list_cache is invalidated.
+
     :return: JSON object of the added curated pick if the request is successful, or aborts with an error response.
     :rtype: dict or flask.Response
     """
@@ -162,7 +361,9 @@ def store_curated_pick(request: Request):
                 )
 
                 curated_pick.insert()
+                curated_list_cache.bump(curated_pick_request.list_id)
                 curated_pick_request.id = curated_pick.id
+                curated_pick_request.position = curated_pick.position
 
                 return jsonify({
                     "success": True,
@@ -186,17 +387,20 @@ def store_curated_pick(request: Request):
         abort(422)
 
 
-def delete_curated_pick_by_id(pick_id: str):
+@inject.params(curated_list_cache=CuratedListCache)
+def delete_curated_pick_by_id(pick_id: str, curated_list_cache: CuratedListCache):
     """
     Deletes a curated pick by ID.
 
     :param pick_id: ID of the curated pick to delete.
     :type pick_id: str, expected an ISBN10 or ISBN13
+    :param curated_list_cache: CuratedListCache whose response of the pick's list is invalidated
+    :type curated_list_cache: CuratedListCache
     :return: 204 status code if the request is successful, or aborts with an error response.
     :rtype: flask.Response
     """
     try:
-        return _delete_pick_by_id(pick_id)
+        return _delete_pick_by_id(pick_id, curated_list_cache)
     except InvalidRequestError as e:
         raise e
 
@@ -206,7 +410,8 @@ def delete_curated_pick_by_id(pick_id: str):
         abort(500)
 
 
-def update_curated_pick_position(pick_id: str, request: Request):
+@inject.params(curated_list_cache=CuratedListCache)
+def update_curated_pick_position(pick_id: str, request: Request, curated_list_cache: CuratedListCache):
     """
     Updates a curated pick.
 
@@ -214,13 +419,19 @@ def update_curated_pick_position(pick_id: str, request: Request):
     :type pick_id: str, expected an ISBN10 or ISBN13
     :param request: Request object
     :type request: Request
+    :param curated_list_cache: CuratedListCache whose response of the pick's list is invalidated
+    :type curated_list_cache: CuratedListCache
     :return: JSON object of the updated curated pick if the request is successful, or aborts with an error response.
     :rtype: flask.Response
     """
     try:
         if request.is_json:
             new_position = request.get_json().get('position')
-            return _update_pick_position(pick_id=pick_id, new_position=new_position)
+            return _update_pick_position(
+                pick_id=pick_id,
+                new_position=new_position,
+                curated_list_cache=curated_list_cache,
+            )
 
     except InvalidRequestError as e:
         raise e
@@ -231,39 +442,52 @@ def update_curated_pick_position(pick_id: str, request: Request):
         abort(422)
 
 
-@inject.params(book_service=BookServiceBase)
-def get_curated_picks(list_id_func: callable, book_service: BookServiceBase):
+@inject.params(book_service=AsyncBookServiceBase, shelf_index=ShelfIndex, curated_list_cache=CuratedListCache)
+async def get_curated_picks(
+        list_id_func: callable,
+        request: Request,
+        user_id: str,
+        book_service: AsyncBookServiceBase,
+        shelf_index: ShelfIndex,
+        curated_list_cache: CuratedListCache,
+):
     """
-    Fetches curated picks.
-
+    Fetches curated picks, the whole list or, given 'page', 'limit' or 'cursor', a page of it.
+
+    A page is read with a range scan of the picks of the list and only its books are fetched, so a page of a long list
+    loads in time proportional to the page. The 'next_cursor' of a page starts the next one right after it,
+    without reading the picks before, only counting them in the index.
+    The assembled response of every list and page is materialized in CuratedListCache, so a read is a single cache
+    lookup until a curator changes the list. Degraded and partial responses are not materialized, nor the pages
+    a cursor starts off the page boundaries, e.g. after a pick was added.
+    The books on one of the user's shelves are annotated with their shelf.
     :return: JSON array of curated lists if the request is successful, or aborts with an error response.
     :rtype: lists or flask.Response
     """
     try:
         if list_id := list_id_func():
-            _validate_list_exist_or_404(list_id)
-
-            curated_picks = CuratedPick.find_by_list_id(list_id)
-
-            json_books = []
-            for cp in curated_picks:
-                book = book_service.fetch_book(None, isbn10=cp.isbn10, isbn13=cp.isbn13)
-                book["position"] = cp.position
-                if book:  # Ensure book data is valid
-                    json_books.append(book)
+            picks_page = _get_picks_page(request, list_id)
+            cacheable, cache_page = _picks_page_field(picks_page)
+            body, isbn13s, version = None, [], 0
+            if cacheable:
+                body, isbn13s, version = curated_list_cache.get(list_id, page=cache_page)
+            if body is None:
+                if cacheable and picks_page and picks_page[2]:
+                    # Counted again after reading the version, the page is only stored if it did not move meanwhile.
+                    recounted_page = _get_picks_page(request, list_id)
+                    cacheable = recounted_page == picks_page
+                    picks_page = recounted_page
+
+                response = await _assemble_curated_picks(list_id, book_service, picks_page)
+                body = to_json_bytes(response)
+                isbn13s = [book['isbn13'] for book in response['books'] if book.get('isbn13')]
+                if cacheable and not response.get('degraded') and not response.get('partial'):
+                    curated_list_cache.put(list_id, version, body, isbn13s, page=cache_page)
 
         else:
             raise InvalidRequestError(code=404, message='List ID is required.')
 
-        return jsonify(
-            {
-                'success': True,
-                'books': list(json_books),
-                'page': 1,
-                'limit': len(json_books),
-                'total_results': len(json_books)
-            }
-        )
+        return json_body_response(shelf_index.annotate_body(user_id, body, isbn13s))
 
     except InvalidRequestError as e:
         raise e
@@ -273,6 +497,124 @@ def get_curated_picks(list_id_func: callable, book_service: BookServiceBase):
         abort(500)
 
 
+async def _assemble_curated_picks(
+        list_id: int,
+        book_service: AsyncBookServiceBase,
+        picks_page: tuple[int, int, str | None] | None = None,
+) -> dict:
+    """
+    Assembles the curated picks response of a list or of a page of it, without the user's shelves.
+
+    The books are fetched concurrently for up to CURATED_PICKS_DEADLINE seconds. The picks are returned in position
+    order with whatever resolved in time; the picks whose book failed or timed out are returned with their ISBN
+    and "failed": true, and the response is flagged as partial, instead of failing the whole list.
+    While ISBNdb is unavailable, the picks not cached yet are filled in from the books stored in the database,
+    and the response is flagged as degraded.
+    :param list_id: ID of the curated list.
+    :param book_service: AsyncBookServiceBase instance.
+    :param picks_page: offset, limit and cursor of the page, see _get_picks_page; None for the whole list.
+    :return: the response as a dictionary.
+    """
+    _validate_list_exist_or_404(list_id)
+
+    if picks_page:
+        offset, limit, after = picks_page
+        curated_picks = CuratedPick.find_page(list_id, limit, offset=offset, after=after)
+    else:
+        curated_picks = CuratedPick.find_by_list_id(list_id)
+
+    books, failed = await book_service.fetch_books_within(
+        [_get_pick_isbn13(cp) for cp in curated_picks],
+        timeout=CURATED_PICKS_DEADLINE,
+    )
+    degraded = book_service.is_degraded()
+    if degraded:
+        books.update(_get_stored_books(
+            [_get_pick_isbn13(cp) for cp in curated_picks if _get_pick_isbn13(cp) not in books]
+        ))
+    failed = {isbn13 for isbn13 in failed if isbn13 not in books}
+
+    json_books = []
+    for cp in curated_picks:
+        isbn13 = _get_pick_isbn13(cp)
+        book = books.get(isbn13)
+        if book:  # Ensure book data is valid
+            book["position"] = cp.position
+            json_books.append(book)
+        elif isbn13 in failed:
+            json_books.append({"isbn13": isbn13, "position": cp.position, "failed": True})
+
+    if picks_page:
+        total_results = CuratedPick.count_by_list_id(list_id)
+        is_last_page = offset + len(curated_picks) >= total_results
+        response = {
+            'success': True,
+            'books': json_books,
+            'page': offset // limit + 1,
+            'limit': limit,
+            'total_results': total_results,
+            'next_cursor': None if is_last_page else curated_picks[-1].sort_key,
+        }
+    else:
+        response = {
+            'success': True,
+            'books': json_books,
+            'page': 1,
+            'limit': len(json_books),
+            'total_results': len(json_books)
+        }
+    if degraded:
+        response['degraded'] = True
+    if failed:
+        response['partial'] = True
+
+    return response
+
+
+def _get_picks_page(request: Request, list_id: int) -> tuple[int, int, str | None] | None:
+    """
+    Parses the 'page', 'limit' and 'cursor' query parameters of a curated picks request.
+
+    The cursor is the sort key of the last pick of the previous page; the picks up to it are counted,
+    so the positions of the page come from the list, not from the client.
+    :param list_id: ID of the curated list.
+    :return: the number of picks before the page, the limit and the sort key the cursor resumes after, if any;
+    None if none of them is given, for the whole list.
+    :raise InvalidRequestError: 400 if a parameter is not valid.
+    """
+    if not any(name in request.args for name in ('page', 'limit', 'cursor')):
+        return None
+
+    page, limit = get_page_and_limit(request)
+    cursor = request.args.get('cursor')
+    if not cursor:
+        return (page - 1) * limit, limit, None
+
+    if not is_sort_key(cursor):
+        raise InvalidRequestError(code=400, message="'cursor' is not valid.")
+
+    return CuratedPick.count_through(list_id, cursor), limit, cursor
+
+
+def _picks_page_field(picks_page: tuple[int, int, str | None] | None) -> tuple[bool, str | None]:
+    """
+    Returns the CuratedListCache field naming a page of curated picks.
+
+    A cursor page starting on a page boundary is the same as that page, and shares its field.
+    :param picks_page: offset, limit and cursor of the page, see _get_picks_page; None for the whole list.
+    :return: whether the response is materialized, False for a page starting off the page boundaries;
+    and its field, None for the whole list.
+    """
+    if picks_page is None:
+        return True, None
+
+    offset, limit, _ = picks_page
+    if offset % limit:
+        return False, None
+
+    return True, page_field(offset // limit + 1, limit)
+
+
 def _get_curated_pick_request_or_throw(json: dict) -> CuratedPickRequest:
     try:
         return CuratedPickRequest.from_json(d=json)
@@ -286,12 +628,14 @@ def _validate_list_exist_or_404(list_id):
         raise InvalidRequestError(code=404, message="The specified list does not exist.")
 
 
-def _delete_pick_by_id(pick_id: str):
+def _delete_pick_by_id(pick_id: str, curated_list_cache: CuratedListCache):
     """Returns the book ID based on the ISBN provided."""
     if is_valid_isbn(isbn10=pick_id, isbn13=pick_id):
         curated_pick = _get_pick_by_isbn(pick_id=pick_id)
         if curated_pick:
+            list_id = curated_pick.list_id
             curated_pick.delete()
+            curated_list_cache.bump(list_id)
             return "", 204  # RESTful standard for successful DELETE
         else:
             raise InvalidRequestError(code=404, message=f"The specified pick ID:'{pick_id}' does not exist.")
@@ -299,13 +643,14 @@ def _delete_pick_by_id(pick_id: str):
         raise InvalidRequestError(code=404, message=f"Incorrect pick ID format:'{pick_id}'. ISBN10 or ISBN13 expected.")
 
 
-def _update_pick_position(pick_id: str, new_position: int):
+def _update_pick_position(pick_id: str, new_position: int, curated_list_cache: CuratedListCache):
     """
     Updates the position of a curated pick.
 
-    Adjusts other picks in the range between the current and new positions.
+    Only the sort key of the pick is rewritten, the other picks keep theirs, see CuratedPick.move.
     :param pick_id: The ID of the pick (ISBN).
     :param new_position: The new position for the pick.
+    :param curated_list_cache: CuratedListCache whose response of the pick's list is invalidated.
     :return: JSON response indicating success.
     """
     # Validate the new position
@@ -322,38 +667,9 @@ def _update_pick_position(pick_id: str, new_position: int):
         # No changes needed
         return jsonify({"success": True, "pick": CuratedPickRequest.from_model(target_pick).to_dict()})
 
-    is_moving_up = new_position < current_position
-
-    # Use a placeholder to avoid conflicts
-    placeholder_position = -1
-    target_pick.position = placeholder_position
-    target_pick.update()
-
-    # Fetch only affected picks
-    affected_picks_query = CuratedPick.query.filter(CuratedPick.list_id == target_pick.list_id)
-
-    if is_moving_up:
-        affected_picks_query = affected_picks_query.filter(
-            CuratedPick.position >= new_position, CuratedPick.position < current_position
-        ).order_by(CuratedPick.position.desc())  # Process from bottom to top
-    else:
-        affected_picks_query = affected_picks_query.filter(
-            CuratedPick.position > current_position, CuratedPick.position <= new_position
-        ).order_by(CuratedPick.position.asc())  # Process from top to bottom
-
-    affected_picks = affected_picks_query.all()
-
-    # Update affected picks sequentially
-    for pick in affected_picks:
-        pick.position += 1 if is_moving_up else -1
-        pick.update()
-
-    # Update the target pick position
-    target_pick.position = new_position
-    target_pick.update()
-
-    # Commit all changes
-    db.session.commit()
+    # Place the target pick between its new neighbours
+    CuratedPick.move(target_pick, new_position)
+    curated_list_cache.bump(target_pick.list_id)
 
     try:
         json = CuratedPickRequest.from_model(target_pick).to_dict()
@@ -366,13 +682,80 @@ def _update_pick_position(pick_id: str, new_position: int):
     })
 
 
+def _read_import_row(list_id: int, row: dict) -> CuratedPickRequest:
+    """
+    Validates a row of a curated picks import.
+
+    :raise ValueError: if the ISBNs or the position are not valid.
+    """
+    position = _get_import_cell(row, 'position')
+    if position is not None:
+        if not position.isdigit() or int(position) < 1:
+            raise ValueError("Invalid position value.")
+        position = int(position)
+
+    return CuratedPickRequest(
+        list_id=list_id,
+        position=position,
+        isbn13=_get_import_cell(row, 'isbn13'),
+        isbn10=_get_import_cell(row, 'isbn10'),
+    )
+
+
+def _get_import_cell(row: dict, column: str) -> str | None:
+    """Returns a value of a row of a curated picks import as a string, None if missing or blank."""
+    value = row.get(column)
+    return (str(value).strip() or None) if value is not None else None
+
+
+def _import_pick_to_dict(pick: CuratedPick) -> dict:
+    """Returns the JSON object of a pick added by an import."""
+    pick_request = CuratedPickRequest.from_model(pick)
+    pick_request.id = pick.id
+    return pick_request.to_dict()
+
+
+def _get_picks_by_isbns(pick_requests: list[CuratedPickRequest]) -> dict[str, CuratedPick]:
+    """
+    Returns the existing picks of the books of the given picks, with a single query.
+
+    As _get_pick_by_isbn, picks stored with the ISBN-10 only are matched by the ISBN-10 given.
+    :param pick_requests: validated CuratedPickRequest objects.
+    :return: CuratedPick objects keyed by the ISBN-13 of their book.
+    """
+    if not pick_requests:
+        return {}
+
+    isbn13s = [pick_request.isbn13 for pick_request in pick_requests]
+    isbn10s = [pick_request.isbn10 for pick_request in pick_requests if pick_request.isbn10]
+    picks = CuratedPick.query.filter(
+        or_(CuratedPick.isbn13.in_(isbn13s), CuratedPick.isbn10.in_(isbn10s))
+    ).all()
+    return {_get_pick_isbn13(pick): pick for pick in picks}
+
+
+def _get_pick_isbn13(curated_pick: CuratedPick) -> str:
+    """Returns the ISBN-13 of a curated pick, derived from its ISBN-10 for picks stored without one."""
+    return curated_pick.isbn13 or to_isbn13(curated_pick.isbn10)
+
+
+def _get_stored_books(isbn13s: list[str]) -> dict[str, dict]:
+    """Returns the books stored in the database among the given ISBN-13s, keyed by ISBN-13."""
+    if not isbn13s:
+        return {}
+
+    books = BookDto.query.filter(BookDto.isbn13.in_(isbn13s)).all()
+    return {book.isbn13: BookResponse.from_dto(book).to_dict() for book in books}
+
+
 def _get_pick_by_isbn(pick_id):
     """
     Returns a CuratedPick object based on the ISBN provided.
 
+    An ISBN10 is looked up by its ISBN13, still matching picks stored with the ISBN10 only.
     :param pick_id: ISBN10 or ISBN13
     :return: CuratedPick object or None
     """
     return CuratedPick.query.filter(
-        or_(CuratedPick.isbn13 == pick_id, CuratedPick.isbn10 == pick_id)
+        or_(CuratedPick.isbn13 == (to_isbn13(pick_id) or pick_id), CuratedPick.isbn10 == pick_id)
     ).first()
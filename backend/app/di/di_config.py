@@ -1,16 +1,107 @@
 """This module is used to configure the dependency injection for the application."""
+from concurrent.futures import ThreadPoolExecutor
+
 import inject
+from flask import current_app
 from inject import Binder
 
 from app.auth.auth import Auth
 from app.auth.auth0_user_service import Auth0UserService
 from app.auth.auth_interface import AuthInterface
 from app.auth.user_service import UserService
-from app.redis_config import redis_client
+from app.config import (
+    ASYNC_SERVICE_THREADS,
+    AUTH0_UPSTREAM,
+    BACKGROUND_REFRESH_LOCK_TTL,
+    BACKGROUND_REFRESH_WORKERS,
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+    CIRCUIT_BREAKER_RESET_TIMEOUT,
+    CURATED_LIST_EXPIRY_TIME,
+    ISBNDB_DAILY_QUOTA,
+    ISBNDB_RATE_BURST,
+    ISBNDB_RATE_LIMIT,
+    ISBNDB_UPSTREAM,
+    LOCAL_CACHE_EXPIRY_TIME,
+    LOCAL_CACHE_MAX_ENTRIES,
+    MISSING_ISBNS_FILTER_CAPACITY,
+    MISSING_ISBNS_FILTER_ERROR_RATE,
+    NEGATIVE_CACHE_EXPIRY_TIME,
+    NY_TIMES_UPSTREAM,
+    NYT_REFRESH_AHEAD_TIME,
+    NYT_REFRESH_INTERVAL,
+    NYT_REFRESH_LEADER_TTL,
+    NYT_REFRESH_RETRY_TIME,
+    NYT_SCHEDULED_PATHS,
+    QUOTA_LEDGER_EXPIRY_TIME,
+    RATE_LIMIT_MAX_WAIT,
+    SHELF_INDEX_EXPIRY_TIME,
+    UPSTREAM_RETRIES,
+    UPSTREAM_RETRY_BASE_DELAY,
+    UPSTREAM_RETRY_MAX_DELAY,
+)
+from app.models.book_shelf import BookShelf
+from app.redis_config import redis_cache_client, redis_client
+from app.services.async_book_service import AsyncBookService
+from app.services.async_book_service_base import AsyncBookServiceBase
+from app.services.async_ny_times_service import AsyncNyTimesService
+from app.services.async_ny_times_service_base import AsyncNYTimesServiceBase
+from app.services.background_refresher import BackgroundRefresher
+from app.services.bloom_filter import BloomFilter
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.curated_list_cache import CuratedListCache
 from app.services.book_service import BookService
 from app.services.book_service_base import BookServiceBase
+from app.services.local_cache import LocalCache
 from app.services.ny_times_service import NyTimesService
 from app.services.ny_times_service_base import NYTimesServiceBase
+from app.services.nyt_refresh_scheduler import NytRefreshScheduler
+from app.services.nyt_snapshot_store import NytSnapshotStore
+from app.services.rate_limiter import RateLimiter
+from app.services.shelf_index import ShelfIndex
+from app.services.single_flight import SingleFlight
+from app.services.upstream_client import get_upstream_client
+
+# Shared by every service instance of this worker, the services themselves are created per injection.
+book_local_cache = LocalCache(
+    name='book',
+    redis_client=redis_client,
+    max_entries=LOCAL_CACHE_MAX_ENTRIES,
+    ttl=LOCAL_CACHE_EXPIRY_TIME,
+)
+book_single_flight = SingleFlight()
+missing_isbns = BloomFilter(
+    capacity=MISSING_ISBNS_FILTER_CAPACITY,
+    error_rate=MISSING_ISBNS_FILTER_ERROR_RATE,
+    max_age=NEGATIVE_CACHE_EXPIRY_TIME,
+)
+cache_refresher = BackgroundRefresher(
+    redis_client=redis_cache_client,
+    max_workers=BACKGROUND_REFRESH_WORKERS,
+    lock_ttl=BACKGROUND_REFRESH_LOCK_TTL,
+)
+isbndb_rate_limiter = RateLimiter(
+    redis_client=redis_cache_client,
+    name=ISBNDB_UPSTREAM,
+    rate=ISBNDB_RATE_LIMIT,
+    burst=ISBNDB_RATE_BURST,
+    daily_quota=ISBNDB_DAILY_QUOTA,
+    max_wait=RATE_LIMIT_MAX_WAIT,
+    ledger_ttl=QUOTA_LEDGER_EXPIRY_TIME,
+)
+# Threads are only started on first use, so each forked worker gets its own.
+async_service_executor = ThreadPoolExecutor(max_workers=ASYNC_SERVICE_THREADS, thread_name_prefix='async-service')
+# One breaker per upstream.
+circuit_breakers = {
+    name: CircuitBreaker(
+        name=name,
+        failure_threshold=CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+        reset_timeout=CIRCUIT_BREAKER_RESET_TIMEOUT,
+        retries=UPSTREAM_RETRIES,
+        retry_base_delay=UPSTREAM_RETRY_BASE_DELAY,
+        retry_max_delay=UPSTREAM_RETRY_MAX_DELAY,
+    )
+    for name in (ISBNDB_UPSTREAM, NY_TIMES_UPSTREAM)
+}
 
 
 def create_book_service() -> BookServiceBase:
@@ -20,7 +111,16 @@ def create_book_service() -> BookServiceBase:
     Allows lazy loading of the BookService instance.
     :return: implementation of BookServiceBase
     """
-    return BookService(redis_client)
+    return BookService(
+        redis_client=redis_cache_client,
+        http_client=get_upstream_client(ISBNDB_UPSTREAM),
+        local_cache=book_local_cache,
+        single_flight=book_single_flight,
+        refresher=cache_refresher,
+        missing_isbns=missing_isbns,
+        rate_limiter=isbndb_rate_limiter,
+        circuit_breaker=circuit_breakers[ISBNDB_UPSTREAM],
+    )
 
 
 def create_nyt_book_service() -> NYTimesServiceBase:
@@ -30,7 +130,48 @@ def create_nyt_book_service() -> NYTimesServiceBase:
     Allows lazy loading of the BookService instance.
     :return: implementation of BookServiceBase
     """
-    return NyTimesService(redis_client)
+    return NyTimesService(
+        redis_client=redis_cache_client,
+        http_client=get_upstream_client(NY_TIMES_UPSTREAM),
+        refresher=cache_refresher,
+        circuit_breaker=circuit_breakers[NY_TIMES_UPSTREAM],
+        snapshot_store=NytSnapshotStore(current_app._get_current_object()),
+    )
+
+
+def create_nyt_refresh_scheduler() -> NytRefreshScheduler:
+    """
+    Create the NytRefreshScheduler keeping the scheduled NYT lists fresh.
+
+    :return: NytRefreshScheduler
+    """
+    return NytRefreshScheduler(
+        nyt_service=create_nyt_book_service(),
+        redis_client=redis_cache_client,
+        paths=NYT_SCHEDULED_PATHS,
+        interval=NYT_REFRESH_INTERVAL,
+        refresh_ahead=NYT_REFRESH_AHEAD_TIME,
+        leader_ttl=NYT_REFRESH_LEADER_TTL,
+        retry_after=NYT_REFRESH_RETRY_TIME,
+    )
+
+
+def create_async_book_service() -> AsyncBookServiceBase:
+    """
+    Create the AsyncBookService instance, running the BookService in the threads of this worker.
+
+    :return: implementation of AsyncBookServiceBase
+    """
+    return AsyncBookService(book_service=create_book_service(), executor=async_service_executor)
+
+
+def create_async_nyt_book_service() -> AsyncNYTimesServiceBase:
+    """
+    Create the AsyncNyTimesService instance, running the NyTimesService in the threads of this worker.
+
+    :return: implementation of AsyncNYTimesServiceBase
+    """
+    return AsyncNyTimesService(nyt_service=create_nyt_book_service(), executor=async_service_executor)
 
 
 def create_user_service() -> UserService:
@@ -40,7 +181,29 @@ def create_user_service() -> UserService:
     Allows lazy loading of the UserService instance.
     :return: implementation of UserService
     """
-    return Auth0UserService()
+    return Auth0UserService(get_upstream_client(AUTH0_UPSTREAM))
+
+
+def create_shelf_index() -> ShelfIndex:
+    """
+    Create the ShelfIndex of the shelves of the users' books.
+
+    :return: ShelfIndex
+    """
+    return ShelfIndex(
+        redis_client=redis_client,
+        load_shelves=BookShelf.find_shelves_by_user,
+        ttl=SHELF_INDEX_EXPIRY_TIME,
+    )
+
+
+def create_curated_list_cache() -> CuratedListCache:
+    """
+    Create the CuratedListCache of the assembled curated picks responses.
+
+    :return: CuratedListCache
+    """
+    return CuratedListCache(redis_client=redis_cache_client, ttl=CURATED_LIST_EXPIRY_TIME)
 
 def configure_dependencies(binder: Binder):
     """
@@ -52,6 +215,10 @@ def configure_dependencies(binder: Binder):
     binder.bind_to_provider(UserService, lambda: create_user_service())
     binder.bind_to_provider(BookServiceBase, lambda: create_book_service())
     binder.bind_to_provider(NYTimesServiceBase, lambda: create_nyt_book_service())
+    binder.bind_to_provider(AsyncBookServiceBase, lambda: create_async_book_service())
+    binder.bind_to_provider(AsyncNYTimesServiceBase, lambda: create_async_nyt_book_service())
+    binder.bind_to_provider(ShelfIndex, lambda: create_shelf_index())
+    binder.bind_to_provider(CuratedListCache, lambda: create_curated_list_cache())
 
 
 def initialize_di():
@@ -15,7 +15,7 @@ from sqlalchemy import (Column,
 from sqlalchemy.orm import mapped_column
 
 from app.models.book import _get_from_key_or_raise
-from app.utils.isbn_utils import is_valid_isbn
+from app.utils.isbn_utils import is_valid_isbn, is_valid_isbn13, to_isbn13
 
 ENV_FILE = find_dotenv()
 if ENV_FILE:
@@ -81,6 +81,11 @@ class BookDto(db.Model):
         return db.session.execute(stmt).scalars().all()
 
 
+def _canonical_isbn13(isbn10: str | None, isbn13: str | None) -> str | None:
+    """Returns the ISBN-13 if valid, otherwise the ISBN-13 of the ISBN-10."""
+    return isbn13 if is_valid_isbn13(isbn13) else to_isbn13(isbn10)
+
+
 @dataclass
 class BookResponse:
     """A class to represent a book with serialization to/from JSON and DTO."""
@@ -104,6 +109,7 @@ class BookResponse:
         """
         Create a Book object from a JSON dictionary.
 
+        The ISBN-13 is derived from the ISBN-10 if missing.
         :param d: Book JSON dictionary
         :return: Book object
         """
@@ -114,7 +120,7 @@ class BookResponse:
             raise ValueError('No ISBN found in JSON.')
 
         return cls(
-            isbn13=d.get('isbn13'),
+            isbn13=_canonical_isbn13(isbn10, isbn13),
             isbn10=d.get('isbn10'),
             title=_get_from_key_or_raise(key='title', d=d),
             authors=d.get('authors', []) if d.get('authors') else None,
@@ -122,11 +128,30 @@ class BookResponse:
             shelf=d.get('shelf', None),
         )
 
+    @classmethod
+    def from_dto(cls, book: BookDto, shelf: Optional[str] = None) -> 'BookResponse':
+        """
+        Create a Book object from a book stored in the database.
+
+        :param book: BookDto
+        :param shelf: shelf of the book, if on one.
+        :return: Book object
+        """
+        return cls(
+            isbn13=book.isbn13,
+            isbn10=None,
+            title=book.title,
+            authors=book.authors,
+            image=book.image,
+            shelf=shelf,
+        )
+
     @classmethod
     def from_ny_times_json(cls, d: dict[str, str]) -> 'BookResponse':
         """
         Create a Book object from NYT JSON dictionary.
 
+        The ISBN-13 is derived from the ISBN-10 if missing.
         :param d: Book JSON dictionary
         :return: Book object
         """
@@ -138,7 +163,7 @@ class BookResponse:
             raise ValueError('No ISBN found in NYT JSON.')
 
         return cls(
-            isbn13=isbn13,
+            isbn13=_canonical_isbn13(isbn10, isbn13),
             isbn10=isbn10,
             title=_get_from_key_or_raise(key='title', d=d),
             authors=[d.get('author')],
@@ -61,6 +61,12 @@ class BookShelf(db.Model):
         result = db.session.execute(statement).scalar_one_or_none()
         return result
 
+    @staticmethod
+    def find_shelves_by_user(user_id) -> dict[str, str]:
+        """Retrieves the shelf of every book of a user, as ShelfEnum strings keyed by ISBN13."""
+        statement = select(BookShelf.isbn13, BookShelf.shelf).filter_by(userID=user_id)
+        return {isbn13: ShelfEnum.to_str(shelf) for isbn13, shelf in db.session.execute(statement)}
+
 
 def _delete_book_if_orphaned(isbn13):
     # Check if any BookShelf entries are left for this ISBN
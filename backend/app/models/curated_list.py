@@ -28,7 +28,12 @@ class CuratedList(db.Model):
     description = Column(Text, nullable=True)
 
     # Relationship to CuratedPick
-    curated_picks = relationship('CuratedPick', back_populates='curated_list', cascade='all, delete-orphan')
+    curated_picks = relationship(
+        'CuratedPick',
+        back_populates='curated_list',
+        cascade='all, delete-orphan',
+        order_by='CuratedPick.sort_key',
+    )
 
     def __init__(self, name, description):
         """Initialize a CuratedList instance."""
@@ -7,21 +7,32 @@ from sqlalchemy import (
     Integer,
     ForeignKey,
     UniqueConstraint, select,
+    func,
+    insert,
+    text,
+    update,
 )
 from sqlalchemy.orm import relationship
 
+from app.config import CURATED_PICK_SORT_KEY_MAX_LENGTH
 from app.models.book import _get_from_key_or_raise
 from app.models.book_dto import db
-from app.utils.isbn_utils import is_valid_isbn10, is_valid_isbn13
+from app.utils.isbn_utils import is_valid_isbn10, is_valid_isbn13, isbn10_to_isbn13
+from app.utils.sort_key_utils import key_between, keys_between, spread_keys
 
 target_metadata = db.metadata
 
+# Namespace of the Postgres advisory locks serializing the reorderings of a curated list, keyed by list ID.
+_REORDER_LOCK_NAMESPACE = 7301
+
 
 class CuratedPick(db.Model):
     """
     A class that represents a single book pick within a curated list.
 
     This class is used to associate a book with a specific position within a curated list.
+    The picks are ordered by a fractional sort key, so moving a pick rewrites its key only;
+    its position, from 1, is derived from the keys when read.
     """
     __tablename__ = 'curated_picks'
 
@@ -29,17 +40,19 @@ class CuratedPick(db.Model):
     list_id = Column(Integer, ForeignKey('curated_lists.id', ondelete='CASCADE'), nullable=False)
     isbn13 = Column(String(13), nullable=True)
     isbn10 = Column(String(10), nullable=True)
-    position = Column(Integer, nullable=False)
+    # Compared byte by byte, as the keys sort in the order of their fractions.
+    sort_key = Column(String(32, collation='C'), nullable=False)
 
     # Relationship back to CuratedList
     curated_list = relationship('CuratedList', back_populates='curated_picks')
 
+    # Deferrable, so the keys rewritten by a rebalancing UPDATE are only checked once the statement is done.
     __table_args__ = (
-        UniqueConstraint('list_id', 'position', name='uq_curated_list_position'),
+        UniqueConstraint('list_id', 'sort_key', name='uq_curated_list_sort_key', deferrable=True, initially='IMMEDIATE'),
     )
 
     def __init__(self, list_id, isbn13, isbn10, position):
-        """Initialize a CuratedPick instance."""
+        """Initialize a CuratedPick instance, to be inserted at the given position."""
         self.list_id = list_id
         self.isbn13 = isbn13
         self.isbn10 = isbn10
@@ -49,8 +62,26 @@ class CuratedPick(db.Model):
         """Provides a string representation of the CuratedPick instance."""
         return f'CuratedPick(list_id={self.list_id}, isbn13={self.isbn13}, isbn10={self.isbn10}, position={self.position})'
 
+    @property
+    def position(self) -> int | None:
+        """The position of the pick in its list, from 1; counted from the sort keys unless already known."""
+        if getattr(self, '_position', None) is None and self.sort_key is not None:
+            self._position = db.session.execute(
+                select(func.count()).where(
+                    CuratedPick.list_id == self.list_id,
+                    CuratedPick.sort_key <= self.sort_key,
+                )
+            ).scalar_one()
+        return getattr(self, '_position', None)
+
+    @position.setter
+    def position(self, position: int | None):
+        self._position = position
+
     def insert(self):
-        """Inserts a new curated pick into the database."""
+        """Inserts a new curated pick into the database, at its position or last if the list is shorter."""
+        _lock_list(self.list_id)
+        self.sort_key, self.position = CuratedPick._sort_key_at(self.list_id, (self.position or 0) - 1)
         db.session.add(self)
         db.session.commit()
 
@@ -65,9 +96,226 @@ class CuratedPick(db.Model):
 
     @classmethod
     def find_by_list_id(cls, list_id: int):
-        """Retrieves all curated picks associated with a specific list ID."""
-        stmt = select(cls).filter_by(list_id=list_id)
-        return db.session.execute(stmt).scalars().all()
+        """Retrieves all curated picks associated with a specific list ID, in position order."""
+        stmt = select(cls).filter_by(list_id=list_id).order_by(cls.sort_key)
+        picks = db.session.execute(stmt).scalars().all()
+        for position, pick in enumerate(picks, start=1):
+            pick.position = position
+        return picks
+
+    @classmethod
+    def find_page(
+            cls,
+            list_id: int,
+            limit: int,
+            offset: int = 0,
+            after: str | None = None,
+    ) -> list['CuratedPick']:
+        """
+        Retrieves a page of the picks of a list, in position order, with a range scan of the (list_id, sort_key) index.
+
+        :param list_id: ID of the curated list.
+        :param limit: most picks of the page.
+        :param offset: picks before the page; scanned through unless after is given, see count_through.
+        :param after: sort key of the last pick of the previous page, the page starting right after it.
+        :return: the picks of the page, with their position.
+        """
+        stmt = select(cls).filter_by(list_id=list_id).order_by(cls.sort_key).limit(limit)
+        if after is None:
+            stmt = stmt.offset(offset)
+        else:
+            stmt = stmt.where(cls.sort_key > after)
+
+        picks = db.session.execute(stmt).scalars().all()
+        for position, pick in enumerate(picks, start=offset + 1):
+            pick.position = position
+        return picks
+
+    @classmethod
+    def count_through(cls, list_id: int, sort_key: str) -> int:
+        """Counts the picks of a list up to the given sort key included, with an index-only scan."""
+        stmt = select(func.count()).select_from(cls).filter_by(list_id=list_id).where(cls.sort_key <= sort_key)
+        return db.session.execute(stmt).scalar_one()
+
+    @classmethod
+    def count_by_list_id(cls, list_id: int) -> int:
+        """Counts the picks of a list, with an index-only scan."""
+        return db.session.execute(select(func.count()).select_from(cls).filter_by(list_id=list_id)).scalar_one()
+
+    @classmethod
+    def move(cls, pick: 'CuratedPick', new_position: int):
+        """
+        Moves a pick to a new position, or last if the list is shorter, rewriting the sort key of the pick only.
+
+        The neighbours are read under the lock of the list, should another curator have moved a pick.
+        :param pick: CuratedPick to move.
+        :param new_position: the new position of the pick, from 1.
+        """
+        _lock_list(pick.list_id)
+        sort_key, position = cls._sort_key_at(pick.list_id, new_position - 1, pick_id=pick.id)
+        db.session.execute(
+            update(cls)
+            .where(cls.id == pick.id)
+            .values(sort_key=sort_key)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        pick.position = position
+
+    @classmethod
+    def reorder(cls, list_id: int, isbn13s: list[str]) -> list['CuratedPick']:
+        """
+        Applies a new ordering of every pick of a list with a single UPDATE, spreading their sort keys evenly.
+
+        :param list_id: ID of the curated list.
+        :param isbn13s: ISBN-13s of every pick of the list, derived from the ISBN-10 of the picks stored without one,
+        in their new order.
+        :return: the picks of the list, in their new order.
+        :raise ValueError: if isbn13s does not list every pick of the list exactly once.
+        """
+        _lock_list(list_id)
+        picks = {pick.isbn13 or isbn10_to_isbn13(pick.isbn10): pick for pick in cls.find_by_list_id(list_id)}
+        if len(isbn13s) != len(picks) or set(isbn13s) != set(picks):
+            db.session.rollback()
+            raise ValueError("'picks' must list every pick of the list exactly once.")
+
+        pick_ids = [picks[isbn13].id for isbn13 in isbn13s]
+        _update_sort_keys(pick_ids, spread_keys(len(pick_ids)))
+        db.session.commit()
+        return cls.find_by_list_id(list_id)
+
+    @classmethod
+    def insert_all(cls, list_id: int, picks: list['CuratedPick']):
+        """
+        Inserts new picks of a list with a single multi-row INSERT, each at its position or last, in one transaction.
+
+        Each run of new picks is given keys between the keys of its neighbours, so the picks already in the list keep
+        theirs. Should a key grow longer than CURATED_PICK_SORT_KEY_MAX_LENGTH, the keys of the whole list are spread
+        evenly again instead, with one UPDATE of the picks already in the list.
+        The ID and position of the picks are set once inserted.
+        :param list_id: ID of the curated list.
+        :param picks: new CuratedPick instances of the list, placed in ascending position, the ones without last.
+        """
+        _lock_list(list_id)
+        order = list(db.session.execute(
+            select(cls.id, cls.sort_key).filter_by(list_id=list_id).order_by(cls.sort_key)
+        ).all())
+        for pick in sorted(picks, key=lambda p: (p.position is None, p.position or 0)):
+            index = len(order) if pick.position is None else min(max(pick.position - 1, 0), len(order))
+            order.insert(index, pick)
+
+        sort_keys = _sort_keys_between_neighbours(order)
+        if any(len(sort_key) > CURATED_PICK_SORT_KEY_MAX_LENGTH for sort_key in sort_keys):
+            sort_keys = spread_keys(len(order))
+            _update_sort_keys(
+                [other.id for other in order if not isinstance(other, CuratedPick)],
+                [sort_key for other, sort_key in zip(order, sort_keys) if not isinstance(other, CuratedPick)],
+            )
+
+        for position, (pick, sort_key) in enumerate(zip(order, sort_keys), start=1):
+            if isinstance(pick, CuratedPick):
+                pick.sort_key = sort_key
+                pick.position = position
+
+        if picks:
+            inserted = db.session.execute(
+                insert(cls)
+                .values([
+                    {'list_id': list_id, 'isbn13': pick.isbn13, 'isbn10': pick.isbn10, 'sort_key': pick.sort_key}
+                    for pick in picks
+                ])
+                .returning(cls.id, cls.sort_key)
+            ).all()
+            # Matched by sort key, as RETURNING does not promise the order of the rows.
+            ids = {sort_key: pick_id for pick_id, sort_key in inserted}
+            for pick in picks:
+                pick.id = ids[pick.sort_key]
+
+        db.session.commit()
+
+    @classmethod
+    def _sort_key_at(cls, list_id: int, index: int, pick_id: int | None = None) -> tuple[str, int]:
+        """
+        Returns a sort key placing a pick at an index among the other picks of a list.
+
+        Should the key grow longer than CURATED_PICK_SORT_KEY_MAX_LENGTH, the list is rebalanced first,
+        in the same transaction, the pick included.
+        :param list_id: ID of the curated list, locked by the caller.
+        :param index: index of the pick among the other picks, from 0; clamped to the length of the list.
+        :param pick_id: ID of the pick when moved, None when inserted.
+        :return: the sort key and the position it places the pick at.
+        """
+        others = db.session.execute(
+            select(cls.id, cls.sort_key).where(cls.list_id == list_id, cls.id != pick_id).order_by(cls.sort_key)
+        ).all()
+        index = min(max(index, 0), len(others))
+
+        sort_key = key_between(
+            others[index - 1].sort_key if index > 0 else None,
+            others[index].sort_key if index < len(others) else None,
+        )
+        if len(sort_key) > CURATED_PICK_SORT_KEY_MAX_LENGTH:
+            pick_ids = [other.id for other in others]
+            if pick_id is not None:
+                pick_ids.insert(index, pick_id)
+            sort_keys = spread_keys(len(pick_ids))
+            _update_sort_keys(pick_ids, sort_keys)
+            sort_key = sort_keys[index] if pick_id is not None else key_between(
+                sort_keys[index - 1] if index > 0 else None,
+                sort_keys[index] if index < len(sort_keys) else None,
+            )
+
+        return sort_key, index + 1
+
+
+def _sort_keys_between_neighbours(order: list) -> list[str]:
+    """
+    Returns the sort keys of a list where new picks are placed among the picks already in it.
+
+    :param order: the picks already in the list, as rows with their sort_key, and the new CuratedPick instances,
+    in their order.
+    :return: the keys of the items of order, unchanged for the picks already in the list.
+    """
+    sort_keys = []
+    new_picks = 0
+    for item in order + [None]:
+        if isinstance(item, CuratedPick):
+            new_picks += 1
+            continue
+
+        high = item.sort_key if item is not None else None
+        sort_keys.extend(keys_between(sort_keys[-1] if sort_keys else None, high, new_picks))
+        new_picks = 0
+        if item is not None:
+            sort_keys.append(item.sort_key)
+
+    return sort_keys
+
+
+def _update_sort_keys(pick_ids: list[int], sort_keys: list[str]):
+    """
+    Rewrites the sort keys of picks of a list with a single UPDATE.
+
+    :param pick_ids: IDs of the picks.
+    :param sort_keys: new keys of the picks, in the order of pick_ids.
+    """
+    if pick_ids:
+        db.session.execute(
+            text(
+                'UPDATE curated_picks SET sort_key = o.sort_key '
+                'FROM unnest(CAST(:ids AS integer[]), CAST(:sort_keys AS varchar[])) AS o(id, sort_key) '
+                'WHERE curated_picks.id = o.id'
+            ),
+            {'ids': pick_ids, 'sort_keys': sort_keys},
+        )
+
+
+def _lock_list(list_id: int):
+    """Serializes the reorderings of a list until the end of the transaction, across every worker."""
+    db.session.execute(
+        text('SELECT pg_advisory_xact_lock(:namespace, :list_id)'),
+        {'namespace': _REORDER_LOCK_NAMESPACE, 'list_id': list_id},
+    )
 
 
 @dataclass
@@ -135,6 +383,7 @@ class CuratedPickRequest:
         """
         Validate the provided ISBNs to ensure they are in a correct format.
 
+        The ISBN-13, used to look the pick up, is derived from the ISBN-10 if missing.
         :raise ValueError: If the ISBNs are not valid.
         """
         if not self.isbn10 and not self.isbn13:
@@ -145,3 +394,6 @@ class CuratedPickRequest:
 
         if self.isbn13 and not is_valid_isbn13(self.isbn13):
             raise ValueError("Invalid ISBN-13 format.")
+
+        if not self.isbn13:
+            self.isbn13 = isbn10_to_isbn13(self.isbn10)
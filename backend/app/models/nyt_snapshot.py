@@ -0,0 +1,155 @@
+"""This module contains the NytListSnapshot and NytSnapshotBook models, the dated history of the NYT bestsellers lists."""
+from datetime import date
+
+from sqlalchemy import (
+    ARRAY,
+    Column,
+    Date,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    UniqueConstraint,
+    delete,
+    select,
+)
+from sqlalchemy.orm import relationship
+
+from app.models.book_dto import BookResponse, db
+
+target_metadata = db.metadata
+
+
+class NytListSnapshot(db.Model):
+    """
+    A class that represents a NYT bestsellers list as published on a given date.
+
+    A list has a single snapshot per publication, fetching it again replaces the snapshot.
+    """
+    __tablename__ = 'nyt_list_snapshots'
+
+    id = Column(Integer, primary_key=True)
+    path = Column(String(255), nullable=False)
+    published_date = Column(Date, nullable=False)
+    next_published_date = Column(Date, nullable=True)
+
+    # Relationship to NytSnapshotBook, in rank order
+    books = relationship(
+        'NytSnapshotBook',
+        back_populates='snapshot',
+        cascade='all, delete-orphan',
+        order_by='NytSnapshotBook.rank',
+    )
+
+    __table_args__ = (
+        UniqueConstraint('path', 'published_date', name='uq_nyt_list_snapshot_date'),
+        Index('ix_nyt_list_snapshots_path_published_date', 'path', published_date.desc()),
+    )
+
+    def __init__(self, path, published_date, next_published_date, books):
+        """Initialize a NytListSnapshot instance."""
+        self.path = path
+        self.published_date = published_date
+        self.next_published_date = next_published_date
+        self.books = books
+
+    @classmethod
+    def from_json_books(
+            cls,
+            path: str,
+            json_books: list[dict],
+            published_date: date,
+            next_published_date: date | None,
+    ) -> 'NytListSnapshot':
+        """
+        Create a snapshot from the books of a list, as cached by NyTimesService.
+
+        :param path: NYT bestsellers list name; e.g. 'non-fiction'.
+        :param json_books: BookResponse dictionaries, in rank order.
+        :param published_date: publication date of the list.
+        :param next_published_date: date of the next publication, if known.
+        :return: NytListSnapshot with a NytSnapshotBook per rank.
+        """
+        return cls(
+            path=path,
+            published_date=published_date,
+            next_published_date=next_published_date,
+            books=[NytSnapshotBook.from_json(rank, d) for rank, d in enumerate(json_books, start=1)],
+        )
+
+    @classmethod
+    def replace_all(cls, snapshots: list['NytListSnapshot']):
+        """Inserts the snapshots in one transaction, replacing the ones of the same lists and publication dates."""
+        for snapshot in snapshots:
+            db.session.execute(delete(cls).filter_by(path=snapshot.path, published_date=snapshot.published_date))
+        db.session.add_all(snapshots)
+        db.session.commit()
+
+    @classmethod
+    def find_latest(cls, path: str) -> 'NytListSnapshot | None':
+        """Retrieves the snapshot of the latest publication of a list, if any."""
+        stmt = select(cls).filter_by(path=path).order_by(cls.published_date.desc()).limit(1)
+        return db.session.execute(stmt).scalars().first()
+
+    def json_books(self) -> list[dict]:
+        """Returns the books of the snapshot as BookResponse dictionaries, in rank order."""
+        return [book.to_response().to_dict() for book in self.books]
+
+
+class NytSnapshotBook(db.Model):
+    """A class that represents a book of a NytListSnapshot at a given rank."""
+    __tablename__ = 'nyt_snapshot_books'
+
+    id = Column(Integer, primary_key=True)
+    snapshot_id = Column(Integer, ForeignKey('nyt_list_snapshots.id', ondelete='CASCADE'), nullable=False)
+    rank = Column(Integer, nullable=False)
+    isbn13 = Column(String(13), nullable=True)
+    isbn10 = Column(String(10), nullable=True)
+    title = Column(String, nullable=False)
+    authors = Column(ARRAY(String), nullable=True)
+    image = Column(String, nullable=False)
+
+    # Relationship back to NytListSnapshot
+    snapshot = relationship('NytListSnapshot', back_populates='books')
+
+    __table_args__ = (
+        UniqueConstraint('snapshot_id', 'rank', name='uq_nyt_snapshot_rank'),
+    )
+
+    def __init__(self, rank, isbn13, isbn10, title, authors, image):
+        """Initialize a NytSnapshotBook instance."""
+        self.rank = rank
+        self.isbn13 = isbn13
+        self.isbn10 = isbn10
+        self.title = title
+        self.authors = authors
+        self.image = image
+
+    @classmethod
+    def from_json(cls, rank: int, d: dict) -> 'NytSnapshotBook':
+        """
+        Create a NytSnapshotBook from a BookResponse dictionary.
+
+        :param rank: rank of the book in the list, from 1.
+        :param d: BookResponse dictionary
+        :return: NytSnapshotBook
+        """
+        return cls(
+            rank=rank,
+            isbn13=d.get('isbn13'),
+            isbn10=d.get('isbn10'),
+            title=d.get('title'),
+            authors=d.get('authors'),
+            image=d.get('image'),
+        )
+
+    def to_response(self) -> BookResponse:
+        """Converts the snapshot row into a BookResponse."""
+        return BookResponse(
+            isbn13=self.isbn13,
+            isbn10=self.isbn10,
+            title=self.title,
+            authors=self.authors,
+            image=self.image,
+            shelf=None,
+        )
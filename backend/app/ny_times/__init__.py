@@ -1,5 +1,5 @@
 """This module provides routes to fetch best-selling books from The New York Times API."""
-from flask import Blueprint
+from flask import Blueprint, current_app
 from flask_cors import cross_origin
 
 from app.auth.auth import requires_auth
@@ -7,7 +7,7 @@ from app.config import (
     FICTION_PATH,
     NON_FICTION_PATH,
 )
-from app.ny_times.books import fetch_books
+from app.ny_times.books import fetch_books, fetch_list
 
 ny_times_bp = Blueprint('ny-times', __name__)
 
@@ -15,7 +15,7 @@ ny_times_bp = Blueprint('ny-times', __name__)
 @ny_times_bp.route('/ny-times/best-sellers/fiction')
 @cross_origin()
 @requires_auth('booklist:get')
-def fetch_fiction(_):
+def fetch_fiction(payload):
     """
     Data provided by The New York Times.
 
@@ -24,13 +24,13 @@ def fetch_fiction(_):
     :return: JSON array of books if the request is successful, or aborts with an error response.
     :rtype: list or flask.Response
     """
-    return fetch_books(path=FICTION_PATH)
+    return current_app.ensure_sync(fetch_books)(user_id=payload.get('sub'), path=FICTION_PATH)
 
 
 @ny_times_bp.route('/ny-times/best-sellers/non-fiction')
 @cross_origin()
 @requires_auth('booklist:get')
-def fetch_non_fiction(_):
+def fetch_non_fiction(payload):
     """
     Data provided by The New York Times.
 
@@ -39,4 +39,19 @@ def fetch_non_fiction(_):
     :return: JSON array of books if the request is successful, or aborts with an error response.
     :rtype: list or flask.Response
     """
-    return fetch_books(path=NON_FICTION_PATH)
+    return current_app.ensure_sync(fetch_books)(user_id=payload.get('sub'), path=NON_FICTION_PATH)
+
+
+@ny_times_bp.route('/ny-times/best-sellers/<string:list_name>')
+@cross_origin()
+@requires_auth('booklist:get')
+def fetch_any_list(payload, list_name: str):
+    """
+    Data provided by The New York Times.
+
+    For details visit: https://developer.nytimes.com.
+    Fetches any current list by its encoded name, e.g. "hardcover-fiction".
+    :return: JSON array of books if the request is successful, or aborts with an error response.
+    :rtype: list or flask.Response
+    """
+    return current_app.ensure_sync(fetch_list)(user_id=payload.get('sub'), list_name=list_name)
@@ -6,29 +6,50 @@ Used in the ny_times blueprint to fetch both fiction and non-fiction bestseller
 import inject
 from flask import (
     request,
-    jsonify,
 )
 
-from app.config import (
-    DEFAULT_PAGE,
-    DEFAULT_LIMIT,
-)
-from app.services.ny_times_service_base import NYTimesServiceBase
+from app.exceptions.invalid_request_error import InvalidRequestError
+from app.pagination.books import get_page_and_limit
+from app.services.async_ny_times_service_base import AsyncNYTimesServiceBase
+from app.services.shelf_index import ShelfIndex
+from app.utils.json_body import json_body_response
 
 
-@inject.params(book_service=NYTimesServiceBase)
-def fetch_books(path: str, book_service: NYTimesServiceBase):
+@inject.params(book_service=AsyncNYTimesServiceBase, shelf_index=ShelfIndex)
+async def fetch_books(user_id: str, path: str, book_service: AsyncNYTimesServiceBase, shelf_index: ShelfIndex):
     """
     Fetches bestseller data provided by The New York Times.
 
     Visit https://api.nytimes.com/svc/books/v3/lists/names.json?api-key=<api_key> for available list names.
+    The 'page' and 'limit' query parameters select a page of the list, limit being capped at DEFAULT_LIMIT.
+    The books on one of the user's shelves are annotated with their shelf.
+    :param user_id: User ID obtained from the JWT token.
     :param path: The list_name_encoded field from the provided URL.
-    :param book_service: NYTimesServiceBase instance.
+    :param book_service: AsyncNYTimesServiceBase instance.
+    :param shelf_index: ShelfIndex of the user's shelves.
+    :return: JSON array of books if the request is successful, or aborts with an error response.
+    :rtype: list or flask.Response
+    """
+    page, limit = get_page_and_limit(request)
+
+    body, isbn13s = await book_service.fetch_books_body(path, page, limit)
+
+    return json_body_response(shelf_index.annotate_body(user_id, body, isbn13s))
+
+
+@inject.params(book_service=AsyncNYTimesServiceBase)
+async def fetch_list(user_id: str, list_name: str, book_service: AsyncNYTimesServiceBase):
+    """
+    Fetches any current bestsellers list provided by The New York Times, by its encoded name.
+
+    The name is validated against the cached catalog of the current lists.
+    :param user_id: User ID obtained from the JWT token.
+    :param list_name: The list_name_encoded of the list, e.g. 'hardcover-fiction'.
+    :param book_service: AsyncNYTimesServiceBase instance.
     :return: JSON array of books if the request is successful, or aborts with an error response.
     :rtype: list or flask.Response
     """
-    page = request.args.get('page', default=DEFAULT_PAGE)
-    limit = request.args.get('limit', default=DEFAULT_LIMIT)
+    if list_name not in await book_service.fetch_list_names():
+        raise InvalidRequestError(code=404, message=f"Unknown bestsellers list '{list_name}'.")
 
-    response_dict = book_service.fetch_books(path, page, limit)
-    return jsonify(response_dict)
+    return await fetch_books(user_id=user_id, path=f'{list_name}.json')
@@ -5,10 +5,37 @@ from flask import (
 )
 
 from app.config import DEFAULT_PAGE, DEFAULT_LIMIT
+from app.exceptions.invalid_request_error import InvalidRequestError
 from app.models.book_dto import BookResponse
 
 
-def paginate(request, query):
+def get_page_and_limit(request) -> tuple[int, int]:
+    """
+    Parses and validates the 'page' and 'limit' query parameters.
+
+    :param request: The incoming HTTP request that may contain query parameters.
+    :type request: flask.Request
+    :return: the page, from 1, and the limit, capped at DEFAULT_LIMIT.
+    :raises InvalidRequestError: 400 if a parameter is not a positive integer.
+    """
+    page = _get_positive_int(request, 'page', DEFAULT_PAGE)
+    limit = _get_positive_int(request, 'limit', DEFAULT_LIMIT)
+    return page, min(limit, DEFAULT_LIMIT)
+
+
+def page_bounds(page: int, limit: int) -> tuple[int, int]:
+    """
+    Returns the slice bounds of a page.
+
+    :param page: the page number, from 1.
+    :param limit: the page size.
+    :return: start and end indexes of the page.
+    """
+    start = (page - 1) * limit
+    return start, start + limit
+
+
+def paginate(request, query, degraded: bool = False, shelves=None):
     """
     Parses the query parameters from the received request and fetches book results from the database.
 
@@ -16,15 +43,16 @@ def paginate(request, query):
     :type request: flask.Request
     :param query: The query object used to fetch results from the database.
     :type query: BookDto
+    :param degraded: flags the results as served from the database only, while the upstream is unavailable.
+    :type degraded: bool
+    :param shelves: Optional lookup of the shelves of the books of the page, by their ISBN-13s.
+    :type shelves: Callable[[list[str]], dict[str, str]] | None
 
     :return: A JSON response containing the success status, book data, pagination details, and total results.
     :rtype: flask.Response or None
     """
-    page = request.args.get('page', DEFAULT_PAGE, type=int)
-    size = request.args.get('limit', DEFAULT_LIMIT, type=int)
-    size = size if size <= DEFAULT_LIMIT else DEFAULT_LIMIT
-    start = (page - 1) * size
-    end = start + size
+    page, size = get_page_and_limit(request)
+    start, end = page_bounds(page, size)
 
     data_books = []
 
@@ -35,21 +63,35 @@ def paginate(request, query):
         abort(500)
 
     total_results = len(data_books)
-    data_books = map(lambda book: BookResponse(
-        isbn13=book.isbn13,
-        title=book.title,
-        authors=book.authors,
-        image=book.image,
-        shelf=None,
-        isbn10=None,
-    ), data_books)
+    data_books = map(BookResponse.from_dto, data_books)
 
     data_books = list(data_books)[start:end]
+    if shelves:
+        on_shelves = shelves([book.isbn13 for book in data_books])
+        for book in data_books:
+            book.shelf = on_shelves.get(book.isbn13)
 
-    return jsonify({
+    response = {
         'success': True,
         'books': data_books,
         'page': page,
         'limit': size,
         'total_results': total_results
-    })
+    }
+    if degraded:
+        response['degraded'] = True
+
+    return jsonify(response)
+
+
+def _get_positive_int(request, name: str, default: int) -> int:
+    value = request.args.get(name, default)
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        raise InvalidRequestError(code=400, message=f"'{name}' must be a positive integer.")
+
+    if value < 1:
+        raise InvalidRequestError(code=400, message=f"'{name}' must be a positive integer.")
+
+    return value
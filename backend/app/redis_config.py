@@ -4,12 +4,14 @@ import os
 import redis
 
 
-def _get_redis():
+def _get_redis(decode_responses: bool = True):
     redis_host = os.getenv('REDIS_HOST', 'localhost')
     redis_port = os.getenv('REDIS_PORT', 6379)
     redis_password = os.getenv('REDIS_PASSWORD', None)
 
-    return redis.Redis(host=redis_host, port=redis_port, password=redis_password, decode_responses=True)
+    return redis.Redis(host=redis_host, port=redis_port, password=redis_password, decode_responses=decode_responses)
 
 
 redis_client = _get_redis()
+# Returns raw bytes, used for the binary encoded cache entries.
+redis_cache_client = _get_redis(decode_responses=False)
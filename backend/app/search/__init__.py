@@ -3,7 +3,7 @@ This module declares the search Blueprint and the respective routes for the appl
 
 It provides endpoints to search for books and shelves, with authentication and CORS support.
 """
-from flask import Blueprint
+from flask import Blueprint, current_app
 from flask_cors import cross_origin
 
 from app.auth.auth import requires_auth
@@ -16,9 +16,9 @@ search_bp = Blueprint('search', __name__)
 @search_bp.route('/search/books')
 @cross_origin()
 @requires_auth('booklist:get')
-def search_books(_):
+def search_books(payload):
     """Invokes the search function for books."""
-    return books()
+    return current_app.ensure_sync(books)(user_id=payload.get('sub'))
 
 
 @search_bp.route('/search/shelves')
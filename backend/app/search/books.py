@@ -17,38 +17,59 @@ from requests import (
     HTTPError,
 )
 
-from app.config import (
-    DEFAULT_PAGE,
-    DEFAULT_LIMIT,
-)
 from app.exceptions.invalid_request_error import InvalidRequestError
-from app.services.book_service_base import BookServiceBase
+from app.models.book_dto import BookDto
+from app.pagination.books import get_page_and_limit, paginate
+from app.services.async_book_service_base import AsyncBookServiceBase
+from app.services.circuit_breaker import CircuitOpenError
+from app.services.shelf_index import ShelfIndex
 
 api_key = os.environ.get('ISBNDB_KEY')
 
 
-@inject.params(book_service=BookServiceBase)
-def books(book_service: BookServiceBase):
+@inject.params(book_service=AsyncBookServiceBase, shelf_index=ShelfIndex)
+async def books(user_id: str, book_service: AsyncBookServiceBase, shelf_index: ShelfIndex):
     """
     Fetches book based on the search query provided in the request.
 
-    :param book_service: BookServiceBase instance for fetching book data.
-    :type book_service: BookServiceBase
+    While ISBNdb is unavailable, a search not cached yet is answered with the books stored in the database,
+    flagged as degraded.
+    The books on one of the user's shelves are annotated with their shelf.
+
+    :param user_id: User ID obtained from the JWT token
+    :type user_id: str
+
+    :param book_service: AsyncBookServiceBase instance for fetching book data.
+    :type book_service: AsyncBookServiceBase
+
+    :param shelf_index: ShelfIndex of the user's shelves.
+    :type shelf_index: ShelfIndex
 
     :return: JSON array of books if the request is successful, or aborts with an error response.
     :rtype: list or flask.Response
     """
     query = request.args.get('q')
-    page = request.args.get('page', default=DEFAULT_PAGE)
-    limit = request.args.get('limit', default=DEFAULT_LIMIT)
-
     if not query:
         raise InvalidRequestError(message="Missing 'q' parameter", code=400)
 
+    page, limit = get_page_and_limit(request)
+
     try:
-        result = book_service.search_books(query=query, page=page, limit=limit)
+        result = await book_service.search_books(query=query, page=page, limit=limit)
+        shelf_index.annotate(user_id, result['books'])
+        if book_service.is_degraded():
+            result['degraded'] = True
         return jsonify(result)
 
+    except CircuitOpenError as e:
+        print(f'🧨 {e}')
+        return paginate(
+            request=request,
+            query=lambda: BookDto.search_by_title(query),
+            degraded=True,
+            shelves=lambda isbn13s: shelf_index.shelves(user_id, isbn13s),
+        )
+
     except JSONDecodeError:
         abort(500, description="Invalid JSON response from upstream server.")
 
@@ -0,0 +1,116 @@
+"""
+This module defines the AsyncBookService class, the asyncio implementation of AsyncBookServiceBase.
+
+It wraps the BookService of the request, running its blocking calls in the threads of the worker, so both services
+share a single implementation of the caches and of the ISBNdb calls. The views gain concurrency within a request,
+e.g. the ISBNdb bulk requests of a large curated list.
+"""
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import Executor
+
+from app.config import (
+    ISBNDB_BULK_CHUNK_SIZE,
+    ISBNDB_BULK_CONCURRENCY,
+)
+from app.models.book_shelf import BookShelf
+from app.services.async_book_service_base import AsyncBookServiceBase
+from app.services.book_service import BookService
+from app.services.thread_executor import run_in_thread
+from app.utils.isbn_utils import to_isbn13
+
+
+class AsyncBookService(AsyncBookServiceBase):
+    """Concrete implementation of the AsyncBookServiceBase."""
+
+    def __init__(self, book_service: BookService, executor: Executor):
+        """
+        Initializes the AsyncBookService.
+
+        :param book_service: BookService doing the actual work.
+        :param executor: threads of the worker running the calls of the book service.
+        """
+        self.book_service = book_service
+        self.executor = executor
+
+    async def fetch_book(self, book_shelf: 'BookShelf', isbn10: str = None, isbn13: str = None) -> dict:
+        """
+        Fetches book details from the book service, see BookService.fetch_book.
+
+        :raises InvalidRequestError: 404 if ISBNdb does not know the book.
+        """
+        return await run_in_thread(self.executor, self.book_service.fetch_book, book_shelf, isbn10=isbn10, isbn13=isbn13)
+
+    async def fetch_book_body(self, book_shelf: 'BookShelf', isbn13: str) -> bytes:
+        """Fetches the serialized response body of the book details, see BookService.fetch_book_body."""
+        return await run_in_thread(self.executor, self.book_service.fetch_book_body, book_shelf, isbn13=isbn13)
+
+    async def fetch_books_bulk(self, isbns: list[str], shelves: dict[str, 'BookShelf'] | None = None) -> dict[str, dict]:
+        """Fetches the details of many books, see BookService.fetch_books_bulk."""
+        return await run_in_thread(self.executor, self.book_service.fetch_books_bulk, isbns, shelves=shelves)
+
+    async def fetch_books_within(self, isbns: list[str], timeout: float) -> tuple[dict[str, dict], list[str]]:
+        """
+        Fetches the details of many books, returning whatever resolved within timeout seconds.
+
+        The cached books are read as in fetch_books_bulk; the ISBNdb bulk requests of the missing ones run
+        concurrently, at most ISBNDB_BULK_CONCURRENCY at a time. A failed request only fails the books it requested.
+        Every request is submitted to the executor up front, so the ones still running or queued at the deadline
+        outlive the event loop of the view, and fill the cache for the next call.
+        :param isbns: ISBN-10 or ISBN-13 identifiers of the books.
+        :param timeout: seconds to wait for the books.
+        :return: book details keyed by ISBN-13, and the ISBN-13s which failed or did not resolve in time, invalid
+        ISBNs as given; ISBNs unknown to ISBNdb are in neither.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        book_ids = list(dict.fromkeys(filter(None, map(to_isbn13, isbns))))
+        invalid = [isbn for isbn in dict.fromkeys(isbns) if to_isbn13(isbn) is None]
+        try:
+            books, misses = await asyncio.wait_for(
+                run_in_thread(self.executor, self.book_service.get_cached_books, book_ids),
+                timeout,
+            )
+        except asyncio.TimeoutError as e:
+            print(f'🧨 Cache lookup timed out: {e}')
+            return {}, book_ids + invalid
+
+        if not misses:
+            return books, invalid
+
+        semaphore = threading.Semaphore(ISBNDB_BULK_CONCURRENCY)
+        chunks = [misses[start:start + ISBNDB_BULK_CHUNK_SIZE] for start in range(0, len(misses), ISBNDB_BULK_CHUNK_SIZE)]
+        futures = {
+            tuple(chunk): asyncio.wrap_future(
+                self.executor.submit(contextvars.copy_context().run, self._fetch_chunk, chunk, semaphore)
+            )
+            for chunk in chunks
+        }
+
+        done, _ = await asyncio.wait(list(futures.values()), timeout=max(0.0, deadline - loop.time()))
+
+        failed = []
+        for chunk, future in futures.items():
+            if future in done and future.exception() is None:
+                books.update(future.result())
+                continue
+
+            if future in done:
+                print(f'🧨 {future.exception()}')
+            failed.extend(chunk)
+
+        return books, failed + invalid
+
+    def _fetch_chunk(self, chunk: list[str], semaphore: threading.Semaphore) -> dict[str, dict]:
+        """Fetches and caches one chunk of books once semaphore admits it, see BookService.fetch_books_chunk."""
+        with semaphore:
+            return self.book_service.fetch_books_chunk(chunk)
+
+    async def search_books(self, query: str, page: int, limit: int) -> dict:
+        """Searches for books, see BookService.search_books."""
+        return await run_in_thread(self.executor, self.book_service.search_books, query, page, limit)
+
+    def is_degraded(self) -> bool:
+        """Tells whether ISBNdb is unavailable, so books are only served from the cache."""
+        return self.book_service.is_degraded()
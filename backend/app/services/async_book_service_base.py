@@ -0,0 +1,116 @@
+"""This module defines the AsyncBookServiceBase class, the asyncio counterpart of BookServiceBase."""
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from app.models.book_shelf import BookShelf
+from app.services.book_service_base import BookServiceBase
+from app.utils.isbn_utils import to_isbn13
+from app.utils.json_body import mark_degraded, to_json_bytes
+
+
+class AsyncBookServiceBase(ABC):
+    """Abstract interface defining the contract for async book service classes."""
+
+    @abstractmethod
+    async def fetch_book(
+            self,
+            book_shelf: Optional['BookShelf'],
+            isbn10: str | None = None,
+            isbn13: str | None = None
+    ) -> dict:
+        """
+        Abstract method to fetch book details, see BookServiceBase.fetch_book.
+
+        :param book_shelf: Optional BookShelf object containing shelf information.
+        :type book_shelf: Optional[BookShelf]
+        :param isbn10: ISBN-10 identifier of the book (optional).
+        :type isbn10: str | None
+        :param isbn13: ISBN-13 identifier of the book (optional).
+        :type isbn13: str | None
+        :return: A dictionary containing the book details.
+        :rtype: dict
+        """
+        pass
+
+    async def fetch_book_body(self, book_shelf: Optional['BookShelf'], isbn13: str) -> bytes:
+        """
+        Async counterpart of BookServiceBase.fetch_book_body.
+
+        Fetches the serialized response body of the book details, {"book": {...}, "success": true}.
+
+        Implementations caching the pre-serialized book override it; by default fetch_book is serialized.
+
+        :param book_shelf: Optional BookShelf object containing shelf information.
+        :type book_shelf: Optional[BookShelf]
+        :param isbn13: ISBN-13 identifier of the book.
+        :type isbn13: str
+        :return: serialized JSON object, flagged as degraded while the upstream is unavailable.
+        :rtype: bytes
+        """
+        body = to_json_bytes({'success': True, 'book': await self.fetch_book(book_shelf, isbn13=isbn13)})
+        return mark_degraded(body) if self.is_degraded() else body
+
+    @abstractmethod
+    async def fetch_books_bulk(
+            self,
+            isbns: list[str],
+            shelves: dict[str, Optional['BookShelf']] | None = None
+    ) -> dict[str, dict]:
+        """
+        Abstract method to fetch the details of many books at once, see BookServiceBase.fetch_books_bulk.
+
+        :param isbns: ISBN-10 or ISBN-13 identifiers of the books.
+        :type isbns: list[str]
+        :param shelves: Optional mapping of ISBN-13 to the BookShelf object containing shelf information.
+        :type shelves: dict[str, Optional[BookShelf]] | None
+        :return: A dictionary mapping the ISBN-13 of each resolved ISBN to its book details; unresolved ISBNs are omitted.
+        :rtype: dict[str, dict]
+        """
+        pass
+
+    async def fetch_books_within(self, isbns: list[str], timeout: float) -> tuple[dict[str, dict], list[str]]:
+        """
+        Fetches the details of many books, returning whatever resolved within timeout seconds.
+
+        Implementations fetching the books in parts override it; by default fetch_books_bulk resolves or fails as a whole.
+
+        :param isbns: ISBN-10 or ISBN-13 identifiers of the books.
+        :type isbns: list[str]
+        :param timeout: seconds to wait for the books.
+        :type timeout: float
+        :return: book details keyed by ISBN-13, and the ISBN-13s which failed or did not resolve in time, invalid
+        ISBNs as given; ISBNs unknown to ISBNdb are in neither.
+        :rtype: tuple[dict[str, dict], list[str]]
+        """
+        try:
+            return await asyncio.wait_for(self.fetch_books_bulk(isbns), timeout), []
+        except Exception as e:
+            print(f'🧨 {e!r}')
+            return {}, list(dict.fromkeys(to_isbn13(isbn) or isbn for isbn in isbns))
+
+    @abstractmethod
+    async def search_books(self, query: str, page: int, limit: int) -> dict:
+        """
+        Abstract method to search for books based on a query, see BookServiceBase.search_books.
+
+        :param query: The search query string.
+        :type query: str
+        :param page: The page number for paginated results.
+        :type page: int
+        :param limit: The number of results per page.
+        :type limit: int
+        :return: A dictionary containing the search results, including success status, books, page, limit, and total results.
+        :rtype: dict
+        """
+        pass
+
+    get_shelf_or_none = staticmethod(BookServiceBase.get_shelf_or_none)
+
+    def is_degraded(self) -> bool:
+        """
+        Tells whether ISBNdb is unavailable, so books can only be served from the cache or the database.
+
+        :return: False unless the implementation tracks the upstream health.
+        """
+        return False
@@ -0,0 +1,40 @@
+"""
+This module contains the AsyncNyTimesService class, the asyncio implementation of AsyncNYTimesServiceBase.
+
+It wraps the NyTimesService of the request, running its blocking calls in the threads of the worker.
+"""
+from concurrent.futures import Executor
+
+from app.services.async_ny_times_service_base import AsyncNYTimesServiceBase
+from app.services.ny_times_service import NyTimesService
+from app.services.thread_executor import run_in_thread
+
+
+class AsyncNyTimesService(AsyncNYTimesServiceBase):
+    """Concrete implementation of the AsyncNYTimesServiceBase interface."""
+
+    def __init__(self, nyt_service: NyTimesService, executor: Executor):
+        """
+        Initializes the AsyncNyTimesService.
+
+        :param nyt_service: NyTimesService doing the actual work.
+        :param executor: threads of the worker running the calls of the NYT service.
+        """
+        self.nyt_service = nyt_service
+        self.executor = executor
+
+    async def fetch_books(self, path: str, page: int, limit: int) -> dict:
+        """Fetches a page of a bestsellers list, see NyTimesService.fetch_books."""
+        return await run_in_thread(self.executor, self.nyt_service.fetch_books, path, page, limit)
+
+    async def fetch_books_body(self, path: str, page: int, limit: int) -> tuple[bytes, list[str]]:
+        """Fetches the serialized response body of a page of a bestsellers list, see NyTimesService.fetch_books_body."""
+        return await run_in_thread(self.executor, self.nyt_service.fetch_books_body, path, page, limit)
+
+    async def fetch_list_names(self) -> dict[str, str]:
+        """Fetches the catalog of the current bestsellers lists, see NyTimesService.fetch_list_names."""
+        return await run_in_thread(self.executor, self.nyt_service.fetch_list_names)
+
+    def is_degraded(self) -> bool:
+        """Tells whether the NYT API is unavailable, so lists are only served from the cache."""
+        return self.nyt_service.is_degraded()
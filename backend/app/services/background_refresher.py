@@ -0,0 +1,115 @@
+"""
+This module provides BackgroundRefresher, which refreshes stale cache entries off the request path.
+
+A short Redis lock per entry makes sure a single worker, across all nodes, refreshes a given entry at a time.
+"""
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import redis
+
+from app.services.cache_codec import cache_key
+from app.services.single_flight import acquire_lock, release_lock
+
+
+class BackgroundRefresher:
+    """Runs cache refreshes in a small per-worker thread pool."""
+
+    def __init__(self, redis_client: redis.Redis, max_workers: int, lock_ttl: float):
+        """
+        Initializes the BackgroundRefresher.
+
+        :param redis_client: Redis client holding the refresh locks.
+        :param max_workers: number of refresh threads per worker process.
+        :param lock_ttl: seconds after which a refresh lock expires, should the refresh never finish.
+        """
+        self.redis_client = redis_client
+        self.max_workers = max_workers
+        self.lock_ttl = lock_ttl
+        self._executor = None
+        self._executor_pid = None
+        self._lock = threading.Lock()
+
+    def refresh(self, key: str, fn: callable) -> bool:
+        """
+        Schedules fn to refresh the entry, unless a refresh of the same entry is already running somewhere.
+
+        :param key: Redis key of the stale entry.
+        :param fn: function without arguments fetching the fresh value and writing it to the cache.
+        :return: True if the refresh was scheduled by this call.
+        """
+        lock_key = cache_key('refresh', key)
+        try:
+            token = acquire_lock(self.redis_client, lock_key, ttl=self.lock_ttl)
+        except redis.RedisError as e:
+            print(f'🧨 {e}')
+            return False
+
+        if token is None:
+            return False
+
+        self._get_executor().submit(self._run, lock_key, token, fn)
+        return True
+
+    def refresh_many(self, keys: dict[str, str], fn: callable) -> bool:
+        """
+        Schedules a single call of fn refreshing every entry not already being refreshed somewhere.
+
+        :param keys: Redis keys of the stale entries, mapped to the identifier passed on to fn.
+        :param fn: function refreshing the entries of the given list of identifiers.
+        :return: True if a refresh was scheduled by this call.
+        """
+        tokens = {cache_key('refresh', key): uuid.uuid4().hex for key in keys}
+        pipeline = self.redis_client.pipeline(transaction=False)
+        for lock_key, token in tokens.items():
+            pipeline.set(lock_key, token, nx=True, px=int(self.lock_ttl * 1000))
+
+        try:
+            acquired = pipeline.execute()
+        except redis.RedisError as e:
+            print(f'🧨 {e}')
+            return False
+
+        locks = {}
+        identifiers = []
+        for (lock_key, token), identifier, is_acquired in zip(tokens.items(), keys.values(), acquired):
+            if is_acquired:
+                locks[lock_key] = token
+                identifiers.append(identifier)
+
+        if not identifiers:
+            return False
+
+        self._get_executor().submit(self._run_many, locks, identifiers, fn)
+        return True
+
+    def _run_many(self, locks: dict[str, str], identifiers: list[str], fn: callable):
+        try:
+            fn(identifiers)
+        except Exception as e:
+            print(f'🧨 {e}')
+        finally:
+            for lock_key, token in locks.items():
+                release_lock(self.redis_client, lock_key, token)
+
+    def _run(self, lock_key: str, token: str, fn: callable):
+        try:
+            fn()
+        except Exception as e:
+            # The stale entry keeps being served; the next stale hit retries the refresh.
+            print(f'🧨 {e}')
+        finally:
+            release_lock(self.redis_client, lock_key, token)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Returns the thread pool of this process, created lazily so each forked worker gets its own."""
+        if self._executor is not None and self._executor_pid == os.getpid():
+            return self._executor
+
+        with self._lock:
+            if self._executor is None or self._executor_pid != os.getpid():
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='cache-refresh')
+                self._executor_pid = os.getpid()
+            return self._executor
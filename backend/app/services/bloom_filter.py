@@ -0,0 +1,62 @@
+"""
+This module provides BloomFilter, a compact in-process set used to reject known-missing keys early.
+
+A Bloom filter never misses a key that was added, but may report a key that was not added
+with a probability of about `error_rate` once `capacity` keys were added.
+The filter is cleared every `max_age` seconds, so entries age out like the cache entries they mirror.
+"""
+import hashlib
+import math
+import threading
+import time
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter with periodic reset."""
+
+    def __init__(self, capacity: int, error_rate: float, max_age: float):
+        """
+        Initializes the BloomFilter, sizing its bit array for the given capacity and error rate.
+
+        :param capacity: number of keys the filter is sized for.
+        :param error_rate: false positive probability at capacity.
+        :param max_age: seconds after which the filter is cleared.
+        """
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.max_age = max_age
+        self._bits = bytearray(math.ceil(self.size / 8))
+        self._created_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def add(self, key: str):
+        """Adds a key to the filter."""
+        with self._lock:
+            self._reset_if_expired()
+            for position in self._positions(key):
+                self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str) -> bool:
+        """Tells whether the key was probably added since the last reset."""
+        with self._lock:
+            self._reset_if_expired()
+            return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    def clear(self):
+        """Removes every key from the filter."""
+        with self._lock:
+            self._bits = bytearray(len(self._bits))
+            self._created_at = time.monotonic()
+
+    def _reset_if_expired(self):
+        if time.monotonic() - self._created_at >= self.max_age:
+            self._bits = bytearray(len(self._bits))
+            self._created_at = time.monotonic()
+
+    def _positions(self, key: str):
+        """Yields the bit positions of the key, derived from one digest by double hashing."""
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'big')
+        h2 = int.from_bytes(digest[8:], 'big') | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size
@@ -3,18 +3,51 @@ This module defines the BookService class which is a concrete implementation of
 
 The class fetches cached details from a Redis instance or from the ISBNdb API.
 """
-import json
 import os
+import time
 from urllib.parse import urljoin
 
 import redis
-import requests
+from requests import HTTPError
 
-from app.config import GET_BOOK_ENDPOINT, REDIS_EXPIRY_TIME, SEARCH_ENDPOINT
+from app.config import (
+    BULK_BOOKS_ENDPOINT,
+    GET_BOOK_ENDPOINT,
+    ISBNDB_BULK_CHUNK_SIZE,
+    NEGATIVE_CACHE_EXPIRY_TIME,
+    REDIS_EXPIRY_TIME,
+    SEARCH_CACHE_EXPIRY_TIME,
+    SEARCH_ENDPOINT,
+    SINGLE_FLIGHT_LOCK_TTL,
+    SINGLE_FLIGHT_POLL_INTERVAL,
+    SINGLE_FLIGHT_WAIT_TIME,
+)
+from app.exceptions.invalid_request_error import InvalidRequestError
 from app.models.book import Book
 from app.models.book_shelf import BookShelf
+from app.services.background_refresher import BackgroundRefresher
+from app.services.bloom_filter import BloomFilter
 from app.services.book_service_base import BookServiceBase
-from app.utils.isbn_utils import is_valid_isbn10, is_valid_isbn13
+from app.services.circuit_breaker import CircuitBreaker, CircuitOpenError
+from app.services.cache_codec import (
+    alias_key,
+    book_key,
+    cache_key,
+    decode_book,
+    decode_search_page,
+    encode_book,
+    encode_search_page,
+    expiry_times,
+    is_stale,
+    missing_key,
+    search_key,
+)
+from app.services.local_cache import LocalCache
+from app.services.rate_limiter import RateLimiter
+from app.services.single_flight import SingleFlight, acquire_lock, release_lock
+from app.services.upstream_client import UpstreamClient
+from app.utils.isbn_utils import is_valid_isbn10, is_valid_isbn13, isbn10_to_isbn13, to_isbn13
+from app.utils.json_body import book_body, mark_degraded, to_json_bytes
 
 
 class BookService(BookServiceBase):
@@ -27,62 +60,386 @@ class BookService(BookServiceBase):
         "Authorization": _api_key
     }
 
-    def __init__(self, redis_client: redis.Redis):
+    def __init__(
+            self,
+            redis_client: redis.Redis,
+            http_client: UpstreamClient,
+            local_cache: LocalCache,
+            single_flight: SingleFlight,
+            refresher: BackgroundRefresher,
+            missing_isbns: BloomFilter,
+            rate_limiter: RateLimiter,
+            circuit_breaker: CircuitBreaker,
+    ):
         """
         Initializes the BookService with a Redis client.
 
-        :param redis_client: Redis client instance for caching book data.
+        :param redis_client: Redis client instance, returning bytes, for caching book data.
+        :param http_client: pooled HTTP client for the ISBNdb API.
+        :param local_cache: in-process cache shared by the BookService instances of this worker.
+        :param single_flight: coalesces the concurrent cache misses of this worker.
+        :param refresher: refreshes stale entries in the background.
+        :param missing_isbns: in-process filter of the ISBNs ISBNdb does not know.
+        :param rate_limiter: limits the ISBNdb calls of every worker to the plan rate and daily quota.
+        :param circuit_breaker: retries the failed ISBNdb calls and fails fast while ISBNdb is down.
         """
         self.redis_client = redis_client
+        self.http_client = http_client
+        self.local_cache = local_cache
+        self.single_flight = single_flight
+        self.refresher = refresher
+        self.missing_isbns = missing_isbns
+        self.rate_limiter = rate_limiter
+        self.circuit_breaker = circuit_breaker
 
     def fetch_book(self, book_shelf: 'BookShelf', isbn10: str = None, isbn13: str = None) -> dict:
-        """Fetches book details from the book service."""
+        """
+        Fetches book details from the book service.
+
+        The book is looked up by its ISBN-13, an ISBN-10 being converted first.
+        :raises InvalidRequestError: 404 if ISBNdb does not know the book.
+        """
         book_id = self._get_book_id(isbn10= isbn10, isbn13=isbn13)
 
-        book = self.redis_client.get(book_id)
+        # The filter may answer a false positive: only the negative cache entry proves the book is missing.
+        if book_id in self.missing_isbns and self.redis_client.exists(missing_key(book_id)):
+            raise self._book_not_found(book_id)
 
-        if book is None:
-            book_dict = self._fetch_book(book_id)
-        else:
-            book_dict = self._load_cached_book(book)
+        book_dict = self._get_cached_book(book_id)
+
+        if book_dict is None:
+            book_dict = dict(self.single_flight.do(book_id, lambda: self._fetch_book_coalesced(book_id)))
 
         # Add shelf information to the book details
         book_dict['shelf'] = self.get_shelf_or_none(book_shelf)
 
         return book_dict
 
+    def fetch_book_body(self, book_shelf: 'BookShelf', isbn13: str) -> bytes:
+        """
+        Fetches the serialized response body of the book details.
+
+        The book JSON, without the per-user shelf, is kept in the in-process cache next to the book,
+        so a hit only splices in the shelf, without decoding or encoding the book.
+        """
+        book_id = self._get_book_id(isbn13=isbn13)
+        book_json = self.local_cache.get(self._body_key(book_id))
+        if book_json is None:
+            book_dict = self.fetch_book(None, isbn13=book_id)
+            del book_dict['shelf']
+            book_json = to_json_bytes(book_dict)
+            self.local_cache.set(self._body_key(book_id), book_json)
+
+        body = book_body(book_json, self.get_shelf_or_none(book_shelf))
+        return mark_degraded(body) if self.is_degraded() else body
+
+    def _fetch_book_coalesced(self, book_id: str) -> dict:
+        """
+        Fetches a missing book, letting a single worker across all nodes call ISBNdb for it.
+
+        The worker holding the Redis lock fetches the book and fills the cache,
+        the others wait briefly for that entry and only call ISBNdb themselves if it does not show up in time.
+        A book ISBNdb returned under another ISBN-13 is read from the entry of that ISBN-13.
+        :param book_id: ISBN-13 of the book.
+        :return: book details as a dictionary.
+        """
+        pipeline = self.redis_client.pipeline(transaction=False)
+        pipeline.exists(missing_key(book_id))
+        pipeline.get(alias_key(book_id))
+        is_missing, alias = pipeline.execute()
+
+        if is_missing:
+            self.missing_isbns.add(book_id)
+            raise self._book_not_found(book_id)
+
+        if alias is not None:
+            book_dict = self._get_cached_book(alias.decode())
+            if book_dict is not None:
+                self.local_cache.set(book_id, dict(book_dict))
+                return book_dict
+
+        lock_key = cache_key('lock', f'book:{book_id}')
+        token = acquire_lock(self.redis_client, lock_key, ttl=SINGLE_FLIGHT_LOCK_TTL)
+
+        if token is None:
+            book_dict = self._wait_for_cached_book(book_id)
+            return book_dict if book_dict is not None else self._fetch_book(book_id)
+
+        try:
+            return self._fetch_book(book_id)
+        finally:
+            release_lock(self.redis_client, lock_key, token)
+
+    def _wait_for_cached_book(self, book_id: str) -> dict | None:
+        """
+        Polls Redis for a book being fetched by another worker.
+
+        :param book_id: ISBN-13 of the book.
+        :return: book details, or None if the entry did not show up within SINGLE_FLIGHT_WAIT_TIME.
+        """
+        deadline = time.monotonic() + SINGLE_FLIGHT_WAIT_TIME
+        while time.monotonic() < deadline:
+            time.sleep(SINGLE_FLIGHT_POLL_INTERVAL)
+            book_dict = self._get_cached_book(book_id)
+            if book_dict is not None:
+                return book_dict
+
+        return None
+
     def _fetch_book(self, book_id):
         """
         Fetches book details from the ISBNdb API.
 
-        :param book_id:
+        :param book_id: ISBN-13 of the book.
         :return: book details as a dictionary.
+        :raises InvalidRequestError: 404 if ISBNdb does not know the book, which is remembered in the negative cache.
         """
         url = urljoin(GET_BOOK_ENDPOINT, book_id)
-        response = requests.get(url, headers=self.headers)
-        response.raise_for_status()
+        response = self._call_isbndb('book', 'GET', url)
+        try:
+            response.raise_for_status()
+        except HTTPError as e:
+            if e.response.status_code == 404:
+                self._cache_missing([book_id])
+                raise self._book_not_found(book_id) from e
+            raise
         json_response = response.json().get('book')
         book = Book.from_json(d=json_response)
         book_dict = book.to_dict()
-        self.redis_client.set(book_id, json.dumps(book_dict), ex=REDIS_EXPIRY_TIME)
+        self._cache_books({book_id: book_dict}, aliases=self._get_aliases({book_id: book_dict}))
         return book_dict
 
+    def fetch_books_bulk(self, isbns: list[str], shelves: dict[str, 'BookShelf'] | None = None) -> dict[str, dict]:
+        """
+        Fetches the details of many books with a single Redis round trip and chunked ISBNdb bulk requests.
+
+        :param isbns: ISBN-10 or ISBN-13 identifiers of the books.
+        :param shelves: Optional mapping of ISBN-13 to BookShelf.
+        :return: book details keyed by the ISBN-13 of the requested ISBN; ISBNs unknown to ISBNdb are omitted.
+        """
+        shelves = shelves or {}
+        book_ids = list(dict.fromkeys(self._get_bulk_book_id(isbn) for isbn in isbns))
+        books, misses = self.get_cached_books(book_ids)
+
+        if misses:
+            try:
+                books.update(self._fetch_books_bulk(misses))
+            except CircuitOpenError as e:
+                # Degraded: only the cached books are returned, see is_degraded.
+                print(f'🧨 {e}')
+
+        for book_id, book_dict in books.items():
+            book_dict['shelf'] = self.get_shelf_or_none(shelves.get(book_id))
+
+        return books
+
+    def get_cached_books(self, book_ids: list[str]) -> tuple[dict[str, dict], list[str]]:
+        """
+        Returns copies of the books found in the caches, refreshing the stale ones in the background.
+
+        The in-process cache is read first, then Redis with a single MGET of the books, their negative cache
+        entries and their aliases, and one more for the aliased books. The negative cache entries being read along
+        with the books, the in-process filter of the missing ISBNs, which may answer false positives, is not used.
+        :param book_ids: ISBN-13s of the books.
+        :return: book details keyed by ISBN-13, and the ISBN-13s to fetch from ISBNdb; ISBNs unknown to ISBNdb are in neither.
+        """
+        books = {}
+        for book_id in book_ids:
+            book_dict = self.local_cache.get(book_id)
+            if book_dict is not None:
+                books[book_id] = dict(book_dict)
+
+        misses = []
+        aliased = {}
+        stale_keys = {}
+        remote_ids = [book_id for book_id in book_ids if book_id not in books]
+        if remote_ids:
+            cached = self.redis_client.mget([
+                key(book_id) for key in (book_key, missing_key, alias_key) for book_id in remote_ids
+            ])
+        else:
+            cached = []
+
+        count = len(remote_ids)
+        cached_books, known_missing, aliases = cached[:count], cached[count:2 * count], cached[2 * count:]
+        for book_id, cached_book, is_missing, alias in zip(remote_ids, cached_books, known_missing, aliases):
+            if is_missing is not None:
+                self.missing_isbns.add(book_id)
+            elif cached_book is None and alias is not None:
+                aliased[book_id] = alias.decode()
+            elif cached_book is None:
+                misses.append(book_id)
+            else:
+                self._load_bulk_book(book_id, book_key(book_id), cached_book, books, stale_keys)
+
+        if aliased:
+            aliased_keys = [book_key(alias) for alias in aliased.values()]
+            for book_id, aliased_key, cached_book in zip(aliased, aliased_keys, self.redis_client.mget(aliased_keys)):
+                if cached_book is None:
+                    misses.append(book_id)
+                else:
+                    self._load_bulk_book(book_id, aliased_key, cached_book, books, stale_keys)
+
+        if stale_keys and not self.circuit_breaker.is_open:
+            self.refresher.refresh_many(stale_keys, self._fetch_books_bulk)
+
+        return books, misses
+
+    def _load_bulk_book(self, book_id: str, key: str, cached_book: bytes, books: dict, stale_keys: dict):
+        """Decodes a book found by fetch_books_bulk into books, noting its key in stale_keys if it is stale."""
+        book_dict = self._load_cached_book(cached_book)
+        self.local_cache.set(book_id, book_dict)
+        books[book_id] = dict(book_dict)
+        if is_stale(cached_book):
+            stale_keys[key] = book_id
+
+    def _fetch_books_bulk(self, book_ids: list[str]) -> dict[str, dict]:
+        """
+        Fetches book details from the ISBNdb bulk endpoint, one request per chunk, see fetch_books_chunk.
+
+        :param book_ids: ISBN-13s missing from the cache.
+        :return: book details keyed by the requested ISBN-13.
+        """
+        books = {}
+        for start in range(0, len(book_ids), ISBNDB_BULK_CHUNK_SIZE):
+            books.update(self.fetch_books_chunk(book_ids[start:start + ISBNDB_BULK_CHUNK_SIZE]))
+
+        return books
+
+    def fetch_books_chunk(self, book_ids: list[str]) -> dict[str, dict]:
+        """
+        Fetches and caches the details of at most ISBNDB_BULK_CHUNK_SIZE books with one ISBNdb bulk request.
+
+        ISBNs that ISBNdb does not return are remembered in the negative cache.
+        :param book_ids: ISBN-13s missing from the cache.
+        :return: book details keyed by the requested ISBN-13.
+        """
+        requested = set(book_ids)
+        response = self._call_isbndb('books', 'POST', BULK_BOOKS_ENDPOINT, data={'isbns': ','.join(book_ids)})
+        if response.status_code == 404:
+            self._cache_missing(book_ids)
+            return {}
+        response.raise_for_status()
+
+        json_books = response.json().get('data') or []
+        returned = {to_isbn13(json_book.get(key)) for json_book in json_books for key in ('isbn13', 'isbn')}
+
+        books = {}
+        for json_book in json_books:
+            try:
+                book_dict = Book.from_json(d=json_book).to_dict()
+            except Exception as e:
+                print(f'🧨 {e}')
+                continue
+
+            book_id = book_dict.get('isbn13')
+            if book_id not in requested:
+                book_id = to_isbn13(book_dict.get('isbn'))
+            if book_id not in requested:
+                continue
+
+            books[book_id] = book_dict
+
+        self._cache_books(books, aliases=self._get_aliases(books))
+        self._cache_missing([book_id for book_id in book_ids if book_id not in returned])
+        return books
+
+    def _cache_missing(self, book_ids: list[str]):
+        """
+        Remembers ISBNs unknown to ISBNdb, in Redis for every worker and in the in-process filter.
+
+        :param book_ids: ISBNs ISBNdb answered as not found.
+        """
+        if not book_ids:
+            return
+
+        pipeline = self.redis_client.pipeline(transaction=False)
+        for book_id in book_ids:
+            self.missing_isbns.add(book_id)
+            pipeline.set(missing_key(book_id), b'1', ex=NEGATIVE_CACHE_EXPIRY_TIME)
+        pipeline.execute()
+
+    def _cache_books(
+            self,
+            books: dict[str, dict],
+            pipeline: redis.client.Pipeline | None = None,
+            aliases: dict[str, str] | None = None,
+    ):
+        """
+        Writes books through to Redis and to the in-process cache.
+
+        The copies of the other workers are invalidated for the books replacing a value in Redis; a book new to Redis
+        cannot be cached by another worker.
+
+        :param books: book details keyed by ISBN-13.
+        :param pipeline: optional pipeline holding other writes to send in the same round trip.
+        :param aliases: optional mapping of requested ISBN-13 to the ISBN-13 under which the book is stored in Redis.
+        """
+        aliases = aliases or {}
+        if pipeline is None:
+            pipeline = self.redis_client.pipeline(transaction=False)
+
+        start = len(pipeline)
+        book_expiry_times = {}
+        for book_id, book_dict in books.items():
+            fresh_until, book_expiry_times[book_id] = expiry_times(REDIS_EXPIRY_TIME)
+            pipeline.set(
+                book_key(aliases.get(book_id, book_id)),
+                encode_book(book_dict, fresh_until),
+                ex=book_expiry_times[book_id],
+                get=True,
+            )
+
+        # Queued after the books, whose replaced values are read below.
+        for book_id, alias in aliases.items():
+            pipeline.set(alias_key(book_id), alias, ex=book_expiry_times[book_id])
+
+        previous_values = pipeline.execute()[start:start + len(books)]
+
+        # Other workers can only hold a book Redis held, so only the replaced books are invalidated.
+        replaced = [book_id for book_id, previous in zip(books, previous_values) if previous is not None]
+        book_ids = replaced + [aliases[book_id] for book_id in replaced if book_id in aliases]
+        self.local_cache.invalidate_many(book_ids + [self._body_key(book_id) for book_id in book_ids])
+        for book_id, book_dict in books.items():
+            self.local_cache.discard(self._body_key(book_id))
+            self.local_cache.set(book_id, dict(book_dict))
+            if book_id in aliases:
+                self.local_cache.set(aliases[book_id], dict(book_dict))
+
+    @staticmethod
+    def _get_aliases(books: dict[str, dict]) -> dict[str, str]:
+        """
+        Returns the requested ISBN-13s of the books ISBNdb returned under another ISBN-13, e.g. another edition.
+
+        :param books: book details keyed by the requested ISBN-13.
+        :return: mapping of requested ISBN-13 to the ISBN-13 returned by ISBNdb.
+        """
+        return {
+            book_id: book_dict['isbn13'] for book_id, book_dict in books.items()
+            if book_dict.get('isbn13') != book_id and is_valid_isbn13(book_dict.get('isbn13'))
+        }
+
     def search_books(self, query: str, page: int, limit: int) -> dict:
         """
         Searches for books using the ISBNdb API based on the provided query.
 
+        Pages are cached under the normalized query for SEARCH_CACHE_EXPIRY_TIME seconds, so equivalent searches
+        share an entry, while ISBNdb receives the query as typed. Every book found is written through to the book
+        details cache.
         :param query: The search query string.
         :param page: The page number for paginated results.
         :param limit: The number of results per page.
         :return: A dictionary containing the search results, including success status, books, page, limit, and total results.
         """
-        url = urljoin(SEARCH_ENDPOINT, f'{query}?page={page}&pageSize={limit}')
-        response = requests.get(url, headers=self.headers)
-        response.raise_for_status()
-        json_data = response.json()
-        total_results = json_data.get('total')
-        json_books = json_data.get('books')
-        json_books = [Book.from_json(d).to_dict() for d in json_books]
+        page_key = search_key(self._normalize_query(query), page, limit)
+        cached_page = self.redis_client.get(page_key)
+
+        if cached_page is not None:
+            total_results, json_books = decode_search_page(cached_page)
+            if is_stale(cached_page) and not self.circuit_breaker.is_open:
+                self.refresher.refresh(page_key, lambda: self._fetch_search_page(query, page, limit, page_key))
+        else:
+            total_results, json_books = self._fetch_search_page(query, page, limit, page_key)
 
         return {
             "success": True,
@@ -92,26 +449,118 @@ class BookService(BookServiceBase):
             "total_results": total_results
         }
 
+    def _fetch_search_page(self, query: str, page: int, limit: int, page_key: str) -> tuple[int, list[dict]]:
+        """
+        Fetches a page of search results from the ISBNdb API and caches it along with its books.
+
+        :param query: search query, as typed.
+        :param page: The page number for paginated results.
+        :param limit: The number of results per page.
+        :param page_key: Redis key of the page, see search_key.
+        :return: total number of results and the book details of the page.
+        """
+        url = urljoin(SEARCH_ENDPOINT, f'{query}?page={page}&pageSize={limit}')
+        response = self._call_isbndb('search', 'GET', url)
+        response.raise_for_status()
+        json_data = response.json()
+        total_results = json_data.get('total')
+        json_books = json_data.get('books')
+        json_books = [Book.from_json(d).to_dict() for d in json_books]
+
+        fresh_until, expiry_time = expiry_times(SEARCH_CACHE_EXPIRY_TIME)
+        pipeline = self.redis_client.pipeline(transaction=False)
+        pipeline.set(page_key, encode_search_page(total_results, json_books, fresh_until), ex=expiry_time)
+        self._cache_books({book['isbn13']: book for book in json_books}, pipeline=pipeline)
+
+        return total_results, json_books
+
+    def _get_cached_book(self, book_id: str) -> dict | None:
+        """
+        Returns a copy of the cached book, looking up the in-process cache before Redis.
+
+        Stale entries are returned as well, while a background refresh is scheduled.
+        :param book_id: ISBN used as cache key.
+        :return: book details as a dictionary, or None on a cache miss.
+        """
+        book_dict = self.local_cache.get(book_id)
+
+        if book_dict is None:
+            book = self.redis_client.get(book_key(book_id))
+            if book is None:
+                return None
+
+            book_dict = self._load_cached_book(book)
+            self.local_cache.set(book_id, book_dict)
+            if is_stale(book) and not self.circuit_breaker.is_open:
+                self.refresher.refresh(book_key(book_id), lambda: self._fetch_book(book_id))
+
+        return dict(book_dict)
+
+    def is_degraded(self) -> bool:
+        """Tells whether ISBNdb is unavailable, so books are only served from the cache."""
+        return self.circuit_breaker.is_open
+
+    def _call_isbndb(self, endpoint: str, method: str, url: str, **kwargs):
+        """
+        Calls ISBNdb within its rate limit, retrying failed attempts through the circuit breaker.
+
+        :param endpoint: ISBNdb endpoint, counted separately in the quota ledger.
+        :param method: HTTP method.
+        :param url: absolute URL.
+        :param kwargs: any other keyword argument accepted by requests.Session.request.
+        :return: requests.Response
+        :raises CircuitOpenError: 503 while ISBNdb is considered down.
+        """
+        def call():
+            self.rate_limiter.acquire(endpoint)
+            return self.http_client.request(method, url, headers=self.headers, **kwargs)
+
+        return self.circuit_breaker.call(call)
+
+    @staticmethod
+    def _body_key(book_id: str) -> str:
+        """Returns the in-process cache key of the serialized book JSON."""
+        return f'{book_id}:json'
+
     @staticmethod
     def _load_cached_book(book):
         """
         Loads a cached book from Redis.
 
-        :param book:
+        The entry was validated before it was written, so it is only decoded.
+        :param book: encoded entry.
         :return: book details as a dictionary.
         """
-        book = json.loads(book)
-        book = Book.from_json(d=book)
-        book_dict = book.to_dict()
-        return book_dict
+        return decode_book(book)
+
+    @staticmethod
+    def _book_not_found(book_id: str) -> InvalidRequestError:
+        return InvalidRequestError(code=404, message=f"Book with ISBN '{book_id}' not found.")
+
+    @staticmethod
+    def _normalize_query(query: str) -> str:
+        """Returns the query casefolded and with its whitespace collapsed, so equivalent searches share a cache entry."""
+        return ' '.join(query.split()).casefold()
 
     @staticmethod
     def _get_book_id(isbn10: str = None, isbn13: str = None):
-        """Returns the book ID based on the ISBN provided."""
+        """Returns the book ID, the ISBN-13 of the book, based on the ISBN provided."""
         if isbn10 and not is_valid_isbn10(isbn10):
             raise ValueError("Invalid ISBN-10 format.")
 
         if isbn13 and not is_valid_isbn13(isbn13):
             raise ValueError("Invalid ISBN-13 format.")
 
-        return isbn13 if isbn13 else isbn10
+        if not isbn13 and not isbn10:
+            raise ValueError("At least one of ISBN-10 or ISBN-13 must be provided.")
+
+        return isbn13 if isbn13 else isbn10_to_isbn13(isbn10)
+
+    @staticmethod
+    def _get_bulk_book_id(isbn: str):
+        """Returns the book ID, the ISBN-13 of the book, for an ISBN of either format."""
+        book_id = to_isbn13(isbn)
+        if book_id is None:
+            raise ValueError(f"Invalid ISBN format: '{isbn}'.")
+
+        return book_id
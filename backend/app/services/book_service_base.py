@@ -4,6 +4,7 @@ from typing import Optional
 
 from app.models.book_shelf import BookShelf
 from app.models.shelf import ShelfEnum
+from app.utils.json_body import mark_degraded, to_json_bytes
 
 
 class BookServiceBase(ABC):
@@ -33,6 +34,43 @@ class BookServiceBase(ABC):
         """
         pass
 
+    def fetch_book_body(self, book_shelf: Optional['BookShelf'], isbn13: str) -> bytes:
+        """
+        Fetches the serialized response body of the book details, {"book": {...}, "success": true}.
+
+        Implementations caching the pre-serialized book override it; by default fetch_book is serialized.
+
+        :param book_shelf: Optional BookShelf object containing shelf information.
+        :type book_shelf: Optional[BookShelf]
+        :param isbn13: ISBN-13 identifier of the book.
+        :type isbn13: str
+        :return: serialized JSON object, flagged as degraded while the upstream is unavailable.
+        :rtype: bytes
+        """
+        body = to_json_bytes({'success': True, 'book': self.fetch_book(book_shelf, isbn13=isbn13)})
+        return mark_degraded(body) if self.is_degraded() else body
+
+    @abstractmethod
+    def fetch_books_bulk(
+            self,
+            isbns: list[str],
+            shelves: dict[str, Optional['BookShelf']] | None = None
+    ) -> dict[str, dict]:
+        """
+        Abstract method to fetch the details of many books at once.
+
+        This method must be implemented by subclasses to retrieve book information
+        for every provided ISBN with as few cache and upstream round trips as possible.
+
+        :param isbns: ISBN-10 or ISBN-13 identifiers of the books.
+        :type isbns: list[str]
+        :param shelves: Optional mapping of ISBN-13 to the BookShelf object containing shelf information.
+        :type shelves: dict[str, Optional[BookShelf]] | None
+        :return: A dictionary mapping the ISBN-13 of each resolved ISBN to its book details; unresolved ISBNs are omitted.
+        :rtype: dict[str, dict]
+        """
+        pass
+
     @abstractmethod
     def search_books(self, query: str, page: int, limit: int) -> dict:
         """
@@ -64,3 +102,11 @@ class BookServiceBase(ABC):
             return ShelfEnum.to_str(book_shelf.shelf)
         else:
             return None
+
+    def is_degraded(self) -> bool:
+        """
+        Tells whether ISBNdb is unavailable, so books can only be served from the cache or the database.
+
+        :return: False unless the implementation tracks the upstream health.
+        """
+        return False
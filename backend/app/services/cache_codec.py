@@ -0,0 +1,328 @@
+"""
+This module defines the Redis cache format shared by the book services.
+
+Keys are namespaced and carry the schema version, e.g. 'adb:book:v2:9780393609646'.
+Books are always keyed by their ISBN-13; ISBN-10s are converted before any lookup.
+Values are a six bytes header (schema version, flags, fresh-until epoch seconds) followed by the entry encoded
+as a compact JSON array of field values in a fixed order, so field names are not stored.
+Payloads above CACHE_COMPRESSION_THRESHOLD, in practice books with a long synopsis, are zlib compressed.
+
+Entries under a current-version key were validated before being written, so decoding trusts them as they are.
+
+Entries follow a stale-while-revalidate model: they are fresh until the time stored in their header,
+then served stale while being refreshed, until Redis drops them after a stale window proportional to their TTL.
+Both times are jittered so entries written together do not expire together.
+"""
+import json
+import random
+import struct
+import time
+import zlib
+
+from app.config import (
+    CACHE_COMPRESSION_THRESHOLD,
+    CACHE_KEY_PREFIX,
+    CACHE_SCHEMA_VERSION,
+    CACHE_STALE_FACTOR,
+    CACHE_STALE_MAX_TIME,
+    CACHE_TTL_JITTER,
+)
+
+# Field order of the encoded entries. Changing it requires bumping CACHE_SCHEMA_VERSION.
+BOOK_FIELDS = (
+    'isbn',
+    'isbn13',
+    'title',
+    'subtitle',
+    'authors',
+    'image',
+    'rating',
+    'msrp',
+    'language',
+    'publisher',
+    'date_published',
+    'synopsis',
+    'pages',
+    'subjects',
+)
+
+BOOK_RESPONSE_FIELDS = (
+    'isbn13',
+    'isbn10',
+    'title',
+    'authors',
+    'image',
+)
+
+_FLAG_ZLIB = 0x01
+# The body is preceded by the ISBN-13s of its books, comma separated, and a newline; JSON bodies hold no raw newline.
+_FLAG_ISBN13S = 0x02
+_HEADER = struct.Struct('>BBI')
+
+
+def cache_key(kind: str, key_id: str) -> str:
+    """
+    Returns the namespaced, versioned Redis key of a cache entry.
+
+    :param kind: entry kind, e.g. 'book' or 'nyt'.
+    :param key_id: entry identifier, e.g. an ISBN or a NYT list path.
+    :return: Redis key.
+    """
+    return f'{CACHE_KEY_PREFIX}:{kind}:v{CACHE_SCHEMA_VERSION}:{key_id}'
+
+
+def book_key(book_id: str) -> str:
+    """Returns the Redis key of a book detail entry."""
+    return cache_key('book', book_id)
+
+
+def missing_key(book_id: str) -> str:
+    """Returns the Redis key of the negative cache entry of an ISBN unknown to ISBNdb."""
+    return cache_key('missing', book_id)
+
+
+def alias_key(book_id: str) -> str:
+    """
+    Returns the Redis key of the ISBN-13 under which ISBNdb returned the book of a requested ISBN-13.
+
+    Books are cached under the ISBN-13 ISBNdb returns, so an aliased ISBN resolves to the same entry;
+    an alias expires along with the book entry it was written with.
+    """
+    return cache_key('alias', book_id)
+
+
+def search_key(query: str, page, limit) -> str:
+    """Returns the Redis key of a page of search results for an already normalized query."""
+    return cache_key('search', f'{page}:{limit}:{query}')
+
+
+def nyt_key(path: str) -> str:
+    """Returns the Redis key of a NYT bestsellers list entry."""
+    return cache_key('nyt', path)
+
+
+def nyt_catalog_key() -> str:
+    """Returns the Redis key of the catalog of the current NYT bestsellers list names."""
+    return cache_key('nyt', 'catalog')
+
+
+def nyt_pages_key(path: str) -> str:
+    """
+    Returns the Redis key of the hash of precomputed response bodies of the pages of a NYT bestsellers list.
+
+    Fields are '<page>:<limit>', see page_field; the hash is replaced whenever the list is written.
+    """
+    return cache_key('nyt-pages', path)
+
+
+def page_field(page: int, limit: int) -> str:
+    """Returns the hash field of a precomputed page."""
+    return f'{page}:{limit}'
+
+
+def jittered(ttl: float) -> int:
+    """
+    Returns the TTL randomly spread by CACHE_TTL_JITTER, so entries written in a burst expire at different times.
+
+    :param ttl: TTL in seconds.
+    :return: jittered TTL in whole seconds, at least one.
+    """
+    return max(1, round(ttl * random.uniform(1 - CACHE_TTL_JITTER, 1 + CACHE_TTL_JITTER)))
+
+
+def expiry_times(ttl: float) -> tuple[int, int]:
+    """
+    Returns the soft and hard expiry of an entry written now.
+
+    :param ttl: seconds the entry stays fresh, before jitter.
+    :return: fresh-until epoch seconds to encode in the entry, and the Redis expiry in seconds.
+    """
+    fresh_for = jittered(ttl)
+    return int(time.time()) + fresh_for, fresh_for + stale_time(ttl)
+
+
+def stale_time(ttl: float) -> int:
+    """
+    Returns how long an entry is kept once stale, CACHE_STALE_FACTOR times its TTL up to CACHE_STALE_MAX_TIME.
+
+    :param ttl: seconds the entry stays fresh.
+    :return: jittered stale window in seconds.
+    """
+    return jittered(min(ttl * CACHE_STALE_FACTOR, CACHE_STALE_MAX_TIME))
+
+
+def is_stale(data: bytes) -> bool:
+    """
+    Tells whether an encoded entry is past its fresh-until time.
+
+    :param data: encoded entry.
+    :return: True if the entry should be served while being refreshed.
+    """
+    return _read_header(data)[2] <= time.time()
+
+
+def read_fresh_until(data: bytes) -> int:
+    """
+    Returns the fresh-until time of an encoded entry.
+
+    :param data: encoded entry, or only its header, e.g. read with GETRANGE.
+    :return: epoch seconds until which the entry is fresh.
+    """
+    return _read_header(data)[2]
+
+
+def header_size() -> int:
+    """Returns the size in bytes of the header of the encoded entries."""
+    return _HEADER.size
+
+
+def encode_book(book_dict: dict, fresh_until: int) -> bytes:
+    """
+    Encodes the book details, as returned by Book.to_dict, without the per-user shelf.
+
+    :param book_dict: book details.
+    :param fresh_until: epoch seconds until which the entry is fresh, see expiry_times.
+    :return: encoded entry.
+    """
+    return _encode(_to_row(BOOK_FIELDS, book_dict), fresh_until)
+
+
+def decode_book(data: bytes) -> dict:
+    """
+    Decodes an entry written by encode_book.
+
+    :param data: encoded entry.
+    :return: book details as a dictionary.
+    """
+    return _from_row(BOOK_FIELDS, _decode(data))
+
+
+def encode_book_responses(books: list[dict], fresh_until: int) -> bytes:
+    """
+    Encodes a list of books, as returned by BookResponse.to_dict, without the per-user shelf.
+
+    :param books: list of book dictionaries.
+    :param fresh_until: epoch seconds until which the entry is fresh, see expiry_times.
+    :return: encoded entry.
+    """
+    return _encode([_to_row(BOOK_RESPONSE_FIELDS, book) for book in books], fresh_until)
+
+
+def decode_book_responses(data: bytes) -> list[dict]:
+    """
+    Decodes an entry written by encode_book_responses.
+
+    :param data: encoded entry.
+    :return: list of book dictionaries.
+    """
+    return [_from_row(BOOK_RESPONSE_FIELDS, row) for row in _decode(data)]
+
+
+def encode_search_page(total_results: int, books: list[dict], fresh_until: int) -> bytes:
+    """
+    Encodes a page of search results.
+
+    :param total_results: total number of results reported by ISBNdb.
+    :param books: book details of the page, as returned by Book.to_dict.
+    :param fresh_until: epoch seconds until which the entry is fresh, see expiry_times.
+    :return: encoded entry.
+    """
+    return _encode([total_results, [_to_row(BOOK_FIELDS, book) for book in books]], fresh_until)
+
+
+def decode_search_page(data: bytes) -> tuple[int, list[dict]]:
+    """
+    Decodes an entry written by encode_search_page.
+
+    :param data: encoded entry.
+    :return: total number of results and the book details of the page.
+    """
+    total_results, rows = _decode(data)
+    return total_results, [_from_row(BOOK_FIELDS, row) for row in rows]
+
+
+def encode_body(body: bytes, isbn13s: list[str], fresh_until: int) -> bytes:
+    """
+    Encodes a pre-serialized list response body, never compressed so a hit is sent without any decoding.
+
+    The ISBN-13s of the books of the body are stored before it, so it can be annotated without decoding it.
+    :param body: serialized JSON response body.
+    :param isbn13s: ISBN-13s of the books of the body.
+    :param fresh_until: epoch seconds until which the entry is fresh, see expiry_times.
+    :return: encoded entry.
+    """
+    return _HEADER.pack(CACHE_SCHEMA_VERSION, _FLAG_ISBN13S, fresh_until) + ','.join(isbn13s).encode() + b'\n' + body
+
+
+def decode_body(data: bytes) -> tuple[bytes, list[str] | None]:
+    """
+    Decodes an entry written by encode_body.
+
+    :param data: encoded entry.
+    :return: serialized JSON response body, and the ISBN-13s of its books; None for an entry written without them.
+    """
+    _, flags, _ = _read_header(data)
+    if not flags & _FLAG_ISBN13S:
+        return data[_HEADER.size:], None
+
+    isbn13s, body = data[_HEADER.size:].split(b'\n', 1)
+    return body, isbn13s.decode().split(',') if isbn13s else []
+
+
+def encode_list_names(names: dict[str, str], fresh_until: int) -> bytes:
+    """
+    Encodes the catalog of the NYT bestsellers lists.
+
+    :param names: display names keyed by encoded list name.
+    :param fresh_until: epoch seconds until which the entry is fresh, see expiry_times.
+    :return: encoded entry.
+    """
+    return _encode(list(names.items()), fresh_until)
+
+
+def decode_list_names(data: bytes) -> dict[str, str]:
+    """
+    Decodes an entry written by encode_list_names.
+
+    :param data: encoded entry.
+    :return: display names keyed by encoded list name.
+    """
+    return dict(_decode(data))
+
+
+def _to_row(fields: tuple, d: dict) -> list:
+    return [d.get(field) for field in fields]
+
+
+def _from_row(fields: tuple, row: list) -> dict:
+    return {field: value for field, value in zip(fields, row) if value is not None}
+
+
+def _encode(payload, fresh_until: int) -> bytes:
+    body = json.dumps(payload, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    flags = 0
+
+    if len(body) > CACHE_COMPRESSION_THRESHOLD:
+        compressed = zlib.compress(body)
+        if len(compressed) < len(body):
+            body = compressed
+            flags |= _FLAG_ZLIB
+
+    return _HEADER.pack(CACHE_SCHEMA_VERSION, flags, fresh_until) + body
+
+
+def _read_header(data: bytes) -> tuple[int, int, int]:
+    if len(data) < _HEADER.size or data[0] != CACHE_SCHEMA_VERSION:
+        raise ValueError('Unsupported cache entry version.')
+
+    return _HEADER.unpack_from(data)
+
+
+def _decode(data: bytes):
+    _, flags, _ = _read_header(data)
+
+    body = data[_HEADER.size:]
+    if flags & _FLAG_ZLIB:
+        body = zlib.decompress(body)
+
+    return json.loads(body)
@@ -0,0 +1,76 @@
+"""
+This module provides CacheWarmer, which fills the book cache ahead of the readers, e.g. as a deploy step.
+
+The ISBNs are warmed in sorted order, in batches of one ISBNdb bulk request, through BookService.fetch_books_bulk,
+so books already cached are skipped and the ISBNdb calls stay within the shared rate limit.
+The last ISBN of every warmed batch is checkpointed in Redis, an interrupted run resumes after it.
+"""
+from typing import Callable
+
+import redis
+
+from app.services.book_service_base import BookServiceBase
+from app.services.cache_codec import cache_key
+
+
+def warm_checkpoint_key() -> str:
+    """Returns the Redis key of the last ISBN-13 warmed by an unfinished run."""
+    return cache_key('warm', 'books')
+
+
+class CacheWarmer:
+    """Warms the book cache in resumable, rate-limited batches."""
+
+    def __init__(self, book_service: BookServiceBase, redis_client: redis.Redis, batch_size: int, checkpoint_ttl: int):
+        """
+        Initializes the CacheWarmer.
+
+        :param book_service: book service filling the cache.
+        :param redis_client: Redis client holding the checkpoint.
+        :param batch_size: ISBNs per batch.
+        :param checkpoint_ttl: seconds the checkpoint of an unfinished run is kept.
+        """
+        self.book_service = book_service
+        self.redis_client = redis_client
+        self.batch_size = batch_size
+        self.checkpoint_ttl = checkpoint_ttl
+
+    def pending(self, isbn13s: set[str], restart: bool = False) -> list[str]:
+        """
+        Returns the ISBNs left to warm, in order.
+
+        :param isbn13s: ISBN-13s to warm.
+        :param restart: ignores the checkpoint of an unfinished run.
+        :return: sorted ISBN-13s after the checkpoint.
+        """
+        if restart:
+            self.redis_client.delete(warm_checkpoint_key())
+            return sorted(isbn13s)
+
+        checkpoint = self.redis_client.get(warm_checkpoint_key())
+        checkpoint = checkpoint.decode() if isinstance(checkpoint, bytes) else checkpoint
+        return sorted(isbn13 for isbn13 in isbn13s if checkpoint is None or isbn13 > checkpoint)
+
+    def warm(self, isbn13s: list[str], on_batch: Callable[[int], None] | None = None) -> bool:
+        """
+        Warms the cache with the books of the given ISBNs.
+
+        :param isbn13s: sorted ISBN-13s, as returned by pending.
+        :param on_batch: called with the number of ISBNs of every warmed batch.
+        :return: True once every ISBN is warmed, False if stopped because ISBNdb is unavailable.
+        :raises InvalidRequestError: 429 if the ISBNdb rate limit or daily quota is reached; the run can be resumed.
+        :raises requests.RequestException: if an ISBNdb request fails otherwise; the run can be resumed.
+        """
+        for start in range(0, len(isbn13s), self.batch_size):
+            batch = isbn13s[start:start + self.batch_size]
+            self.book_service.fetch_books_bulk(batch)
+            if self.book_service.is_degraded():
+                # The batch may be partially warmed, it is retried by the next run.
+                return False
+
+            self.redis_client.set(warm_checkpoint_key(), batch[-1], ex=self.checkpoint_ttl)
+            if on_batch:
+                on_batch(len(batch))
+
+        self.redis_client.delete(warm_checkpoint_key())
+        return True
@@ -0,0 +1,150 @@
+"""
+This module provides CircuitBreaker, which retries failed upstream calls and stops calling an upstream that keeps failing.
+
+A call failing with a connection error, a timeout, a 429 or a 5xx answer is retried after an exponential backoff
+with full jitter. After `failure_threshold` calls in a row failed, the circuit opens: calls fail fast with
+CircuitOpenError for `reset_timeout` seconds, so requests do not tie up the workers waiting on a dead upstream.
+A single probe call is then let through, closing the circuit again if it succeeds.
+The state is kept per worker process.
+"""
+import random
+import threading
+import time
+
+import requests
+
+from app.exceptions.invalid_request_error import InvalidRequestError
+
+
+class CircuitOpenError(InvalidRequestError):
+    """Raised instead of calling an upstream whose circuit is open."""
+
+    def __init__(self, name: str):
+        """Init the error with a 503 status code."""
+        super().__init__(code=503, message=f"Upstream '{name}' is unavailable, try again later.")
+
+
+class CircuitBreaker:
+    """Retry and circuit breaker policy of one upstream."""
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(
+            self,
+            name: str,
+            failure_threshold: int,
+            reset_timeout: float,
+            retries: int,
+            retry_base_delay: float,
+            retry_max_delay: float,
+    ):
+        """
+        Initializes the CircuitBreaker, closed.
+
+        :param name: upstream name.
+        :param failure_threshold: failed calls in a row opening the circuit.
+        :param reset_timeout: seconds the circuit stays open before a probe call is let through.
+        :param retries: retries of a failed attempt within a call.
+        :param retry_base_delay: maximum delay before the first retry, doubled for every further one.
+        :param retry_max_delay: cap of the delay before a retry.
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.retries = retries
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """Returns the state of the circuit: closed, open or half_open when a probe call may be let through."""
+        with self._lock:
+            if self._opened_at is None:
+                return self.CLOSED
+            if self._probing or time.monotonic() - self._opened_at < self.reset_timeout:
+                return self.OPEN
+            return self.HALF_OPEN
+
+    @property
+    def is_open(self) -> bool:
+        """Tells whether calls currently fail fast, so responses can only be served from cached or persisted data."""
+        return self.state == self.OPEN
+
+    def call(self, fn: callable) -> requests.Response:
+        """
+        Calls the upstream through fn, retrying failed attempts.
+
+        :param fn: function without arguments sending the request.
+        :return: the response of the last attempt; a 429 or 5xx response once the retries are exhausted.
+        :raises CircuitOpenError: if the circuit is open.
+        :raises requests.RequestException: the error of the last attempt once the retries are exhausted.
+        """
+        is_probe = self._before_call()
+        try:
+            for attempt in range(self.retries + 1):
+                try:
+                    response = fn()
+                except (requests.ConnectionError, requests.Timeout):
+                    if attempt == self.retries:
+                        self._on_failure()
+                        raise
+                else:
+                    if not self._is_transient(response):
+                        self._on_success()
+                        return response
+                    if attempt == self.retries:
+                        self._on_failure()
+                        return response
+
+                time.sleep(self._backoff(attempt))
+        finally:
+            if is_probe:
+                self._end_probe()
+
+    def stats(self) -> dict:
+        """Returns the state of the circuit and the number of failed calls in a row."""
+        return {'state': self.state, 'failures': self._failures}
+
+    def _before_call(self) -> bool:
+        """
+        Raises CircuitOpenError unless the circuit is closed or this call is the probe of a half-open circuit.
+
+        :return: True if this call is the probe.
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return False
+            if self._probing or time.monotonic() - self._opened_at < self.reset_timeout:
+                raise CircuitOpenError(self.name)
+            self._probing = True
+            return True
+
+    def _end_probe(self):
+        with self._lock:
+            self._probing = False
+
+    def _on_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+
+    def _on_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                # Opens the circuit, or keeps it open for another reset_timeout after a failed probe.
+                self._opened_at = time.monotonic()
+
+    def _backoff(self, attempt: int) -> float:
+        """Returns the delay before the next attempt, drawn uniformly up to the capped exponential backoff."""
+        return random.uniform(0, min(self.retry_max_delay, self.retry_base_delay * 2 ** attempt))
+
+    @staticmethod
+    def _is_transient(response) -> bool:
+        return response.status_code == 429 or response.status_code >= 500
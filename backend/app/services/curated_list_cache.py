@@ -0,0 +1,127 @@
+"""
+This module provides CuratedListCache, which keeps the assembled curated picks response of every list in Redis.
+
+Curated lists are read far more often than curators edit them. Each list has a Redis hash holding its version,
+bumped by every curator write once committed, and the serialized responses of the whole list and of its pages,
+each stored along with the ISBN-13s of its books.
+A bump drops every response of the list, and a response is only stored while the version it was built at is current,
+so a response assembled from data read before a curator write is never served after it. A reader gets the version
+and a response in one HMGET.
+"""
+import redis
+
+from app.services.cache_codec import cache_key
+
+_VERSION_FIELD = 'version'
+_BODY_FIELD = 'body'
+_ISBN13S_FIELD = 'isbn13s'
+
+# Stores a response if the version it was built at is still current. The expiry is only set on a hash without one,
+# so storing responses does not keep the older ones of the hash alive.
+_PUT_SCRIPT = """
+if tonumber(redis.call('hget', KEYS[1], 'version') or '0') ~= tonumber(ARGV[1]) then
+    return 0
+end
+redis.call('hset', KEYS[1], ARGV[3], ARGV[4], ARGV[5], ARGV[6])
+if redis.call('ttl', KEYS[1]) < 0 then
+    redis.call('expire', KEYS[1], ARGV[2])
+end
+return 1
+"""
+
+# Replaces the hash of a list with its next version alone, dropping the responses of every page.
+_BUMP_SCRIPT = """
+local version = tonumber(redis.call('hget', KEYS[1], 'version') or '0') + 1
+redis.call('del', KEYS[1])
+redis.call('hset', KEYS[1], 'version', version)
+redis.call('expire', KEYS[1], ARGV[1])
+return version
+"""
+
+
+def curated_list_key(list_id: int) -> str:
+    """Returns the Redis key of the version and materialized response of a curated list."""
+    return cache_key('curated', str(list_id))
+
+
+class CuratedListCache:
+    """Materialized curated picks responses, invalidated by a per-list version."""
+
+    def __init__(self, redis_client: redis.Redis, ttl: int):
+        """
+        Initializes the CuratedListCache.
+
+        :param redis_client: Redis client, returning bytes, holding the responses.
+        :param ttl: seconds the responses of a list are kept, bounding how long the details of its books may lag behind.
+        """
+        self.redis_client = redis_client
+        self.ttl = ttl
+
+    def get(self, list_id: int, page: str | None = None) -> tuple[bytes | None, list[str], int]:
+        """
+        Looks up the response of a list.
+
+        :param list_id: ID of the curated list.
+        :param page: field naming a page of the list, None for the whole list.
+        :return: the serialized response if stored, else None; the ISBN-13s of its books;
+        and the current version, to store the response built next. Should Redis fail, None, [] and version 0.
+        """
+        try:
+            version, body, isbn13s = self.redis_client.hmget(
+                curated_list_key(list_id), [_VERSION_FIELD, *_response_fields(page)]
+            )
+        except redis.RedisError as e:
+            print(f'🧨 {e}')
+            return None, [], 0
+
+        version = int(version or 0)
+        if body is None or isbn13s is None:
+            return None, [], version
+
+        return body, isbn13s.decode().split(',') if isbn13s else [], version
+
+    def put(self, list_id: int, version: int, body: bytes, isbn13s: list[str], page: str | None = None):
+        """
+        Stores the response of a list, built from data read after get returned version.
+
+        A response built at an outdated version is dropped.
+        :param list_id: ID of the curated list.
+        :param version: version returned by get before reading the list.
+        :param body: serialized response.
+        :param isbn13s: ISBN-13s of the books of the response, so it can be annotated without decoding it.
+        :param page: field naming a page of the list, None for the whole list.
+        """
+        body_field, isbn13s_field = _response_fields(page)
+        try:
+            self.redis_client.eval(
+                _PUT_SCRIPT,
+                1,
+                curated_list_key(list_id),
+                version,
+                self.ttl,
+                body_field,
+                body,
+                isbn13s_field,
+                ','.join(isbn13s),
+            )
+        except redis.RedisError as e:
+            print(f'🧨 {e}')
+
+    def bump(self, list_id: int):
+        """
+        Invalidates the responses of a list, once a curator change to the list or its picks is committed.
+
+        :param list_id: ID of the curated list.
+        """
+        try:
+            self.redis_client.eval(_BUMP_SCRIPT, 1, curated_list_key(list_id), self.ttl)
+        except redis.RedisError as e:
+            print(f'🧨 {e}')
+
+
+def _response_fields(page: str | None) -> tuple[str, str]:
+    """Returns the hash fields of the body and of the ISBN-13s of the response of a page, or of the list."""
+    if page is None:
+        return _BODY_FIELD, _ISBN13S_FIELD
+
+    return f'{_BODY_FIELD}:{page}', f'{_ISBN13S_FIELD}:{page}'
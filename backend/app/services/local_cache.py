@@ -0,0 +1,204 @@
+"""
+This module provides LocalCache, a bounded, TTL-aware LRU cache that lives inside each worker process.
+
+It sits in front of Redis for hot entries. Invalidations are broadcast over Redis pub/sub,
+so every gunicorn worker drops an entry at the same time. Each message is tagged with the id of the publishing process,
+which ignores its own messages: it already dropped the entry, and may have cached the new value since.
+"""
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+import redis
+
+from app.config import LOCAL_CACHE_INVALIDATION_CHANNEL
+
+_caches: dict[str, 'LocalCache'] = {}
+
+_process_id = uuid.uuid4().hex
+
+
+def _renew_process_id():
+    """Gives a forked worker its own process id, distinct from the one of its parent."""
+    global _process_id
+    _process_id = uuid.uuid4().hex
+
+
+os.register_at_fork(after_in_child=_renew_process_id)
+
+
+class LocalCache:
+    """In-process LRU cache with per-entry expiry and cross-worker invalidation."""
+
+    def __init__(self, name: str, redis_client: redis.Redis, max_entries: int, ttl: float):
+        """
+        Initializes the LocalCache.
+
+        :param name: cache name, used to scope invalidation messages and in the statistics.
+        :param redis_client: Redis client used to publish and receive invalidations.
+        :param max_entries: maximum number of entries kept before the least recently used one is evicted.
+        :param ttl: seconds an entry stays valid in this process.
+        """
+        self.name = name
+        self.redis_client = redis_client
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[float, object]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._listener = None
+        self._listener_pid = None
+        self._listener_retry_at = 0.0
+        _caches[name] = self
+
+    def get(self, key: str):
+        """
+        Returns the cached value, or None when the key is missing or expired.
+
+        :param key: cache key.
+        :return: cached value or None.
+        """
+        self._ensure_listener()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value, ttl: float | None = None):
+        """
+        Stores a value, evicting the least recently used entries above max_entries.
+
+        :param key: cache key.
+        :param value: value to cache; callers must not mutate it afterwards.
+        :param ttl: optional expiry in seconds, capped at the cache TTL.
+        """
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, key: str):
+        """Drops a key from this process only."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def invalidate(self, key: str):
+        """
+        Drops a key from this process and tells every other worker to drop it too.
+
+        :param key: cache key.
+        """
+        self.discard(key)
+        try:
+            self.redis_client.publish(self._channel(), self._message(key))
+        except redis.RedisError as e:
+            print(f'🧨 {e}')
+
+    def invalidate_many(self, keys: list[str]):
+        """
+        Drops many keys from every worker, publishing all the invalidations in one round trip.
+
+        :param keys: cache keys.
+        """
+        if not keys:
+            return
+
+        pipeline = self.redis_client.pipeline(transaction=False)
+        for key in keys:
+            self.discard(key)
+            pipeline.publish(self._channel(), self._message(key))
+
+        try:
+            pipeline.execute()
+        except redis.RedisError as e:
+            print(f'🧨 {e}')
+
+    def clear(self):
+        """Drops every entry from this process."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Returns the size and the hit and miss counters of this cache."""
+        with self._lock:
+            size = len(self._entries)
+
+        lookups = self.hits + self.misses
+        return {
+            'size': size,
+            'max_entries': self.max_entries,
+            'ttl': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def _channel(self) -> str:
+        return f'{LOCAL_CACHE_INVALIDATION_CHANNEL}:{self.name}'
+
+    @staticmethod
+    def _message(key: str) -> str:
+        """Returns the invalidation message of a key, tagged with the id of this process."""
+        return f'{_process_id} {key}'
+
+    def _ensure_listener(self):
+        """
+        Subscribes to the invalidation channel once per process.
+
+        The subscription is started lazily, so each forked worker runs its own listener thread.
+        """
+        if self._listener is not None and self._listener_pid == os.getpid():
+            return
+
+        if time.monotonic() < self._listener_retry_at:
+            return
+
+        with self._lock:
+            if self._listener is not None and self._listener_pid == os.getpid():
+                return
+
+            try:
+                pubsub = self.redis_client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(**{self._channel(): self._on_invalidation})
+                self._listener = pubsub.run_in_thread(
+                    sleep_time=1,
+                    daemon=True,
+                    exception_handler=self._on_listener_error,
+                )
+                self._listener_pid = os.getpid()
+            except redis.RedisError as e:
+                # Entries still expire by TTL meanwhile; the subscription is retried after a TTL.
+                print(f'🧨 {e}')
+                self._listener_retry_at = time.monotonic() + self.ttl
+
+    def _on_invalidation(self, message: dict):
+        data = message.get('data')
+        origin, _, key = (data.decode() if isinstance(data, bytes) else data).partition(' ')
+        if origin != _process_id:
+            self.discard(key)
+
+    @staticmethod
+    def _on_listener_error(e, pubsub, thread):
+        print(f'🧨 {e}')
+        time.sleep(1)
+
+
+def local_cache_stats() -> dict:
+    """Returns the statistics of every LocalCache created in this process."""
+    return {name: cache.stats() for name, cache in list(_caches.items())}
@@ -4,11 +4,13 @@ This module contains the concrete implementation of the NYTimesServiceBase inter
 The class fetches bestsellers list from a Redis instance or from the NYTimes API.
 """
 import json
+import math
 import os
+import time
+from datetime import date, datetime, timezone
 from urllib.parse import urljoin
 
 import redis
-import requests
 from flask import (
     abort,
 )
@@ -19,55 +21,93 @@ from requests import (
 )
 
 from app.config import (
-    NY_TIMES_BOOKS_LIST_URL, REDIS_EXPIRY_TIME,
+    CACHE_STALE_MAX_TIME,
+    NY_TIMES_BOOKS_LIST_URL,
+    NYT_OVERVIEW_PATH,
+    NYT_PRECOMPUTED_PAGE_LIMITS,
+    REDIS_EXPIRY_TIME,
 )
 from app.models.book_dto import BookResponse
+from app.pagination.books import page_bounds
+from app.services.background_refresher import BackgroundRefresher
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.cache_codec import (
+    decode_body,
+    decode_book_responses,
+    decode_list_names,
+    encode_book_responses,
+    encode_body,
+    encode_list_names,
+    expiry_times,
+    is_stale,
+    jittered,
+    nyt_catalog_key,
+    nyt_key,
+    nyt_pages_key,
+    page_field,
+    stale_time,
+)
 from app.services.ny_times_service_base import NYTimesServiceBase
+from app.services.nyt_snapshot_store import NytSnapshotStore
+from app.utils.json_body import mark_degraded, to_json_bytes
+from app.services.upstream_client import UpstreamClient
 
 
 class NyTimesService(NYTimesServiceBase):
     """Concrete implementation of the NYTimesServiceBase interface."""
     _api_key = os.environ.get('NYT_KEY')
 
-    def __init__(self, redis_client: redis.Redis):
-        """Initializes the NyTimesService with a Redis client."""
+    def __init__(
+            self,
+            redis_client: redis.Redis,
+            http_client: UpstreamClient,
+            refresher: BackgroundRefresher,
+            circuit_breaker: CircuitBreaker,
+            snapshot_store: NytSnapshotStore,
+    ):
+        """
+        Initializes the NyTimesService.
+
+        :param redis_client: Redis client instance, returning bytes, for caching the bestsellers lists.
+        :param http_client: pooled HTTP client for the NYT API.
+        :param refresher: refreshes stale lists in the background.
+        :param circuit_breaker: retries the failed NYT calls and fails fast while the NYT API is down.
+        :param snapshot_store: dated snapshots of the fetched lists, read when a list is missing from Redis.
+        """
         self.redis_client = redis_client
+        self.http_client = http_client
+        self.refresher = refresher
+        self.circuit_breaker = circuit_breaker
+        self.snapshot_store = snapshot_store
 
     def fetch_books(self, path: str, page: int, limit: int) -> dict:
         """
-        Fetches bestsellers list from a Redis instance or from the NYTimes API.
+        Fetches a page of a bestsellers list from a Redis instance or from the NYTimes API.
 
+        See fetch_books_body.
         :param path: fiction, non-fiction, etc.
-        :param page: the page number.
+        :param page: the page number, from 1.
         :param limit: booklist response maximum size.
-        :return: JSON dictionary containing the bestsellers list.
+        :return: JSON dictionary containing the page of the bestsellers list.
         """
-        try:
+        return json.loads(self.fetch_books_body(path, page, limit)[0])
 
-            bestsellers = self.redis_client.get(f'nyt_bestsellers_{path}')
-            if bestsellers:
-                json_books = self._redis_json(path=path, bestsellers=bestsellers)
-                return {
-                    'success': True,
-                    'books': json_books,
-                    'page': page,
-                    'limit': limit,
-                    'total_results': len(json_books)
-                }
-
-            else:
-                response = requests.get(self._url(path))
-                response.raise_for_status()
-                json_response = response.json()
-                total_results = json_response.get('num_results')
-                json_books = self._bestsellers_json(json_response=json_response, path=path)
-                return {
-                    'success': True,
-                    'books': json_books,
-                    'page': page,
-                    'limit': limit,
-                    'total_results': total_results
-                }
+    def fetch_books_body(self, path: str, page: int, limit: int) -> tuple[bytes, list[str]]:
+        """
+        Fetches the serialized response body of a page of a bestsellers list.
+
+        The bodies of the pages of the common sizes are precomputed when the list is cached, so a hit is returned
+        as stored; pages of other sizes are sliced from the cached list.
+        A stale list is returned right away while it is refreshed in the background.
+        While the NYT API is down a cached list is returned flagged as degraded, without refreshing it.
+        :param path: fiction, non-fiction, etc.
+        :param page: the page number, from 1.
+        :param limit: booklist response maximum size.
+        :return: serialized JSON object containing the page of the bestsellers list, and the ISBN-13s of its books.
+        """
+        try:
+            body, isbn13s = self._get_page_body(path, page, limit)
+            return mark_degraded(body) if self.is_degraded() else body, isbn13s
 
         except JSONDecodeError as e:
             print(e)
@@ -77,37 +117,256 @@ class NyTimesService(NYTimesServiceBase):
             print(e)
             abort(500, description=f"An error occurred while fetching data: {str(e)}")
 
+    def fetch_list_names(self) -> dict[str, str]:
+        """
+        Fetches the catalog of the current bestsellers lists, filled by the overview.
+
+        A stale catalog is returned right away while the overview is refreshed in the background.
+        :return: display names keyed by encoded list name, e.g. 'hardcover-fiction'.
+        """
+        catalog = self.redis_client.get(nyt_catalog_key())
+        if catalog is None:
+            return self._fetch_overview()
+
+        if is_stale(catalog) and not self.is_degraded():
+            self.refresher.refresh(nyt_catalog_key(), self._fetch_overview)
+
+        return decode_list_names(catalog)
+
+    def refresh_bestsellers(self, path: str) -> list[dict]:
+        """
+        Fetches a bestsellers list from the NYTimes API and caches it, e.g. ahead of its next publication.
+
+        :param path: NYT bestsellers list name; e.g. 'non-fiction'.
+        :return: the books as a list of dictionaries.
+        """
+        return self._fetch_bestsellers(path)
+
+    def _get_page_body(self, path: str, page: int, limit: int) -> tuple[bytes, list[str]]:
+        """
+        Returns the response body of a page of a bestsellers list, precomputed, or sliced from the cached list.
+
+        A list missing from Redis is loaded from its latest snapshot, and only fetched from NYT if it has none.
+
+        :param path: NYT bestsellers list name; e.g. 'non-fiction'.
+        :param page: the page number, from 1.
+        :param limit: the page size.
+        :return: serialized JSON object containing the page, and the ISBN-13s of its books.
+        """
+        cached_page = self.redis_client.hget(nyt_pages_key(path), page_field(page, limit))
+        if cached_page is not None:
+            body, isbn13s = decode_body(cached_page)
+            # A page stored without the ISBN-13s of its books is sliced from the list instead, until it is replaced.
+            if isbn13s is not None:
+                self._refresh_if_stale(path, cached_page)
+                return body, isbn13s
+
+        bestsellers = self.redis_client.get(nyt_key(path))
+        if bestsellers:
+            json_books = self._redis_json(path=path, bestsellers=bestsellers)
+            self._refresh_if_stale(path, bestsellers)
+        else:
+            json_books = self._load_snapshot(path)
+            if json_books is None:
+                json_books = self._fetch_bestsellers(path)
+
+        return self._page_body(json_books, page, limit)
+
+    def _refresh_if_stale(self, path: str, entry: bytes):
+        if is_stale(entry) and not self.is_degraded():
+            self.refresher.refresh(nyt_key(path), lambda: self._fetch_bestsellers(path))
+
+    def _load_snapshot(self, path: str) -> list[dict] | None:
+        """
+        Caches the latest snapshot of a list back in Redis, refreshing it in the background if already outdated.
+
+        :param path: NYT bestsellers list name; e.g. 'non-fiction'.
+        :return: the books as a list of dictionaries, None if the list has no snapshot.
+        """
+        snapshot = self.snapshot_store.latest(path)
+        if snapshot is None:
+            return None
+
+        json_books, next_published_date = snapshot
+        fresh_until, expiry_time = self._snapshot_expiry_times(next_published_date)
+        pipeline = self.redis_client.pipeline()
+        self._queue_list(pipeline, path, json_books, fresh_until, expiry_time)
+        pipeline.execute()
+        if fresh_until <= time.time() and not self.is_degraded():
+            self.refresher.refresh(nyt_key(path), lambda: self._fetch_bestsellers(path))
+
+        return json_books
+
+    def _fetch_bestsellers(self, path: str) -> list[dict]:
+        """
+        Fetches a whole bestsellers list from the NYTimes API and caches it, along with its precomputed pages.
+
+        :param path: NYT bestsellers list name; e.g. 'non-fiction'.
+        :return: the books as a list of dictionaries.
+        """
+        response = self.circuit_breaker.call(lambda: self.http_client.get(self._url(path)))
+        response.raise_for_status()
+        return self._bestsellers_json(json_response=response.json(), path=path)
+
+    def _fetch_overview(self) -> dict[str, str]:
+        """
+        Fetches the catalog of the current lists from the NYTimes API overview, and caches it.
+
+        The overview only carries the top books of each list, so its books are not cached; a list is fetched in full
+        on its first request.
+        :return: display names keyed by encoded list name.
+        """
+        response = self.circuit_breaker.call(lambda: self.http_client.get(self._url(NYT_OVERVIEW_PATH)))
+        response.raise_for_status()
+        json_response = response.json()
+        names = self._overview_names(json_response)
+        fresh_until, expiry_time = self._expiry_times(json_response)
+        self.redis_client.set(nyt_catalog_key(), encode_list_names(names, fresh_until), ex=expiry_time)
+        return names
+
+    def is_degraded(self) -> bool:
+        """Tells whether the NYT API is unavailable, so lists are only served from the cache."""
+        return self.circuit_breaker.is_open
+
     def _url(self, path: str):
         return urljoin(NY_TIMES_BOOKS_LIST_URL, f'{path}?api-key={self._api_key}')
 
     def _redis_json(self, path: str, bestsellers: ResponseT) -> list[dict]:
         """
-        Converts the bestsellers JSON string from Redis into a list of dictionaries.
+        Decodes the cached bestsellers entry from Redis into a list of dictionaries.
 
         :param path: NYT bestsellers list name; e.g. 'non-fiction'.
-        :param bestsellers: ResponseT from Redis.
+        :param bestsellers: encoded entry from Redis.
         :return: books as a list of dictionaries or raise.
         """
         try:
-            json_books = json.loads(bestsellers)
-            json_books = [BookResponse.from_json(d).to_dict() for d in json_books]
-            return json_books
+            return decode_book_responses(bestsellers)
         except Exception as e:
-            self.redis_client.delete(f'nyt_bestsellers_{path}')
+            self.redis_client.delete(nyt_key(path))
             raise e
 
     def _bestsellers_json(self, path: str, json_response) -> list[dict]:
         """
-        Converts the bestsellers JSON string from Redis into a list of dictionaries.
+        Converts the bestsellers JSON string from Redis into a list of dictionaries, skipping the books without an ISBN.
 
         :param path: NYT bestsellers list name; e.g. 'non-fiction'.
         :param json_response: ResponseT from Redis.
         :return: books as a list of dictionaries or raise.
         """
         try:
-            json_books = json_response.get('results').get('books')
-            json_books = [BookResponse.from_ny_times_json(d).to_dict() for d in json_books]
-            self.redis_client.set(f'nyt_bestsellers_{path}', json.dumps(json_books), ex=REDIS_EXPIRY_TIME)
+            json_books = []
+            for d in json_response.get('results').get('books'):
+                try:
+                    json_books.append(BookResponse.from_ny_times_json(d).to_dict())
+                except ValueError as e:
+                    print(f'🧨 {e}')
+            fresh_until, expiry_time = self._expiry_times(json_response)
+            pipeline = self.redis_client.pipeline()
+            self._queue_list(pipeline, path, json_books, fresh_until, expiry_time)
+            pipeline.execute()
+            self.snapshot_store.save({path: json_books}, json_response)
             return json_books
         except Exception as e:
             raise e
+
+    @staticmethod
+    def _queue_list(pipeline, path: str, json_books: list[dict], fresh_until: int, expiry_time: int):
+        """
+        Queues the writes of a list and of its precomputed pages, replacing the previous ones.
+
+        :param pipeline: Redis pipeline; queuing does not wait on Redis.
+        :param path: NYT bestsellers list name; e.g. 'non-fiction'.
+        :param json_books: the whole list.
+        :param fresh_until: epoch seconds until which the list is fresh.
+        :param expiry_time: Redis expiry of the list, in seconds.
+        """
+        pipeline.set(nyt_key(path), encode_book_responses(json_books, fresh_until), ex=expiry_time)
+        pipeline.delete(nyt_pages_key(path))
+        pipeline.hset(nyt_pages_key(path), mapping=NyTimesService._encode_pages(json_books, fresh_until))
+        pipeline.expire(nyt_pages_key(path), expiry_time)
+
+    @staticmethod
+    def _overview_names(json_response) -> dict[str, str]:
+        """
+        Reads the catalog of the lists of an overview response.
+
+        :param json_response: NYT overview response.
+        :return: display names keyed by encoded list name.
+        """
+        return {
+            json_list.get('list_name_encoded'): json_list.get('display_name')
+            for json_list in json_response.get('results').get('lists')
+        }
+
+    @staticmethod
+    def _expiry_times(json_response) -> tuple[int, int]:
+        """
+        Returns the soft and hard expiry of a list, fresh until its next publication.
+
+        Lists without an upcoming next_published_date are fresh for REDIS_EXPIRY_TIME.
+        :param json_response: NYT list response.
+        :return: fresh-until epoch seconds and the Redis expiry in seconds, see expiry_times.
+        """
+        next_published_date = json_response.get('results').get('next_published_date')
+        if next_published_date:
+            upcoming = NyTimesService._expiry_times_until(datetime.strptime(next_published_date, '%Y-%m-%d').date())
+            if upcoming:
+                return upcoming
+
+        return expiry_times(REDIS_EXPIRY_TIME)
+
+    @staticmethod
+    def _snapshot_expiry_times(next_published_date: date | None) -> tuple[int, int]:
+        """
+        Returns the soft and hard expiry of a list loaded from a snapshot.
+
+        A snapshot is fresh until its next publication; once outdated, or without a known next publication,
+        it is cached already stale, so it is served while refreshed.
+        :param next_published_date: date of the next publication of the snapshot, if known.
+        :return: fresh-until epoch seconds and the Redis expiry in seconds, see expiry_times.
+        """
+        upcoming = NyTimesService._expiry_times_until(next_published_date) if next_published_date else None
+        return upcoming or (int(time.time()), jittered(CACHE_STALE_MAX_TIME))
+
+    @staticmethod
+    def _expiry_times_until(next_published_date: date) -> tuple[int, int] | None:
+        """Returns the expiry times of a list fresh until its next publication, None if already published."""
+        published = datetime.combine(next_published_date, datetime.min.time(), tzinfo=timezone.utc)
+        fresh_for = int(published.timestamp() - time.time())
+        if fresh_for <= 0:
+            return None
+
+        return int(time.time()) + fresh_for, fresh_for + stale_time(fresh_for)
+
+    @staticmethod
+    def _page_body(json_books: list[dict], page: int, limit: int) -> tuple[bytes, list[str]]:
+        """
+        Returns the serialized response body of a page of the list, total_results counting the whole list.
+
+        :return: the body, and the ISBN-13s of its books.
+        """
+        start, end = page_bounds(page, limit)
+        page_books = json_books[start:end]
+        body = to_json_bytes({
+            'success': True,
+            'books': page_books,
+            'page': page,
+            'limit': limit,
+            'total_results': len(json_books)
+        })
+        return body, [book['isbn13'] for book in page_books if book.get('isbn13')]
+
+    @staticmethod
+    def _encode_pages(json_books: list[dict], fresh_until: int) -> dict[str, bytes]:
+        """
+        Encodes the response body of every page of the list for each of NYT_PRECOMPUTED_PAGE_LIMITS.
+
+        :param json_books: the whole list.
+        :param fresh_until: epoch seconds until which the list is fresh.
+        :return: encoded response bodies keyed by their page_field.
+        """
+        pages = {}
+        for limit in NYT_PRECOMPUTED_PAGE_LIMITS:
+            for page in range(1, max(1, math.ceil(len(json_books) / limit)) + 1):
+                pages[page_field(page, limit)] = encode_body(*NyTimesService._page_body(json_books, page, limit), fresh_until)
+        return pages
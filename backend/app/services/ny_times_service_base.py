@@ -1,6 +1,8 @@
 """This module defines the NYTimesServiceBase class which is an abstract class that defines the contract for NYTimes service classes."""
 from abc import ABC, abstractmethod
 
+from app.utils.json_body import to_json_bytes
+
 
 class NYTimesServiceBase(ABC):
     """Abstract interface defining the contract for NYTimes service classes."""
@@ -16,3 +18,33 @@ class NYTimesServiceBase(ABC):
         :return: JSON dictionary containing the bestsellers list.
         """
         pass
+
+    def fetch_books_body(self, path: str, page: int, limit: int) -> tuple[bytes, list[str]]:
+        """
+        Fetches the serialized response body of a page of NYTimes bestsellers.
+
+        Implementations caching pre-serialized bodies override it; by default fetch_books is serialized.
+        :param path: fiction, non-fiction, etc.
+        :param page: the page number.
+        :param limit: booklist response maximum size.
+        :return: serialized JSON object containing the bestsellers list, and the ISBN-13s of its books.
+        """
+        response = self.fetch_books(path, page, limit)
+        return to_json_bytes(response), [book['isbn13'] for book in response.get('books', []) if book.get('isbn13')]
+
+    @abstractmethod
+    def fetch_list_names(self) -> dict[str, str]:
+        """
+        Abstract method to fetch the catalog of the current NYTimes bestsellers lists.
+
+        :return: display names keyed by encoded list name, e.g. 'hardcover-fiction'.
+        """
+        pass
+
+    def is_degraded(self) -> bool:
+        """
+        Tells whether the NYT API is unavailable, so lists can only be served from the cache.
+
+        :return: False unless the implementation tracks the upstream health.
+        """
+        return False
@@ -0,0 +1,146 @@
+"""
+This module provides NytRefreshScheduler, which refreshes the NYT bestsellers lists before they go stale.
+
+Lists are fresh until their next publication, see NyTimesService._expiry_times. The scheduler checks their
+fresh-until time every `interval` seconds and refreshes the lists due within `refresh_ahead` seconds,
+so readers are served fresh lists without ever waiting on NYT.
+NYT answers an early refresh with the same next publication, so the list stays due: a refreshed list is skipped
+for `retry_after` seconds, unless it goes missing from Redis.
+Any number of schedulers may run, e.g. one per node: they elect a leader through a Redis lock,
+renewed on every check, and only the leader refreshes. Another one takes over once the leadership lapses.
+"""
+import threading
+import time
+
+import redis
+
+from app.services.cache_codec import cache_key, header_size, nyt_key, read_fresh_until
+from app.services.ny_times_service import NyTimesService
+from app.services.single_flight import acquire_lock, release_lock, renew_lock
+
+
+def leader_key() -> str:
+    """Returns the Redis key of the leadership lock of the schedulers."""
+    return cache_key('leader', 'nyt-refresh')
+
+
+def refreshed_key(path: str) -> str:
+    """Returns the Redis key marking a NYT bestsellers list as refreshed by the schedulers lately."""
+    return cache_key('nyt-refreshed', path)
+
+
+class NytRefreshScheduler:
+    """Refreshes the NYT bestsellers lists ahead of their next publication, on the elected scheduler only."""
+
+    def __init__(
+            self,
+            nyt_service: NyTimesService,
+            redis_client: redis.Redis,
+            paths: tuple[str, ...],
+            interval: float,
+            refresh_ahead: float,
+            leader_ttl: float,
+            retry_after: int,
+    ):
+        """
+        Initializes the NytRefreshScheduler, not leading yet.
+
+        :param nyt_service: service fetching and caching the lists.
+        :param redis_client: Redis client, returning bytes, holding the lists and the leadership lock.
+        :param paths: NYT bestsellers list names to keep fresh.
+        :param interval: seconds between two checks.
+        :param refresh_ahead: seconds before going stale a list is refreshed.
+        :param leader_ttl: seconds the leadership lasts without being renewed, longer than interval.
+        :param retry_after: seconds a refreshed list is not refreshed again, though still going stale.
+        """
+        self.nyt_service = nyt_service
+        self.redis_client = redis_client
+        self.paths = paths
+        self.interval = interval
+        self.refresh_ahead = refresh_ahead
+        self.leader_ttl = leader_ttl
+        self.retry_after = retry_after
+        self._token = None
+
+    @property
+    def is_leader(self) -> bool:
+        """Tells whether this scheduler led the last check."""
+        return self._token is not None
+
+    def run_forever(self, stop: threading.Event | None = None):
+        """
+        Checks the lists every interval seconds until stopped, then gives up the leadership.
+
+        :param stop: event ending the loop once set; runs until interrupted by default.
+        """
+        stop = stop or threading.Event()
+        try:
+            while not stop.is_set():
+                self.run_once()
+                stop.wait(self.interval)
+        finally:
+            self.resign()
+
+    def run_once(self) -> list[str]:
+        """
+        Refreshes the lists due, if this scheduler is the leader.
+
+        A list failing to refresh is retried on the next check.
+        :return: the paths of the refreshed lists.
+        """
+        if not self._lead():
+            return []
+
+        refreshed = []
+        for path in self.paths:
+            if not self._is_due(path):
+                continue
+
+            try:
+                self.nyt_service.refresh_bestsellers(path)
+                refreshed.append(path)
+                self.redis_client.set(refreshed_key(path), b'1', ex=self.retry_after)
+            except Exception as e:
+                print(f'🧨 {e}')
+
+        return refreshed
+
+    def resign(self):
+        """Gives up the leadership, so another scheduler takes over right away."""
+        if self._token is not None:
+            release_lock(self.redis_client, leader_key(), self._token)
+            self._token = None
+
+    def _lead(self) -> bool:
+        """Renews the leadership of this scheduler, or tries to take it. Returns True if leading."""
+        try:
+            if self._token is not None and not renew_lock(self.redis_client, leader_key(), self._token, self.leader_ttl):
+                self._token = None
+
+            if self._token is None:
+                self._token = acquire_lock(self.redis_client, leader_key(), ttl=self.leader_ttl)
+
+        except redis.RedisError as e:
+            print(f'🧨 {e}')
+            self._token = None
+
+        return self._token is not None
+
+    def _is_due(self, path: str) -> bool:
+        """
+        Tells whether a list is missing, or goes stale within refresh_ahead seconds and was not refreshed lately.
+
+        Reads only the header of the list.
+        """
+        header = self.redis_client.getrange(nyt_key(path), 0, header_size() - 1)
+        if not header:
+            return True
+
+        try:
+            if read_fresh_until(header) - time.time() > self.refresh_ahead:
+                return False
+        except ValueError:
+            # Entry of a previous schema version.
+            return True
+
+        return not self.redis_client.exists(refreshed_key(path))
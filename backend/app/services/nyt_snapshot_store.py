@@ -0,0 +1,70 @@
+"""
+This module provides NytSnapshotStore, which keeps every fetched NYT bestsellers list as a dated snapshot in Postgres.
+
+Redis only holds the current lists, for a limited time. NyTimesService falls back to the latest snapshot of a list
+before calling NYT, so a restarted or flushed Redis is refilled with one indexed read, and the snapshots keep
+the history of the lists.
+The store runs in the app context of the application it was created with, so it can be used off the request path,
+e.g. by the background refreshes.
+"""
+from datetime import date, datetime, timezone
+
+from flask import Flask
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.models.book_dto import db
+from app.models.nyt_snapshot import NytListSnapshot
+
+
+class NytSnapshotStore:
+    """Saves and loads the dated snapshots of the NYT bestsellers lists."""
+
+    def __init__(self, app: Flask):
+        """
+        Initializes the NytSnapshotStore.
+
+        :param app: application whose database holds the snapshots.
+        """
+        self.app = app
+
+    def save(self, lists: dict[str, list[dict]], json_response: dict):
+        """
+        Saves the lists of a NYT response as snapshots of its publication, replacing the ones already saved.
+
+        The snapshots are a fallback, failing to save them does not fail the caller.
+        :param lists: books keyed by list path, as cached by NyTimesService.
+        :param json_response: NYT list or overview response, carrying the publication dates.
+        """
+        results = json_response.get('results')
+        published_date = _parse_date(results.get('published_date')) or datetime.now(timezone.utc).date()
+        next_published_date = _parse_date(results.get('next_published_date'))
+        with self.app.app_context():
+            try:
+                NytListSnapshot.replace_all([
+                    NytListSnapshot.from_json_books(path, json_books, published_date, next_published_date)
+                    for path, json_books in lists.items()
+                ])
+            except SQLAlchemyError as e:
+                db.session.rollback()
+                print(f'🧨 {e}')
+
+    def latest(self, path: str) -> tuple[list[dict], date | None] | None:
+        """
+        Loads the latest snapshot of a list.
+
+        :param path: NYT bestsellers list name; e.g. 'non-fiction'.
+        :return: the books, in rank order, and the date of the next publication if known; None if never saved
+        or the database is unavailable.
+        """
+        with self.app.app_context():
+            try:
+                snapshot = NytListSnapshot.find_latest(path)
+                return (snapshot.json_books(), snapshot.next_published_date) if snapshot else None
+            except SQLAlchemyError as e:
+                print(f'🧨 {e}')
+                return None
+
+
+def _parse_date(value: str | None) -> date | None:
+    """Parses a NYT 'YYYY-MM-DD' date, None if missing."""
+    return datetime.strptime(value, '%Y-%m-%d').date() if value else None
@@ -0,0 +1,138 @@
+"""
+This module provides RateLimiter, a token bucket kept in Redis and shared by every worker and node calling an upstream.
+
+Each call reserves a token with a single Lua script run on the Redis clock, so workers on different hosts agree.
+When the bucket is empty the token is reserved ahead of time and the caller sleeps until it is due,
+callers thereby queue in the order they asked, for at most `max_wait` seconds.
+The same script counts the calls per endpoint in a daily quota ledger and refuses calls once the daily quota is used.
+"""
+import time
+from datetime import datetime, timezone
+
+import redis
+
+from app.exceptions.invalid_request_error import InvalidRequestError
+from app.services.cache_codec import cache_key
+
+# Returns the milliseconds to wait before using the reserved token, -1 if the daily quota is used,
+# or -2 if the wait would exceed the maximum, in which case no token is reserved.
+_RESERVE_TOKEN_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local quota = tonumber(ARGV[3])
+local max_wait = tonumber(ARGV[4])
+
+if quota > 0 and tonumber(redis.call('hget', KEYS[2], 'total') or '0') >= quota then
+    return -1
+end
+
+local time = redis.call('time')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local bucket = redis.call('hmget', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate / 1000)
+
+local wait = 0
+if tokens < 1 then
+    wait = math.ceil((1 - tokens) * 1000 / rate)
+end
+if wait > max_wait then
+    return -2
+end
+
+redis.call('hset', KEYS[1], 'tokens', tostring(tokens - 1), 'ts', tostring(now))
+redis.call('pexpire', KEYS[1], math.ceil((capacity + 1) * 1000 / rate) + max_wait)
+redis.call('hincrby', KEYS[2], ARGV[5], 1)
+redis.call('hincrby', KEYS[2], 'total', 1)
+redis.call('expire', KEYS[2], ARGV[6])
+return wait
+"""
+
+_QUOTA_USED = -1
+_WAIT_TOO_LONG = -2
+
+
+class RateLimiter:
+    """Distributed token bucket and daily quota ledger of one upstream."""
+
+    def __init__(
+            self,
+            redis_client: redis.Redis,
+            name: str,
+            rate: float,
+            burst: int,
+            daily_quota: int,
+            max_wait: float,
+            ledger_ttl: int,
+    ):
+        """
+        Initializes the RateLimiter.
+
+        :param redis_client: Redis client holding the bucket and the ledger.
+        :param name: upstream name, part of the Redis keys.
+        :param rate: calls per second.
+        :param burst: calls that may be made at once after an idle period.
+        :param daily_quota: calls per UTC day, 0 for no quota.
+        :param max_wait: seconds a caller may queue for a token.
+        :param ledger_ttl: seconds the daily ledgers are kept.
+        """
+        self.redis_client = redis_client
+        self.name = name
+        self.rate = rate
+        self.burst = burst
+        self.daily_quota = daily_quota
+        self.max_wait = max_wait
+        self.ledger_ttl = ledger_ttl
+
+    def acquire(self, endpoint: str):
+        """
+        Waits for a token to call the upstream, counting the call in the daily ledger.
+
+        :param endpoint: upstream endpoint, counted separately in the ledger.
+        :raises InvalidRequestError: 429 if the daily quota is used or the wait would exceed max_wait.
+        """
+        wait = self._check(self.redis_client.eval(_RESERVE_TOKEN_SCRIPT, *self._script_args(endpoint)))
+        if wait > 0:
+            time.sleep(wait)
+
+    def usage(self, day: str | None = None) -> dict[str, int]:
+        """
+        Returns the calls counted in the ledger of a day.
+
+        :param day: UTC day as 'YYYY-MM-DD', today by default.
+        :return: calls per endpoint, along with their 'total'.
+        """
+        ledger = self.redis_client.hgetall(self._ledger_key(day))
+        return {self._to_str(endpoint): int(count) for endpoint, count in ledger.items()}
+
+    def _script_args(self, endpoint: str) -> list:
+        return [
+            2,
+            cache_key('ratelimit', self.name),
+            self._ledger_key(),
+            self.rate,
+            self.burst,
+            self.daily_quota,
+            int(self.max_wait * 1000),
+            endpoint,
+            self.ledger_ttl,
+        ]
+
+    def _check(self, wait_ms: int) -> float:
+        """Returns the seconds to wait for the reserved token, or raises if none was reserved."""
+        if wait_ms == _QUOTA_USED:
+            raise InvalidRequestError(code=429, message=f"Daily quota of upstream '{self.name}' used, try again tomorrow.")
+
+        if wait_ms == _WAIT_TOO_LONG:
+            raise InvalidRequestError(code=429, message=f"Too many requests to upstream '{self.name}', try again later.")
+
+        return wait_ms / 1000
+
+    def _ledger_key(self, day: str | None = None) -> str:
+        day = day or datetime.now(timezone.utc).strftime('%Y-%m-%d')
+        return cache_key('quota', f'{self.name}:{day}')
+
+    @staticmethod
+    def _to_str(value) -> str:
+        return value.decode() if isinstance(value, bytes) else value
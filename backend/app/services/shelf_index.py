@@ -0,0 +1,147 @@
+"""
+This module provides ShelfIndex, a per-user Redis index of the shelf of every book on the user's shelves.
+
+List responses (NYT lists, searches, curated picks) are annotated with the shelf of their books in a single
+HMGET, instead of a book details request per title. The index is a Redis hash of ISBN-13 to shelf string,
+kept in sync by the shelf endpoints and rebuilt from book_shelves when missing.
+A marker field tells a complete index from one holding only the writes made since it expired.
+"""
+import json
+from typing import Callable
+
+import redis
+
+from app.services.cache_codec import cache_key
+from app.utils.json_body import to_json_bytes
+
+# Field marking an index rebuilt from the database, so a user without books still has an index.
+_COMPLETE_FIELD = '_complete'
+
+
+def shelf_index_key(user_id: str) -> str:
+    """Returns the Redis key of the shelf index of a user."""
+    return cache_key('shelves', user_id)
+
+
+class ShelfIndex:
+    """Per-user index of the shelves of the books, annotating book lists in one lookup."""
+
+    def __init__(self, redis_client: redis.Redis, load_shelves: Callable[[str], dict[str, str]], ttl: int):
+        """
+        Initializes the ShelfIndex.
+
+        :param redis_client: Redis client, decoding responses, holding the indexes.
+        :param load_shelves: loads the shelves of a user from the database, as shelf strings keyed by ISBN-13.
+        :param ttl: seconds after which an index is rebuilt from the database, bounding any drift.
+        """
+        self.redis_client = redis_client
+        self.load_shelves = load_shelves
+        self.ttl = ttl
+
+    def shelves(self, user_id: str, isbn13s: list[str]) -> dict[str, str]:
+        """
+        Looks up the shelves of the given books for a user, rebuilding the index if missing.
+
+        :param user_id: user ID obtained from the JWT token.
+        :param isbn13s: ISBN-13s of the books.
+        :return: shelf strings keyed by ISBN-13, for the books on a shelf only.
+        """
+        isbn13s = [isbn13 for isbn13 in isbn13s if isbn13]
+        try:
+            complete, *shelves = self.redis_client.hmget(shelf_index_key(user_id), [_COMPLETE_FIELD, *isbn13s])
+            if complete is None:
+                all_shelves = self._rebuild(user_id)
+                return {isbn13: all_shelves[isbn13] for isbn13 in isbn13s if isbn13 in all_shelves}
+
+            return {isbn13: shelf for isbn13, shelf in zip(isbn13s, shelves) if shelf is not None}
+
+        except redis.RedisError as e:
+            print(f'🧨 {e}')
+            all_shelves = self.load_shelves(user_id)
+            return {isbn13: all_shelves[isbn13] for isbn13 in isbn13s if isbn13 in all_shelves}
+
+    def annotate(self, user_id: str, books: list[dict]) -> bool:
+        """
+        Sets the 'shelf' of the books on one of the user's shelves, in place.
+
+        :param user_id: user ID obtained from the JWT token.
+        :param books: book dictionaries, looked up by their 'isbn13'.
+        :return: True if any book was annotated.
+        """
+        shelves = self.shelves(user_id, [book.get('isbn13') for book in books])
+        _set_shelves(books, shelves)
+        return bool(shelves)
+
+    def annotate_body(self, user_id: str, body: bytes, isbn13s: list[str]) -> bytes:
+        """
+        Sets the 'shelf' of the books of a serialized list response on one of the user's shelves.
+
+        The shelves are looked up by the ISBN-13s stored along with the body, so the body is only decoded
+        and encoded again when one of its books is on a shelf.
+        :param user_id: user ID obtained from the JWT token.
+        :param body: serialized JSON object holding 'books'.
+        :param isbn13s: ISBN-13s of the books of the body.
+        :return: the body as given if none of its books is on a shelf, so pre-serialized bodies are sent as they are;
+        otherwise the annotated body, serialized again.
+        """
+        shelves = self.shelves(user_id, isbn13s)
+        if not shelves:
+            return body
+
+        response = json.loads(body)
+        _set_shelves(response.get('books', []), shelves)
+        return to_json_bytes(response)
+
+    def set_shelf(self, user_id: str, isbn13: str, shelf: str):
+        """
+        Records the shelf of a book, once committed to the database.
+
+        :param user_id: user ID obtained from the JWT token.
+        :param isbn13: ISBN-13 of the book.
+        :param shelf: ShelfEnum string, e.g. 'want-to-read'.
+        """
+        self._write(lambda pipeline: pipeline.hset(shelf_index_key(user_id), isbn13, shelf), user_id)
+
+    def remove(self, user_id: str, isbn13: str):
+        """
+        Removes a book from the index, once removed from the database.
+
+        :param user_id: user ID obtained from the JWT token.
+        :param isbn13: ISBN-13 of the book.
+        """
+        self._write(lambda pipeline: pipeline.hdel(shelf_index_key(user_id), isbn13), user_id)
+
+    def _write(self, queue_write: Callable, user_id: str):
+        """
+        Applies a write to the index, without rebuilding it: a missing index is rebuilt on its next lookup.
+
+        Should Redis fail, the index is dropped, so it is not left out of sync.
+        """
+        try:
+            pipeline = self.redis_client.pipeline()
+            queue_write(pipeline)
+            pipeline.expire(shelf_index_key(user_id), self.ttl)
+            pipeline.execute()
+        except redis.RedisError as e:
+            print(f'🧨 {e}')
+            try:
+                self.redis_client.delete(shelf_index_key(user_id))
+            except redis.RedisError:
+                pass
+
+    def _rebuild(self, user_id: str) -> dict[str, str]:
+        """Rebuilds the index of a user from the database, replacing the writes recorded meanwhile."""
+        all_shelves = self.load_shelves(user_id)
+        pipeline = self.redis_client.pipeline()
+        pipeline.delete(shelf_index_key(user_id))
+        pipeline.hset(shelf_index_key(user_id), mapping={_COMPLETE_FIELD: '1', **all_shelves})
+        pipeline.expire(shelf_index_key(user_id), self.ttl)
+        pipeline.execute()
+        return all_shelves
+
+
+def _set_shelves(books: list[dict], shelves: dict[str, str]):
+    """Sets the 'shelf' of the books found in shelves, keyed by ISBN-13, in place."""
+    for book in books:
+        if book.get('isbn13') in shelves:
+            book['shelf'] = shelves[book.get('isbn13')]
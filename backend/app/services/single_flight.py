@@ -0,0 +1,110 @@
+"""
+This module provides request coalescing for cache misses.
+
+SingleFlight makes concurrent callers of the same key inside a worker wait on one in-flight call.
+The Redis lock helpers let a single worker, across all nodes, fill a cache entry while the others wait for it.
+"""
+import threading
+import uuid
+from concurrent.futures import Future
+
+import redis
+
+_RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+_RENEW_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('pexpire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+
+class SingleFlight:
+    """Runs at most one call per key at a time; concurrent callers share its result."""
+
+    def __init__(self):
+        """Initializes the SingleFlight with no call in flight."""
+        self._calls: dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, fn: callable):
+        """
+        Calls fn, unless a call for the same key is already in flight, then waits for its result.
+
+        :param key: coalescing key, e.g. the ISBN being fetched.
+        :param fn: function without arguments producing the result.
+        :return: the result of fn; shared between callers, so it must not be mutated.
+        :raises: the exception raised by fn, for the caller and every waiter.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self._calls[key] = future
+
+        if not is_leader:
+            return future.result()
+
+        try:
+            result = fn()
+            future.set_result(result)
+            return result
+
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+
+def acquire_lock(redis_client: redis.Redis, key: str, ttl: float) -> str | None:
+    """
+    Tries to acquire a short lived Redis lock without waiting.
+
+    :param redis_client: Redis client.
+    :param key: lock key.
+    :param ttl: seconds after which the lock expires if it is never released.
+    :return: token to release the lock, or None if another worker holds it.
+    """
+    token = uuid.uuid4().hex
+    if redis_client.set(key, token, nx=True, px=int(ttl * 1000)):
+        return token
+
+    return None
+
+
+def release_lock(redis_client: redis.Redis, key: str, token: str):
+    """
+    Releases a lock acquired with acquire_lock, unless it expired and was taken by another worker.
+
+    :param redis_client: Redis client.
+    :param key: lock key.
+    :param token: token returned by acquire_lock.
+    """
+    try:
+        redis_client.eval(_RELEASE_LOCK_SCRIPT, 1, key, token)
+    except redis.RedisError as e:
+        # The lock expires on its own.
+        print(f'🧨 {e}')
+
+
+def renew_lock(redis_client: redis.Redis, key: str, token: str, ttl: float) -> bool:
+    """
+    Extends a lock acquired with acquire_lock, unless it expired and was taken by another worker.
+
+    :param redis_client: Redis client.
+    :param key: lock key.
+    :param token: token returned by acquire_lock.
+    :param ttl: seconds after which the lock expires, from now.
+    :return: True if the lock is still held.
+    """
+    return bool(redis_client.eval(_RENEW_LOCK_SCRIPT, 1, key, token, int(ttl * 1000)))
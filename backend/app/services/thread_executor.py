@@ -0,0 +1,25 @@
+"""
+This module provides run_in_thread, running the blocking calls of the async services in the threads of the worker.
+
+Flask runs every async view in an event loop of its own, whose default executor is shut down, waiting for its threads,
+once the view returns. The async services run the blocking calls of the sync services on a ThreadPoolExecutor shared
+by every request of the worker instead, so a call still running when a view gives up on it finishes in the background.
+"""
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import Executor
+
+
+async def run_in_thread(executor: Executor, fn: callable, *args, **kwargs):
+    """
+    Counterpart of asyncio.to_thread running fn on the given executor, with the context of the caller.
+
+    :param executor: threads of the worker.
+    :param fn: blocking callable.
+    :param args: positional arguments of fn.
+    :param kwargs: keyword arguments of fn.
+    :return: the result of fn.
+    """
+    context = contextvars.copy_context()
+    return await asyncio.get_running_loop().run_in_executor(executor, functools.partial(context.run, fn, *args, **kwargs))
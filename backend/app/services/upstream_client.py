@@ -0,0 +1,107 @@
+"""
+This module provides the pooled HTTP clients used to call the upstream APIs (ISBNdb, NYT and Auth0).
+
+Each upstream gets one requests.Session per process, backed by a urllib3 connection pool,
+so connections are kept alive between calls instead of paying a new TCP+TLS handshake every time.
+Timeouts and pool sizes are configured per upstream in `app.config.UPSTREAMS`.
+"""
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.config import UPSTREAMS
+
+
+class UpstreamClient:
+    """Pooled, keep-alive HTTP client for a single upstream."""
+
+    def __init__(self, name: str, connect_timeout: float, read_timeout: float, pool_connections: int, pool_maxsize: int):
+        """
+        Initializes the UpstreamClient with its own session and connection pool.
+
+        :param name: upstream name, used in the pool statistics.
+        :param connect_timeout: seconds to wait for the connection to be established.
+        :param read_timeout: seconds to wait for the upstream to send a response.
+        :param pool_connections: number of host pools to cache.
+        :param pool_maxsize: maximum number of connections kept alive per host.
+        """
+        self.name = name
+        self.timeout = (connect_timeout, read_timeout)
+        self._adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.session = requests.Session()
+        self.session.mount('https://', self._adapter)
+        self.session.mount('http://', self._adapter)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """Sends a GET request through the pooled session, applying the upstream timeouts."""
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        """Sends a POST request through the pooled session, applying the upstream timeouts."""
+        return self.request('POST', url, **kwargs)
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Sends a request through the pooled session.
+
+        :param method: HTTP method.
+        :param url: absolute URL.
+        :param kwargs: any keyword argument accepted by requests.Session.request.
+        :return: requests.Response
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        return self.session.request(method, url, **kwargs)
+
+    def pool_stats(self) -> dict:
+        """
+        Returns the connection pool statistics of this upstream.
+
+        :return: timeouts and, per host, the pool size, idle connections, opened connections and requests served.
+        """
+        pools = self._adapter.poolmanager.pools
+        hosts = {}
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            queue = pool.pool
+            hosts[f'{pool.scheme}://{pool.host}:{pool.port}'] = {
+                'maxsize': queue.maxsize if queue is not None else 0,
+                'idle': sum(1 for conn in list(queue.queue) if conn is not None) if queue is not None else 0,
+                'connections_opened': pool.num_connections,
+                'requests': pool.num_requests,
+            }
+
+        return {
+            'connect_timeout': self.timeout[0],
+            'read_timeout': self.timeout[1],
+            'hosts': hosts,
+        }
+
+
+_clients: dict[str, UpstreamClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_upstream_client(name: str) -> UpstreamClient:
+    """
+    Returns the process wide client of the given upstream, creating it on first use.
+
+    Clients are created lazily so each gunicorn worker opens its own pool after forking.
+    :param name: one of the keys of `app.config.UPSTREAMS`.
+    :return: UpstreamClient
+    """
+    client = _clients.get(name)
+    if client is not None:
+        return client
+
+    with _clients_lock:
+        if name not in _clients:
+            _clients[name] = UpstreamClient(name=name, **UPSTREAMS[name])
+        return _clients[name]
+
+
+def upstream_pool_stats() -> dict:
+    """Returns the pool statistics of every upstream client created so far."""
+    return {name: client.pool_stats() for name, client in list(_clients.items())}
@@ -3,7 +3,7 @@ This module declares the shelf Blueprint and the respective routes for the appli
 
 It provides endpoints to CRUD operations on books in a user's shelf, with authentication and CORS support.
 """
-from flask import Blueprint, request
+from flask import Blueprint, current_app, request
 from flask_cors import cross_origin
 
 from app.auth.auth import requires_auth
@@ -30,7 +30,7 @@ def add_book(payload):
 def fetch_book(payload, book_id: str):
     """Fetches a book from the user's shelf."""
     user_id = payload.get('sub')
-    return get_book(user_id=user_id, book_id=book_id)
+    return current_app.ensure_sync(get_book)(user_id=user_id, book_id=book_id)
 
 
 @shelf_bp.route('/book/<string:book_id>', methods=['DELETE'])
@@ -18,14 +18,18 @@ from app.exceptions.invalid_request_error import InvalidRequestError
 from app.models.book_dto import BookResponse, BookDto, db
 from app.models.book_shelf import BookShelf
 from app.models.shelf import ShelfEnum
-from app.services.book_service_base import BookServiceBase
+from app.services.async_book_service_base import AsyncBookServiceBase
+from app.services.circuit_breaker import CircuitOpenError
+from app.services.shelf_index import ShelfIndex
+from app.utils.isbn_utils import to_isbn13
+from app.utils.json_body import json_body_response
 
 api_key = os.environ.get('ISBNDB_KEY')
 user_agent = os.environ.get('USER_AGENT')
 
 
-@inject.params(user_service=UserService)
-def store_book(payload, request: Request, user_service: UserService):
+@inject.params(user_service=UserService, shelf_index=ShelfIndex)
+def store_book(payload, request: Request, user_service: UserService, shelf_index: ShelfIndex):
     """
     Stores a book in the user's shelf.
 
@@ -33,6 +37,8 @@ def store_book(payload, request: Request, user_service: UserService):
     :param request:
     :param user_service: UserService instance provided by the dependency injector
     :type user_service: UserService
+    :param shelf_index: ShelfIndex of the user's shelves, kept in sync
+    :type shelf_index: ShelfIndex
     :return: Book if the request is successful, or aborts with an error response.
     :rtype: flask.Response
     """
@@ -46,7 +52,7 @@ def store_book(payload, request: Request, user_service: UserService):
             if user is None:
                 raise InvalidRequestError(401, "User not found or not authenticated.")
 
-            # Deserialize the incoming book request
+            # Deserialize the incoming book request, its ISBN-13 filled in from the ISBN-10 if missing
             book_request = BookResponse.from_json(d=request.get_json())
 
             # Check if the book is already linked to the user's shelf
@@ -78,6 +84,7 @@ def store_book(payload, request: Request, user_service: UserService):
                 shelf=ShelfEnum.from_str(book_request.shelf),
                 user_id=user_id
             ).insert()
+            shelf_index.set_shelf(user_id, book.isbn13, book_request.shelf)
 
             return jsonify({
                 "success": True,
@@ -97,32 +104,42 @@ def store_book(payload, request: Request, user_service: UserService):
         abort(404, "Content type is not supported.")
 
 
-@inject.params(book_service=BookServiceBase)
-def get_book(user_id: str, book_id: str, book_service: BookServiceBase):
+@inject.params(book_service=AsyncBookServiceBase)
+async def get_book(user_id: str, book_id: str, book_service: AsyncBookServiceBase):
     """
-    Fetches a book from the BookServiceBase using the provided user ID and book ID (ISBN13).
+    Fetches a book from the AsyncBookServiceBase using the provided user ID and book ID (ISBN13).
+
+    While ISBNdb is unavailable, a book not cached yet is answered from the database, flagged as degraded.
 
     :param user_id: User ID obtained from the JWT token
     :type user_id: str
 
-    :param book_id: ISBN13
+    :param book_id: ISBN13, or ISBN10 converted to its ISBN13
     :type book_id: str
 
-    :param book_service: BookServiceBase instance provided by the dependency injector
-    :type book_service: BookServiceBase
+    :param book_service: AsyncBookServiceBase instance provided by the dependency injector
+    :type book_service: AsyncBookServiceBase
 
     :return: Book if the request is successful, or aborts with an error response.
     :rtype: flask.Response
     """
     try:
-        book_shelf: BookShelf = BookShelf.get_or_none(book_id, user_id)
+        isbn13 = to_isbn13(book_id)
+        if isbn13 is None:
+            raise InvalidRequestError(code=400, message=f"Incorrect book ID format:'{book_id}'. ISBN10 or ISBN13 expected.")
+
+        book_shelf: BookShelf = BookShelf.get_or_none(isbn13, user_id)
 
-        book_dict = book_service.fetch_book(book_shelf, isbn13=book_id, isbn10=book_id)
+        try:
+            return json_body_response(await book_service.fetch_book_body(book_shelf, isbn13=isbn13))
+        except CircuitOpenError as e:
+            book_dict = _get_stored_book_or_raise(book_shelf, isbn13, error=e)
 
         return jsonify(
             {
                 "success": True,
                 "book": book_dict,
+                "degraded": True,
             }
         )
 
@@ -133,23 +150,43 @@ def get_book(user_id: str, book_id: str, book_service: BookServiceBase):
         abort(500, description=f"An error occurred while fetching data: {str(e)}")
 
 
-def remove_book(user_id: str, book_id: str):
+def _get_stored_book_or_raise(book_shelf: BookShelf | None, isbn13: str, error: CircuitOpenError) -> dict:
+    """
+    Returns a book stored in the database, for when ISBNdb is unavailable.
+
+    :param book_shelf: shelf of the book for the user, if on one.
+    :param isbn13: ISBN-13 of the book.
+    :param error: error raised by the book service, raised again if the book is not stored either.
+    :return: book as a dictionary.
+    """
+    book = BookDto.query.filter_by(isbn13=isbn13).first()
+    if book is None:
+        raise error
+
+    return BookResponse.from_dto(book, shelf=AsyncBookServiceBase.get_shelf_or_none(book_shelf)).to_dict()
+
+
+@inject.params(shelf_index=ShelfIndex)
+def remove_book(user_id: str, book_id: str, shelf_index: ShelfIndex):
     """
     Removes a book from the user's shelf.
 
     :param user_id:
     :param book_id:
+    :param shelf_index: ShelfIndex of the user's shelves, kept in sync
     :return: success json response, or aborts with an error response.
     :rtype: flask.Response
     """
     try:
-        book_shelf = BookShelf.get_or_none(book_id=book_id, user_id=user_id)
+        book_shelf = BookShelf.get_or_none(book_id=to_isbn13(book_id) or book_id, user_id=user_id)
 
         if book_shelf is None:
             abort(404)
 
+        isbn13 = book_shelf.isbn13
         db.session.delete(book_shelf)
         db.session.commit()
+        shelf_index.remove(user_id, isbn13)
 
     except Exception as e:
         db.session.rollback()
@@ -162,7 +199,8 @@ def remove_book(user_id: str, book_id: str):
     })
 
 
-def update_book_shelf(user_id: str, book_id: str, request: Request):
+@inject.params(shelf_index=ShelfIndex)
+def update_book_shelf(user_id: str, book_id: str, request: Request, shelf_index: ShelfIndex):
     """
     Updates the shelf for a given book and user.
 
@@ -172,6 +210,8 @@ def update_book_shelf(user_id: str, book_id: str, request: Request):
     :type book_id: str
     :param request: Request object which contains the JSON payload "shelf"
     :type request: Request
+    :param shelf_index: ShelfIndex of the user's shelves, kept in sync
+    :type shelf_index: ShelfIndex
 
     :return: response object
     :rtype: flask.Response
@@ -180,7 +220,7 @@ def update_book_shelf(user_id: str, book_id: str, request: Request):
         if not request.is_json:
             abort(400, description="Invalid content type. Expected JSON.")
 
-        book_shelf = BookShelf.get_or_none(book_id, user_id)
+        book_shelf = BookShelf.get_or_none(to_isbn13(book_id) or book_id, user_id)
 
         if not book_shelf:
             raise InvalidRequestError(
@@ -191,6 +231,7 @@ def update_book_shelf(user_id: str, book_id: str, request: Request):
         shelf = ShelfEnum.from_str(request.get_json().get('shelf'))
         book_shelf.shelf = shelf
         db.session.commit()  # no need to db.session.add(book_shelf), SQLAlchemy tracks it
+        shelf_index.set_shelf(user_id, book_shelf.isbn13, ShelfEnum.to_str(shelf))
 
         return jsonify({"success": True})
 
@@ -48,3 +48,31 @@ def is_valid_isbn(isbn10: str, isbn13: str) -> bool:
     :return: True if either is valid, False otherwise.
     """
     return is_valid_isbn10(isbn10) or is_valid_isbn13(isbn13)
+
+
+def isbn10_to_isbn13(isbn10: str) -> str:
+    """
+    Convert a valid ISBN-10 to its ISBN-13, the 978 prefixed EAN with a recomputed check digit.
+
+    :param isbn10: valid ISBN-10 string
+    :return: ISBN-13 string
+    """
+    body = f'978{isbn10[:9]}'
+    total = sum((1 if i % 2 == 0 else 3) * int(char) for i, char in enumerate(body))
+    return f'{body}{(10 - total % 10) % 10}'
+
+
+def to_isbn13(isbn: str) -> str | None:
+    """
+    Return the canonical ISBN-13 of an ISBN given in either format.
+
+    :param isbn: ISBN-10 or ISBN-13 string
+    :return: ISBN-13 string, or None if the ISBN is not valid.
+    """
+    if is_valid_isbn13(isbn):
+        return isbn
+
+    if is_valid_isbn10(isbn):
+        return isbn10_to_isbn13(isbn)
+
+    return None
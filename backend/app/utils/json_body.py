@@ -0,0 +1,51 @@
+"""
+This module provides helpers to build and send pre-serialized JSON response bodies.
+
+Hot read endpoints cache their response bodies as bytes, so a cache hit is sent as it is,
+without decoding, rebuilding and encoding the response again. The bytes match what jsonify would produce.
+"""
+import json
+
+from flask import Response, current_app
+
+
+def to_json_bytes(obj) -> bytes:
+    """
+    Serializes an object the way jsonify does, compact and with sorted keys.
+
+    :param obj: JSON serializable object.
+    :return: UTF-8 JSON bytes.
+    """
+    return json.dumps(obj, separators=(',', ':'), sort_keys=True).encode('utf-8')
+
+
+def book_body(book_json: bytes, shelf: str | None) -> bytes:
+    """
+    Builds the body of a book details response from the cached, shelf-independent book JSON.
+
+    :param book_json: serialized book details object, without the shelf.
+    :param shelf: shelf of the book for the user, or None.
+    :return: serialized {"book": {..., "shelf": shelf}, "success": true}.
+    """
+    return b''.join((b'{"book":', book_json[:-1], b',"shelf":', to_json_bytes(shelf), b'},"success":true}'))
+
+
+def mark_degraded(body: bytes) -> bytes:
+    """
+    Adds "degraded": true to a serialized response object.
+
+    :param body: serialized JSON object, not empty.
+    :return: serialized object with the flag.
+    """
+    return b'{"degraded":true,' + body[1:]
+
+
+def json_body_response(body: bytes, status: int = 200) -> Response:
+    """
+    Sends a pre-serialized JSON body.
+
+    :param body: serialized JSON.
+    :param status: HTTP status code.
+    :return: response with the JSON mimetype, as jsonify would return.
+    """
+    return current_app.response_class(body, status=status, mimetype=current_app.json.mimetype)
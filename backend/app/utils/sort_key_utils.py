@@ -0,0 +1,89 @@
+"""
+Utility functions for fractional sort keys, ordering the items of a list so that moving one item rewrites one key.
+
+A key is a base-36 fraction written without its leading '0.' nor trailing zeros, e.g. 'i' is 0.5.
+Compared as plain byte strings, keys sort in the order of their fractions.
+"""
+_DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+
+
+def key_between(low: str | None, high: str | None) -> str:
+    """
+    Returns a key sorting strictly between two keys.
+
+    :param low: key of the item before, None to place first.
+    :param high: key of the item after, None to place last.
+    :return: the shortest key found between low and high, at most one digit longer than the longer of the two.
+    """
+    low = low or ''
+    if high is not None and high <= low:
+        raise ValueError(f"Sort key '{high}' is not after '{low}'.")
+
+    key = ''
+    for i in range(len(low) + 1 if high is None else max(len(low), len(high)) + 1):
+        low_digit = _DIGITS.index(low[i]) if i < len(low) else 0
+        if high is None:
+            high_digit = len(_DIGITS)
+        else:
+            high_digit = _DIGITS.index(high[i]) if i < len(high) else 0
+        if high_digit - low_digit > 1:
+            return key + _DIGITS[(low_digit + high_digit) // 2]
+
+        key += _DIGITS[low_digit]
+        if high_digit > low_digit:
+            # The key is now below high whatever its next digits, only low bounds them.
+            high = None
+
+    raise ValueError(f"No sort key between '{low}' and '{high}'.")
+
+
+def keys_between(low: str | None, high: str | None, count: int) -> list[str]:
+    """
+    Returns ascending keys sorting strictly between two keys, e.g. for items inserted next to each other.
+
+    The keys halve the interval recursively, so they grow by a digit every 5 or so halvings rather than for every key.
+    :param low: key of the item before, None to place first.
+    :param high: key of the item after, None to place last.
+    :param count: number of keys.
+    :return: count ascending keys.
+    """
+    if count <= 0:
+        return []
+
+    before = count // 2
+    key = key_between(low, high)
+    return keys_between(low, key, before) + [key] + keys_between(key, high, count - before - 1)
+
+
+def is_sort_key(value: str) -> bool:
+    """
+    Validate if the given string is a sort key.
+
+    :param value: string, e.g. read from a cursor.
+    :return: True if a non-empty base-36 fraction without trailing zeros, False otherwise.
+    """
+    return bool(value) and all(char in _DIGITS for char in value) and not value.endswith('0')
+
+
+def spread_keys(count: int) -> list[str]:
+    """
+    Returns evenly spaced keys, as short as possible, for a list of items; used to rebalance a list.
+
+    :param count: number of items.
+    :return: count ascending keys.
+    """
+    width = 1
+    while len(_DIGITS) ** width <= count:
+        width += 1
+
+    step = len(_DIGITS) ** width // (count + 1)
+    return [_to_digits(step * i, width).rstrip('0') for i in range(1, count + 1)]
+
+
+def _to_digits(value: int, width: int) -> str:
+    """Writes value in base 36, left padded with zeros to width digits."""
+    digits = ''
+    for _ in range(width):
+        value, digit = divmod(value, len(_DIGITS))
+        digits = _DIGITS[digit] + digits
+    return digits
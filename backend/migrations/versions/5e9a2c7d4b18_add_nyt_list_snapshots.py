@@ -0,0 +1,47 @@
+"""Add nyt_list_snapshots and nyt_snapshot_books
+
+Revision ID: 5e9a2c7d4b18
+Revises: 3c5d8e1f2a47
+Create Date: 2026-10-18 09:41:07.362915
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '5e9a2c7d4b18'
+down_revision = '3c5d8e1f2a47'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('nyt_list_snapshots',
+                    sa.Column('id', sa.Integer(), nullable=False),
+                    sa.Column('path', sa.String(length=255), nullable=False),
+                    sa.Column('published_date', sa.Date(), nullable=False),
+                    sa.Column('next_published_date', sa.Date(), nullable=True),
+                    sa.PrimaryKeyConstraint('id'),
+                    sa.UniqueConstraint('path', 'published_date', name='uq_nyt_list_snapshot_date')
+                    )
+    op.create_index('ix_nyt_list_snapshots_path_published_date', 'nyt_list_snapshots',
+                    ['path', sa.text('published_date DESC')])
+    op.create_table('nyt_snapshot_books',
+                    sa.Column('id', sa.Integer(), nullable=False),
+                    sa.Column('snapshot_id', sa.Integer(), nullable=False),
+                    sa.Column('rank', sa.Integer(), nullable=False),
+                    sa.Column('isbn13', sa.String(length=13), nullable=True),
+                    sa.Column('isbn10', sa.String(length=10), nullable=True),
+                    sa.Column('title', sa.String(), nullable=False),
+                    sa.Column('authors', sa.ARRAY(sa.String()), nullable=True),
+                    sa.Column('image', sa.String(), nullable=False),
+                    sa.ForeignKeyConstraint(['snapshot_id'], ['nyt_list_snapshots.id'], ondelete='CASCADE'),
+                    sa.PrimaryKeyConstraint('id'),
+                    sa.UniqueConstraint('snapshot_id', 'rank', name='uq_nyt_snapshot_rank')
+                    )
+
+
+def downgrade():
+    op.drop_table('nyt_snapshot_books')
+    op.drop_index('ix_nyt_list_snapshots_path_published_date', table_name='nyt_list_snapshots')
+    op.drop_table('nyt_list_snapshots')
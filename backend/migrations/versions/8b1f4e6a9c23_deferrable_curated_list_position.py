@@ -0,0 +1,26 @@
+"""Make uq_curated_list_position deferrable
+
+Revision ID: 8b1f4e6a9c23
+Revises: 5e9a2c7d4b18
+Create Date: 2026-10-18 10:26:53.904117
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '8b1f4e6a9c23'
+down_revision = '5e9a2c7d4b18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Checked at the end of each statement, so a single UPDATE can shift the positions of a list.
+    op.drop_constraint('uq_curated_list_position', 'curated_picks', type_='unique')
+    op.create_unique_constraint('uq_curated_list_position', 'curated_picks', ['list_id', 'position'],
+                                deferrable=True, initially='IMMEDIATE')
+
+
+def downgrade():
+    op.drop_constraint('uq_curated_list_position', 'curated_picks', type_='unique')
+    op.create_unique_constraint('uq_curated_list_position', 'curated_picks', ['list_id', 'position'])
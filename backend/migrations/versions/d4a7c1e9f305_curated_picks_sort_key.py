@@ -0,0 +1,74 @@
+"""Order curated_picks by a fractional sort_key instead of a stored position
+
+Revision ID: d4a7c1e9f305
+Revises: 8b1f4e6a9c23
+Create Date: 2026-10-18 11:02:17.336590
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'd4a7c1e9f305'
+down_revision = '8b1f4e6a9c23'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('curated_picks', sa.Column('sort_key', sa.String(length=32, collation='C'), nullable=True))
+
+    connection = op.get_bind()
+    picks = connection.execute(
+        sa.text('SELECT id, list_id FROM curated_picks ORDER BY list_id, position')
+    ).fetchall()
+
+    pick_ids_by_list = {}
+    for pick_id, list_id in picks:
+        pick_ids_by_list.setdefault(list_id, []).append(pick_id)
+
+    for pick_ids in pick_ids_by_list.values():
+        for pick_id, sort_key in zip(pick_ids, _spread_keys(len(pick_ids))):
+            connection.execute(
+                sa.text('UPDATE curated_picks SET sort_key = :sort_key WHERE id = :id'),
+                {'sort_key': sort_key, 'id': pick_id}
+            )
+
+    op.alter_column('curated_picks', 'sort_key', nullable=False)
+    op.drop_constraint('uq_curated_list_position', 'curated_picks', type_='unique')
+    op.drop_column('curated_picks', 'position')
+    op.create_unique_constraint('uq_curated_list_sort_key', 'curated_picks', ['list_id', 'sort_key'],
+                                deferrable=True, initially='IMMEDIATE')
+
+
+def _spread_keys(count: int) -> list[str]:
+    """Returns count evenly spaced base-36 sort keys; inlined so the migration does not follow the app code."""
+    digits = '0123456789abcdefghijklmnopqrstuvwxyz'
+    width = 1
+    while len(digits) ** width <= count:
+        width += 1
+
+    step = len(digits) ** width // (count + 1)
+    sort_keys = []
+    for i in range(1, count + 1):
+        value, sort_key = step * i, ''
+        for _ in range(width):
+            value, digit = divmod(value, len(digits))
+            sort_key = digits[digit] + sort_key
+        sort_keys.append(sort_key.rstrip('0'))
+    return sort_keys
+
+
+def downgrade():
+    op.add_column('curated_picks', sa.Column('position', sa.Integer(), nullable=True))
+    op.execute(
+        'UPDATE curated_picks SET position = numbered.position '
+        'FROM (SELECT id, row_number() OVER (PARTITION BY list_id ORDER BY sort_key) AS position '
+        'FROM curated_picks) AS numbered '
+        'WHERE curated_picks.id = numbered.id'
+    )
+    op.alter_column('curated_picks', 'position', nullable=False)
+    op.drop_constraint('uq_curated_list_sort_key', 'curated_picks', type_='unique')
+    op.drop_column('curated_picks', 'sort_key')
+    op.create_unique_constraint('uq_curated_list_position', 'curated_picks', ['list_id', 'position'],
+                                deferrable=True, initially='IMMEDIATE')
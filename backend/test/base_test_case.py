@@ -5,16 +5,24 @@ import os
 import sys
 import unittest
 
+import fakeredis
 import inject
 
 from app import create_app
 from app.auth.auth_interface import AuthInterface
 from app.auth.user_service import UserService
 from app.models.book_dto import db
+from app.models.book_shelf import BookShelf
+from app.services.async_book_service_base import AsyncBookServiceBase
+from app.services.async_ny_times_service_base import AsyncNYTimesServiceBase
 from app.services.book_service_base import BookServiceBase
+from app.services.curated_list_cache import CuratedListCache
 from app.services.ny_times_service_base import NYTimesServiceBase
+from app.services.shelf_index import ShelfIndex
 from test.auth.mock_auth import MockAuth
 from test.auth.mock_user_service import MockUserService
+from test.services.mock_async_book_service import MockAsyncBookService
+from test.services.mock_async_ny_times_service import MockAsyncNyTimesService
 from test.services.mock_book_service import MockBookService
 from test.services.mock_ny_times_service import MockNyTimesService
 
@@ -35,12 +43,22 @@ class BaseTestCase(unittest.TestCase):
     def setUp(self):
         self.mock_book_service = MockBookService()
         self.mock_nyt_service = MockNyTimesService()
+        self.shelf_index = ShelfIndex(
+            redis_client=fakeredis.FakeRedis(decode_responses=True),
+            load_shelves=BookShelf.find_shelves_by_user,
+            ttl=60,
+        )
+        self.curated_list_cache = CuratedListCache(redis_client=fakeredis.FakeRedis(), ttl=60)
 
         inject.configure(lambda binder: binder
                          .bind(AuthInterface, MockAuth())
                          .bind(UserService, MockUserService())
                          .bind_to_provider(BookServiceBase, lambda: self.mock_book_service)
-                         .bind_to_provider(NYTimesServiceBase, lambda: self.mock_nyt_service),
+                         .bind_to_provider(NYTimesServiceBase, lambda: self.mock_nyt_service)
+                         .bind_to_provider(AsyncBookServiceBase, lambda: MockAsyncBookService(self.mock_book_service))
+                         .bind_to_provider(AsyncNYTimesServiceBase, lambda: MockAsyncNyTimesService(self.mock_nyt_service))
+                         .bind_to_provider(ShelfIndex, lambda: self.shelf_index)
+                         .bind_to_provider(CuratedListCache, lambda: self.curated_list_cache),
                          allow_override=True,
                          clear=True)
 
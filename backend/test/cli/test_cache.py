@@ -0,0 +1,47 @@
+"""Module for testing that `flask cache warm` reports a failed ISBNdb request as resumable."""
+import unittest
+from unittest import mock
+
+import click
+import fakeredis
+import requests
+
+from app.cli.cache import warm_cache
+from app.services.cache_warmer import warm_checkpoint_key
+from test.services.recording_book_service import RecordingBookService
+
+
+class WarmCacheTestCase(unittest.TestCase):
+    """Tests for warm_cache."""
+
+    isbn13s = {'9780000000002', '9780000000019', '9780000000026', '9780000000033', '9780000000040'}
+
+    def setUp(self):
+        self.redis_client = fakeredis.FakeRedis()
+        for patcher in (
+            mock.patch('app.cli.cache.redis_cache_client', self.redis_client),
+            mock.patch('app.cli.cache._collect_isbn13s', return_value=self.isbn13s),
+            mock.patch('app.cli.cache.ISBNDB_BULK_CHUNK_SIZE', 2),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_failed_isbndb_request_asks_to_resume(self):
+        book_service = RecordingBookService(fail_at=1, error=requests.HTTPError('403 Client Error: Forbidden'))
+
+        with self.assertRaises(click.ClickException) as context:
+            warm_cache(restart=False, book_service=book_service)
+
+        self.assertEqual('403 Client Error: Forbidden Run the command again to resume.', context.exception.message)
+        self.assertEqual(sorted(self.isbn13s)[1].encode(), self.redis_client.get(warm_checkpoint_key()))
+
+    def test_warms_every_book(self):
+        book_service = RecordingBookService()
+
+        warm_cache(restart=False, book_service=book_service)
+
+        self.assertEqual(sorted(self.isbn13s), [isbn for batch in book_service.batches for isbn in batch])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -123,7 +123,8 @@ class CuratedPicksTestCase(BaseTestCase):
         position = curated_pick_data.get('position')
         isbn13 = curated_pick_data.get('isbn13')
         self.assertEqual(1, list_id)
-        self.assertEqual(3, position)
+        # Inserted last, as the list is empty
+        self.assertEqual(1, position)
         self.assertEqual("9780061120084", isbn13)
 
     def test_post_curated_pick_returns_201_isbn10(self):
@@ -148,7 +149,8 @@ class CuratedPicksTestCase(BaseTestCase):
         position = curated_pick_data.get('position')
         isbn10 = curated_pick_data.get('isbn10')
         self.assertEqual(1, list_id)
-        self.assertEqual(2, position)
+        # Inserted last, as the list is empty
+        self.assertEqual(1, position)
         self.assertEqual("123456789X", isbn10)
 
     def test_post_curated_pick_returns_422_bad_request_missing_isbn(self):
@@ -212,7 +214,7 @@ class CuratedPicksTestCase(BaseTestCase):
             headers=self._get_headers(["booklist:curator"])
         )
 
-        expected_message = "Curated pick 'CuratedPick(list_id=1, isbn13=9780061120084, isbn10=None, position=3)' already exists, Try PUT to update."
+        expected_message = "Curated pick 'CuratedPick(list_id=1, isbn13=9780061120084, isbn10=None, position=2)' already exists, Try PUT to update."
         self.assert_error(res, expect_status_code=409, expect_message=expected_message)
 
     def test_fetch_curated_picks_returns_code_200(self):
@@ -228,7 +230,92 @@ class CuratedPicksTestCase(BaseTestCase):
         self.assertEqual(200, res.status_code)
         picks_data = res.get_json().get('books')
         books = [BookResponse.from_json(d=book) for book in picks_data]
-        self.assertListEqual(self._mock_books(), books)
+        # In position order
+        self.assertListEqual(list(reversed(self._mock_books())), books)
+
+    def test_fetch_curated_picks_page_follows_the_cursor(self):
+        def add_picked_entries():
+            """Add some CuratedList's to the database."""
+            self._setup_curated_lists()
+            self._setup_curated_picks()
+
+        self.mock_book_service.mock_books(self._mock_books())
+
+        self.with_context(add_picked_entries)
+        first = self.client.get('/curated-picks?list_id=1&limit=1', headers=self._get_headers(["booklist:get"]))
+        cursor = first.get_json().get('next_cursor')
+        second = self.client.get(f'/curated-picks?list_id=1&limit=1&cursor={cursor}',
+                                 headers=self._get_headers(["booklist:get"]))
+
+        self.assertEqual(200, first.status_code)
+        self.assertEqual([1], [book.get('position') for book in first.get_json().get('books')])
+        self.assertEqual(2, first.get_json().get('total_results'))
+        self.assertEqual([("9780061120084", 2)],
+                         [(book.get('isbn13'), book.get('position')) for book in second.get_json().get('books')])
+        self.assertEqual(2, second.get_json().get('page'))
+        self.assertIsNone(second.get_json().get('next_cursor'))
+
+    def test_fetch_curated_picks_page_numbers_the_picks_after_the_cursor_from_the_list(self):
+        def add_picked_entries():
+            """Add some CuratedList's to the database."""
+            self._setup_curated_lists()
+            self._setup_curated_picks()
+
+        self.mock_book_service.mock_books(self._mock_books())
+
+        self.with_context(add_picked_entries)
+        first = self.client.get('/curated-picks?list_id=1&limit=1', headers=self._get_headers(["booklist:get"]))
+        self.with_context(lambda: CuratedPick(list_id=1, isbn13="9780306406157", position=1, isbn10=None).insert())
+        second = self.client.get(f'/curated-picks?list_id=1&limit=1&cursor={first.get_json().get("next_cursor")}',
+                                 headers=self._get_headers(["booklist:get"]))
+
+        self.assertEqual([("9780061120084", 3)],
+                         [(book.get('isbn13'), book.get('position')) for book in second.get_json().get('books')])
+        self.assertEqual(3, second.get_json().get('page'))
+        self.assertEqual(3, second.get_json().get('total_results'))
+
+    def test_fetch_curated_picks_returns_400_invalid_cursor(self):
+        res = self.client.get('/curated-picks?list_id=1&cursor=1.i', headers=self._get_headers(["booklist:get"]))
+
+        self.assert_error(res, expect_status_code=400, expect_message="'cursor' is not valid.")
+
+    def test_fetch_curated_picks_is_rebuilt_after_a_curator_change(self):
+        def add_picked_entries():
+            """Add some CuratedList's to the database."""
+            self._setup_curated_lists()
+            self._setup_curated_picks()
+
+        self.mock_book_service.mock_books(self._mock_books())
+
+        self.with_context(add_picked_entries)
+        first = self.client.get('/curated-picks?list_id=1', headers=self._get_headers(["booklist:get"]))
+        self.client.delete('/curated-pick/9780061120084', headers=self._get_headers(["booklist:curator"]))
+        second = self.client.get('/curated-picks?list_id=1', headers=self._get_headers(["booklist:get"]))
+
+        self.assertEqual(2, first.get_json().get('total_results'))
+        self.assertEqual(1, second.get_json().get('total_results'))
+
+    def test_fetch_curated_picks_returns_partial_response_with_failed_picks(self):
+        def add_picked_entries():
+            """Add some CuratedList's to the database."""
+            self._setup_curated_lists()
+            self._setup_curated_picks()
+
+        self.mock_book_service.mock_books(self._mock_books())
+        self.mock_book_service.mock_failing(['9780061120084'])
+
+        self.with_context(add_picked_entries)
+        partial = self.client.get('/curated-picks?list_id=1', headers=self._get_headers(["booklist:get"]))
+        self.mock_book_service.failing_isbns.clear()
+        complete = self.client.get('/curated-picks?list_id=1', headers=self._get_headers(["booklist:get"]))
+
+        self.assertEqual(200, partial.status_code)
+        self.assertTrue(partial.get_json().get('partial'))
+        self.assertEqual({"isbn13": "9780061120084", "position": 2, "failed": True}, partial.get_json().get('books')[1])
+        self.assertEqual('Test Title 2', partial.get_json().get('books')[0].get('title'))
+        # A partial response is not materialized, the next read fetches the books again
+        self.assertIsNone(complete.get_json().get('partial'))
+        self.assertEqual(['Test Title 2', 'Test Title'], [book.get('title') for book in complete.get_json().get('books')])
 
     def test_fetch_curated_picks_returns_code_404_list_does_not_exist(self):
         self.with_context(self._setup_curated_lists)
@@ -502,6 +589,116 @@ class CuratedPicksTestCase(BaseTestCase):
         expect_message = "Invalid position value."
         self.assert_error(res, expect_status_code=400, expect_message=expect_message)
 
+    def test_put_curated_list_order_returns_200(self):
+        self.with_context(self._setup_curated_lists)
+        payload = {
+            "picks": ["9780061120084", "0471958697"],
+        }
+
+        res = self.client.put(
+            '/curated-list/1/order',
+            data=json.dumps(payload),
+            content_type='application/json',
+            headers=self._get_headers(["booklist:curator"])
+        )
+
+        self.assertEqual(200, res.status_code)
+        picks_data = res.get_json().get('picks')
+        self.assertEqual(["9780061120084", "0471958697"],
+                         [pick.get('isbn13') or pick.get('isbn10') for pick in picks_data])
+        self.assertEqual([1, 2], [pick.get('position') for pick in picks_data])
+
+    def test_put_curated_list_order_returns_422_missing_pick(self):
+        self.with_context(self._setup_curated_lists)
+        payload = {
+            "picks": ["9780061120084"],
+        }
+
+        res = self.client.put(
+            '/curated-list/1/order',
+            data=json.dumps(payload),
+            content_type='application/json',
+            headers=self._get_headers(["booklist:curator"])
+        )
+
+        expect_message = "'picks' must list every pick of the list exactly once."
+        self.assert_error(res, expect_status_code=422, expect_message=expect_message)
+
+    def test_post_curated_picks_import_returns_201_and_row_errors(self):
+        self.with_context(self._setup_curated_lists)
+        self.with_context(self._setup_curated_picks)
+        payload = {
+            "picks": [
+                {"isbn13": "9789231781766", "position": 1},
+                {"isbn10": "5551926079"},
+                {"isbn13": "123"},
+                {"isbn13": "9780061120084"},
+                {"isbn13": "9789231781766"},
+            ],
+        }
+
+        res = self.client.post(
+            '/curated-list/1/picks',
+            data=json.dumps(payload),
+            content_type='application/json',
+            headers=self._get_headers(["booklist:curator"])
+        )
+
+        self.assertEqual(201, res.status_code)
+        picks_data = res.get_json().get('picks')
+        self.assertEqual([("9789231781766", 1), ("9785551926078", 4)],
+                         [(pick.get('isbn13'), pick.get('position')) for pick in picks_data])
+        self.assertEqual([3, 4, 5], [error.get('row') for error in res.get_json().get('errors')])
+
+    def test_post_curated_picks_import_keeps_the_sort_keys_of_the_picks_in_the_list(self):
+        def sort_keys():
+            return [pick.sort_key for pick in CuratedPick.find_by_list_id(1)]
+
+        self.with_context(self._setup_curated_lists)
+        self.with_context(self._setup_curated_picks)
+        before = []
+        self.with_context(lambda: before.extend(sort_keys()))
+
+        res = self.client.post(
+            '/curated-list/1/picks',
+            data=json.dumps({"picks": [{"isbn13": "9789231781766", "position": 2}, {"isbn10": "5551926079"}]}),
+            content_type='application/json',
+            headers=self._get_headers(["booklist:curator"])
+        )
+
+        after = []
+        self.with_context(lambda: after.extend(sort_keys()))
+        self.assertEqual(201, res.status_code)
+        self.assertEqual([before[0], before[1]], [after[0], after[2]])
+        self.assertEqual(sorted(after), after)
+
+    def test_post_curated_picks_import_from_csv_returns_201(self):
+        self.with_context(self._setup_curated_lists)
+        data = "isbn13,isbn10,position\n9789231781766,,2\n,5551926079,1\n"
+
+        res = self.client.post(
+            '/curated-list/2/picks',
+            data=data,
+            content_type='text/csv',
+            headers=self._get_headers(["booklist:curator"])
+        )
+
+        self.assertEqual(201, res.status_code)
+        picks_data = res.get_json().get('picks')
+        self.assertEqual([("9789231781766", 2), ("9785551926078", 1)],
+                         [(pick.get('isbn13'), pick.get('position')) for pick in picks_data])
+        self.assertTrue(res.get_json().get('success'))
+
+    def test_post_curated_picks_import_returns_404_list_does_not_exist(self):
+        res = self.client.post(
+            '/curated-list/9/picks',
+            data=json.dumps({"picks": [{"isbn13": "9789231781766"}]}),
+            content_type='application/json',
+            headers=self._get_headers(["booklist:curator"])
+        )
+
+        self.assert_error(res, expect_status_code=404, expect_message="The specified list does not exist.")
+
 
 if __name__ == '__main__':
     unittest.main()
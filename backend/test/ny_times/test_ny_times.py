@@ -64,6 +64,40 @@ class NyTimesTestCase(BaseTestCase):
         self.assertEqual(200, res.status_code)
         self.assertEqual(3, len(res.json['books']))
 
+    def test_fetch_non_fiction_200_return_requested_page(self):
+        self.mock_nyt_service.mock_books(path=NON_FICTION_PATH, books=self._mock_books())
+        res = self.client.get('/ny-times/best-sellers/non-fiction?page=2&limit=2',
+                              headers=self._get_headers(["booklist:get"]))
+        self.assertEqual(200, res.status_code)
+        self.assertEqual(['9780000000003'], [book['isbn13'] for book in res.json['books']])
+        self.assertEqual(2, res.json['page'])
+        self.assertEqual(3, res.json['total_results'])
+
+    def test_fetch_non_fiction_400_invalid_limit(self):
+        self.mock_nyt_service.mock_books(path=NON_FICTION_PATH, books=self._mock_books())
+        res = self.client.get('/ny-times/best-sellers/non-fiction?limit=0', headers=self._get_headers(["booklist:get"]))
+        self.assert_error(res, expect_status_code=400, expect_message="'limit' must be a positive integer.")
+
+    def test_fetch_list_200_return_list_by_name(self):
+        self.mock_nyt_service.mock_books(path='hardcover-fiction.json', books=self._mock_books())
+        res = self.client.get('/ny-times/best-sellers/hardcover-fiction', headers=self._get_headers(["booklist:get"]))
+        self.assertEqual(200, res.status_code)
+        self.assertEqual(3, len(res.json['books']))
+
+    def test_fetch_non_fiction_200_annotates_books_on_a_shelf(self):
+        self.mock_nyt_service.mock_books(path=NON_FICTION_PATH, books=self._mock_books())
+        book = dict(self._mock_books()[1], isbn10=None, shelf='read')
+        self.client.post('/book', json=book, headers=self._get_headers(["book:add_to_shelf"]))
+
+        res = self.client.get('/ny-times/best-sellers/non-fiction', headers=self._get_headers(["booklist:get"]))
+        self.assertEqual(200, res.status_code)
+        self.assertEqual([None, 'read', None], [book.get('shelf') for book in res.json['books']])
+
+    def test_fetch_list_404_unknown_list(self):
+        self.mock_nyt_service.mock_books(path='hardcover-fiction.json', books=self._mock_books())
+        res = self.client.get('/ny-times/best-sellers/unknown-list', headers=self._get_headers(["booklist:get"]))
+        self.assert_error(res, expect_status_code=404, expect_message="Unknown bestsellers list 'unknown-list'.")
+
     def test_fetch_non_fiction_with_permission_500_internal_server_error(self):
         self.mock_nyt_service.mock_books(path=NON_FICTION_PATH, books=[])
         self.mock_nyt_service.mock_error(True)
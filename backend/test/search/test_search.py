@@ -27,6 +27,25 @@ class SearchTestCase(BaseTestCase):
         self.assertEqual(len(data['books']), 1)
         self.assertEqual(data['books'][0]['title'], "Mocked Book")
 
+    def test_search_books_parses_page_and_limit(self):
+        res = self.client.get(
+            '/search/books?q=Mocked&page=01&limit=5',
+            headers=self._get_headers(["booklist:get"])
+        )
+
+        self.assertEqual(res.status_code, 200)
+        data = res.get_json()
+        self.assertEqual(data['page'], 1)
+        self.assertEqual(data['limit'], 5)
+
+    def test_search_books_400_for_non_numeric_page(self):
+        res = self.client.get(
+            '/search/books?q=Mocked&page=abc',
+            headers=self._get_headers(["booklist:get"])
+        )
+
+        self.assert_error(res, expect_status_code=400, expect_message="'page' must be a positive integer.")
+
     def test_search_books_403_for_missing_permission(self):
         res = self.client.get(
             '/search/books?q=test',
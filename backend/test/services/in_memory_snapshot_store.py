@@ -0,0 +1,20 @@
+"""In-memory implementation of the NYT list snapshot store."""
+from datetime import date
+
+
+class InMemorySnapshotStore:
+    """In-memory snapshot store, keeping the latest snapshot of every list."""
+
+    def __init__(self):
+        """Initialize the store without snapshots."""
+        self.snapshots = {}
+
+    def save(self, lists, json_response):
+        """Keep the books of every list, along with the date the lists are next published."""
+        next_published_date = json_response.get('results').get('next_published_date')
+        for path, json_books in lists.items():
+            self.snapshots[path] = (json_books, date.fromisoformat(next_published_date) if next_published_date else None)
+
+    def latest(self, path):
+        """Return the books of the latest snapshot of a list and its next publication date, None without one."""
+        return self.snapshots.get(path)
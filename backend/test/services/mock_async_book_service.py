@@ -0,0 +1,30 @@
+"""Mock implementation of the AsyncBookServiceBase class."""
+from app.services.async_book_service_base import AsyncBookServiceBase
+from app.utils.isbn_utils import to_isbn13
+from test.services.mock_book_service import MockBookService
+
+
+class MockAsyncBookService(AsyncBookServiceBase):
+    """Mock implementation of the AsyncBookServiceBase class, serving the store of a MockBookService."""
+
+    def __init__(self, book_service: MockBookService):
+        """Initialize the mock with the MockBookService the tests populate."""
+        self.book_service = book_service
+
+    async def fetch_book(self, book_shelf=None, isbn10=None, isbn13=None):
+        """Fetch a book by ISBN-10 or ISBN-13 from the mock store."""
+        return self.book_service.fetch_book(book_shelf=book_shelf, isbn10=isbn10, isbn13=isbn13)
+
+    async def fetch_books_bulk(self, isbns, shelves=None):
+        """Fetch many books from the mock store, omitting the ones not found."""
+        return self.book_service.fetch_books_bulk(isbns, shelves=shelves)
+
+    async def fetch_books_within(self, isbns, timeout):
+        """Fetch many books from the mock store, reporting the ones mocked as failing as failed."""
+        isbn13s = [to_isbn13(isbn) for isbn in isbns]
+        failed = [isbn13 for isbn13 in isbn13s if isbn13 in self.book_service.failing_isbns]
+        return self.book_service.fetch_books_bulk([isbn13 for isbn13 in isbn13s if isbn13 not in failed]), failed
+
+    async def search_books(self, query: str, page: int, limit: int) -> dict:
+        """Mock search functionality, see MockBookService.search_books."""
+        return self.book_service.search_books(query=query, page=page, limit=limit)
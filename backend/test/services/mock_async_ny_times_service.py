@@ -0,0 +1,19 @@
+"""Mock implementation of the AsyncNYTimesServiceBase interface."""
+from app.services.async_ny_times_service_base import AsyncNYTimesServiceBase
+from test.services.mock_ny_times_service import MockNyTimesService
+
+
+class MockAsyncNyTimesService(AsyncNYTimesServiceBase):
+    """Mock implementation of the AsyncNYTimesServiceBase interface, serving the store of a MockNyTimesService."""
+
+    def __init__(self, nyt_service: MockNyTimesService):
+        """Initialize the mock with the MockNyTimesService the tests populate."""
+        self.nyt_service = nyt_service
+
+    async def fetch_books(self, path: str, page: int, limit: int) -> dict:
+        """Fetches bestsellers list from the store of the MockNyTimesService."""
+        return self.nyt_service.fetch_books(path, page, limit)
+
+    async def fetch_list_names(self) -> dict[str, str]:
+        """Returns the list names of the MockNyTimesService."""
+        return self.nyt_service.fetch_list_names()
@@ -1,7 +1,7 @@
 """Mock implementation of the BookServiceBase class."""
 from app.models.book_dto import BookResponse
 from app.services.book_service_base import BookServiceBase
-from app.utils.isbn_utils import is_valid_isbn10, is_valid_isbn13
+from app.utils.isbn_utils import is_valid_isbn10, is_valid_isbn13, to_isbn13
 
 
 class MockBookService(BookServiceBase):
@@ -10,16 +10,25 @@ class MockBookService(BookServiceBase):
     def __init__(self):
         """Initialize store to simulate access to Redis instance or ISBNdb API."""
         self._store = {}
+        self.failing_isbns = set()
 
     def fetch_book(self, book_shelf=None, isbn10=None, isbn13=None):
         """Fetch a book by ISBN-10 or ISBN-13 from the mock store."""
         self._validate_isbn(isbn10, isbn13)
-        key = isbn13 or isbn10
+        key = isbn13 or to_isbn13(isbn10)
         if not key:
             raise ValueError("At least one of ISBN-10 or ISBN-13 must be provided.")
 
         return self._store.get(key).to_dict()
 
+    def fetch_books_bulk(self, isbns, shelves=None):
+        """Fetch many books from the mock store, keyed by ISBN-13, omitting the ones not found."""
+        for isbn in isbns:
+            self._validate_isbn(isbn, isbn)
+
+        keys = [to_isbn13(isbn) for isbn in isbns]
+        return {key: self._store[key].to_dict() for key in keys if key in self._store}
+
     def search_books(self, query: str, page: int, limit: int) -> dict:
         """
         Mock search functionality.
@@ -32,15 +41,15 @@ class MockBookService(BookServiceBase):
         ]
 
         # Simulate pagination
-        start = (int(page) - 1) * int(limit)
-        end = start + int(limit)
+        start = (page - 1) * limit
+        end = start + limit
         paginated_books = matching_books[start:end]
 
         return {
             "success": True,
             "books": paginated_books,
-            "page": int(page),
-            "limit": int(limit),
+            "page": page,
+            "limit": limit,
             "total_results": len(matching_books),
         }
 
@@ -54,7 +63,11 @@ class MockBookService(BookServiceBase):
     def mock_books(self, books: list[BookResponse]):
         """Mock multiple books in the store for testing."""
         for book in books:
-            key = book.isbn13 or book.isbn10
+            key = book.isbn13 or to_isbn13(book.isbn10)
             if not key:
                 raise ValueError("Book must have either an ISBN-10 or ISBN-13.")
             self._store[key] = book
+
+    def mock_failing(self, isbn13s: list[str]):
+        """Mock books whose fetch fails, e.g. ISBNdb timing out, for testing partial responses."""
+        self.failing_isbns.update(isbn13s)
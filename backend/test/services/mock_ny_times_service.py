@@ -5,6 +5,7 @@ The class fetches bestsellers list from a Redis instance or from the NYTimes API
 """
 import os
 
+from app.pagination.books import page_bounds
 from app.services.ny_times_service_base import NYTimesServiceBase
 
 
@@ -34,14 +35,19 @@ class MockNyTimesService(NYTimesServiceBase):
             raise ValueError(f"Path '{path}' not found in store. Call mock_books to populate the store.")
         else:
             json_books = self._store[path]
+            start, end = page_bounds(page, limit)
             return {
                 'success': True,
-                'books': json_books,
+                'books': json_books[start:end],
                 'page': page,
                 'limit': limit,
                 'total_results': len(json_books)
             }
 
+    def fetch_list_names(self) -> dict[str, str]:
+        """Returns the names of the lists in self._store."""
+        return {path.removesuffix('.json'): path for path in self._store}
+
     def mock_books(self, path: str, books: list[dict]):
         """Mocks the bestsellers list from the NYTimes API."""
         self._store[path] = books if path not in self._store else self._store[path] + books
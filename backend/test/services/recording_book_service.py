@@ -0,0 +1,32 @@
+"""Recording implementation of the bulk fetch of the BookServiceBase class."""
+from app.exceptions.invalid_request_error import InvalidRequestError
+
+
+class RecordingBookService:
+    """Book service recording the bulk fetches, failing or degrading from a given call."""
+
+    def __init__(self, fail_at=None, degrade_at=None, error=None):
+        """
+        Initialize the service without batches.
+
+        :param fail_at: number of batches fetched before failing.
+        :param degrade_at: number of batches fetched before degrading.
+        :param error: exception raised by the failing fetch; the daily ISBNdb quota being used by default.
+        """
+        self.batches = []
+        self.fail_at = fail_at
+        self.degrade_at = degrade_at
+        self.error = error or InvalidRequestError(
+            code=429, message="Daily quota of upstream 'isbndb' used, try again tomorrow."
+        )
+
+    def fetch_books_bulk(self, isbns, shelves=None):
+        """Record the batch, or fail with error."""
+        if len(self.batches) == self.fail_at:
+            raise self.error
+        self.batches.append(list(isbns))
+        return {}
+
+    def is_degraded(self):
+        """Tell whether more than degrade_at batches were fetched."""
+        return self.degrade_at is not None and len(self.batches) > self.degrade_at
@@ -0,0 +1,25 @@
+"""Recording implementation of the scheduled refresh of the NyTimesService class."""
+import time
+
+from app.services.cache_codec import encode_book_responses, nyt_key
+
+
+class RecordingNyTimesService:
+    """NYT service caching empty lists fresh until a set time, as NYT does until their next publication."""
+
+    def __init__(self, redis_client, fresh_for: int = 3600):
+        """
+        Initialize the service without refreshed paths.
+
+        :param redis_client: Redis client caching the lists.
+        :param fresh_for: seconds from now the lists are fresh until, however often refreshed.
+        """
+        self.redis_client = redis_client
+        self.fresh_until = int(time.time()) + fresh_for
+        self.refreshed = []
+
+    def refresh_bestsellers(self, path):
+        """Record the path and cache the list empty."""
+        self.refreshed.append(path)
+        self.redis_client.set(nyt_key(path), encode_book_responses([], self.fresh_until))
+        return []
@@ -0,0 +1,19 @@
+"""Recording implementation of the BackgroundRefresher interface."""
+
+
+class RecordingRefresher:
+    """Refresher recording the keys it is asked to refresh, without refreshing them."""
+
+    def __init__(self):
+        """Initialize the refresher without refreshed keys."""
+        self.refreshed = []
+
+    def refresh(self, key, fn):
+        """Record the key, dropping the refresh."""
+        self.refreshed.append(key)
+        return True
+
+    def refresh_many(self, keys, fn):
+        """Record the keys, dropping the refresh."""
+        self.refreshed.extend(keys)
+        return True
@@ -0,0 +1,59 @@
+"""Stub of the HTTP client calling the ISBNdb API."""
+import json
+import time
+
+import requests
+
+from app.config import GET_BOOK_ENDPOINT, SEARCH_ENDPOINT
+
+
+def json_book(isbn13: str) -> dict:
+    """Returns the ISBNdb JSON of a book titled after its ISBN-13."""
+    return {'isbn': isbn13, 'isbn13': isbn13, 'title': f'Book {isbn13}', 'image': 'book.jpg', 'language': 'en'}
+
+
+class StubIsbndbClient:
+    """Stub of the ISBNdb HTTP client, answering with the books it knows and recording the calls."""
+
+    def __init__(self, books: dict[str, dict] | None = None, slow_isbns=(), failing_isbns=(), delay: float = 0):
+        """
+        Initialize the stub without calls.
+
+        :param books: ISBNdb JSON of the books known, keyed by the ISBN requested; none by default.
+        :param slow_isbns: ISBNs whose bulk requests are answered after delay seconds.
+        :param failing_isbns: ISBNs whose bulk requests are answered with a 400.
+        :param delay: seconds the bulk requests of slow_isbns take.
+        """
+        self.books = books or {}
+        self.slow_isbns = set(slow_isbns)
+        self.failing_isbns = set(failing_isbns)
+        self.delay = delay
+        self.calls = []
+        self.bulk_requests = []
+
+    def request(self, method, url, data=None, **kwargs):
+        """Answer a search with every book known, a book lookup with the book, and a bulk request with the books known."""
+        self.calls.append((method, url))
+        if url.startswith(SEARCH_ENDPOINT):
+            return self._response(200, {'total': len(self.books), 'books': list(self.books.values())})
+
+        if data is None:
+            book = self.books.get(url.removeprefix(GET_BOOK_ENDPOINT))
+            return self._response(200, {'book': book}) if book else self._response(404, {'errorMessage': 'Not Found'})
+
+        isbns = data['isbns'].split(',')
+        self.bulk_requests.append(isbns)
+        if self.failing_isbns.intersection(isbns):
+            return self._response(400, {'errorMessage': 'Bad Request'})
+        if self.slow_isbns.intersection(isbns):
+            time.sleep(self.delay)
+
+        json_books = [self.books[isbn] for isbn in isbns if isbn in self.books]
+        return self._response(200, {'data': json_books}) if json_books else self._response(404, {'data': []})
+
+    @staticmethod
+    def _response(status_code: int, json_response: dict) -> requests.Response:
+        response = requests.Response()
+        response.status_code = status_code
+        response._content = json.dumps(json_response).encode()
+        return response
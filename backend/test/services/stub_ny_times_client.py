@@ -0,0 +1,44 @@
+"""Stub of the HTTP client calling the NYT Books API."""
+from types import SimpleNamespace
+
+from app.config import NYT_OVERVIEW_PATH
+from app.utils.isbn_utils import isbn10_to_isbn13
+
+
+class StubNyTimesClient:
+    """Stub of the NYT HTTP client, answering every list with the same books, and the overview with two lists of them."""
+
+    def __init__(self, size: int, next_published_date: str = ''):
+        """
+        Initialize the stub without calls.
+
+        :param size: number of books of the lists.
+        :param next_published_date: date the lists are next published, empty when unknown.
+        """
+        self.calls = 0
+        self.next_published_date = next_published_date
+        self.books = [
+            {
+                'primary_isbn13': isbn10_to_isbn13(f'{i:09d}'),
+                'primary_isbn10': None,
+                'title': f'Book {i}',
+                'author': f'Author {i}',
+                'book_image': f'book{i}.jpg',
+            }
+            for i in range(size)
+        ]
+
+    def get(self, url, **kwargs):
+        """Answer the overview, or a bestsellers list."""
+        self.calls += 1
+        if NYT_OVERVIEW_PATH in url:
+            json_response = {'results': {'next_published_date': self.next_published_date, 'lists': [
+                {'list_name_encoded': 'hardcover-fiction', 'display_name': 'Hardcover Fiction', 'books': self.books[:5]},
+                {'list_name_encoded': 'young-adult', 'display_name': 'Young Adult', 'books': self.books[5:10]},
+            ]}}
+        else:
+            json_response = {
+                'num_results': len(self.books),
+                'results': {'books': self.books, 'next_published_date': self.next_published_date},
+            }
+        return SimpleNamespace(status_code=200, json=lambda: json_response, raise_for_status=lambda: None)
@@ -0,0 +1,102 @@
+"""Module for testing that AsyncBookService returns the books resolved by its deadline, and caches the late ones."""
+import asyncio
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest import mock
+
+import fakeredis
+
+from app.config import ISBNDB_BULK_CONCURRENCY
+from app.services.async_book_service import AsyncBookService
+from app.services.bloom_filter import BloomFilter
+from app.services.book_service import BookService
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.local_cache import LocalCache
+from app.services.single_flight import SingleFlight
+from app.utils.isbn_utils import isbn10_to_isbn13
+from test.services.recording_refresher import RecordingRefresher
+from test.services.stub_isbndb_client import StubIsbndbClient, json_book
+
+FAST, SLOW, FAILING = (isbn10_to_isbn13(f'{i:09d}') for i in range(3))
+
+
+class AsyncBookServiceTestCase(unittest.TestCase):
+    """Tests for AsyncBookService.fetch_books_within."""
+
+    def setUp(self):
+        self.http_client = StubIsbndbClient(
+            books={isbn: json_book(isbn) for isbn in (FAST, SLOW, FAILING)},
+            slow_isbns=[SLOW],
+            failing_isbns=[FAILING],
+            delay=0.5,
+        )
+        self.executor = ThreadPoolExecutor(max_workers=4)
+        self.addCleanup(self.executor.shutdown)
+        self.book_service = BookService(
+            redis_client=fakeredis.FakeRedis(),
+            http_client=self.http_client,
+            local_cache=LocalCache(name='book', redis_client=fakeredis.FakeRedis(), max_entries=16, ttl=60),
+            single_flight=SingleFlight(),
+            refresher=RecordingRefresher(),
+            missing_isbns=BloomFilter(capacity=100, error_rate=0.001, max_age=60),
+            rate_limiter=SimpleNamespace(acquire=lambda endpoint: None),
+            circuit_breaker=CircuitBreaker(
+                name='isbndb',
+                failure_threshold=10,
+                reset_timeout=30,
+                retries=0,
+                retry_base_delay=0,
+                retry_max_delay=0,
+            ),
+        )
+        self.service = AsyncBookService(book_service=self.book_service, executor=self.executor)
+        patcher = mock.patch('app.services.async_book_service.ISBNDB_BULK_CHUNK_SIZE', 1)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _fetch_within(self, isbns, timeout):
+        return asyncio.run(self.service.fetch_books_within(isbns, timeout=timeout))
+
+    def test_returns_the_books_resolved_before_the_deadline(self):
+        started = time.monotonic()
+        books, failed = self._fetch_within([FAST, SLOW, FAILING], timeout=0.2)
+
+        self.assertLess(time.monotonic() - started, 0.45)
+        self.assertEqual([FAST], list(books))
+        self.assertEqual({SLOW, FAILING}, set(failed))
+
+    def test_late_books_fill_the_cache_for_the_next_call(self):
+        self._fetch_within([SLOW], timeout=0.05)
+        time.sleep(0.6)
+
+        self.http_client.delay = 10
+        books, failed = self._fetch_within([SLOW], timeout=0.05)
+
+        self.assertEqual([SLOW], list(books))
+        self.assertEqual([], failed)
+
+    def test_queued_chunks_fill_the_cache_after_the_deadline(self):
+        isbn13s = [isbn10_to_isbn13(f'{i:09d}') for i in range(3, 3 + 2 * ISBNDB_BULK_CONCURRENCY)]
+        self.http_client.books.update({isbn13: json_book(isbn13) for isbn13 in isbn13s})
+        self.http_client.slow_isbns.update(isbn13s)
+        self.http_client.delay = 0.1
+
+        books, failed = self._fetch_within(isbn13s, timeout=0.01)
+        self.executor.shutdown(wait=True)
+
+        self.assertEqual({}, books)
+        self.assertEqual(isbn13s, failed)
+        self.assertEqual([[isbn13] for isbn13 in isbn13s], self.http_client.bulk_requests)
+        self.assertEqual([], self.book_service.get_cached_books(isbn13s)[1])
+
+    def test_invalid_isbn_fails_alone(self):
+        books, failed = self._fetch_within([FAST, 'not-an-isbn'], timeout=1)
+
+        self.assertEqual([FAST], list(books))
+        self.assertEqual(['not-an-isbn'], failed)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+"""Module for testing that BackgroundRefresher runs a refresh per entry at a time, off the calling thread."""
+import threading
+import unittest
+
+import fakeredis
+
+from app.services.background_refresher import BackgroundRefresher
+from app.services.cache_codec import cache_key
+
+
+class BackgroundRefresherTestCase(unittest.TestCase):
+    """Tests for BackgroundRefresher."""
+
+    def setUp(self):
+        self.redis_client = fakeredis.FakeRedis()
+        self.refresher = BackgroundRefresher(redis_client=self.redis_client, max_workers=2, lock_ttl=30)
+
+    def _wait_for_refreshes(self):
+        self.refresher._get_executor().shutdown(wait=True)
+
+    def test_refresh_runs_in_the_background_and_releases_its_lock(self):
+        refreshed_by = []
+
+        self.assertTrue(self.refresher.refresh('key', lambda: refreshed_by.append(threading.current_thread().name)))
+        self._wait_for_refreshes()
+
+        self.assertEqual(1, len(refreshed_by))
+        self.assertTrue(refreshed_by[0].startswith('cache-refresh'))
+        self.assertIsNone(self.redis_client.get(cache_key('refresh', 'key')))
+
+    def test_refresh_of_an_entry_already_being_refreshed_is_skipped(self):
+        started, release = threading.Event(), threading.Event()
+        calls = []
+
+        def slow_refresh():
+            calls.append('slow')
+            started.set()
+            release.wait(5)
+
+        self.assertTrue(self.refresher.refresh('key', slow_refresh))
+        started.wait(5)
+        self.assertFalse(self.refresher.refresh('key', lambda: calls.append('skipped')))
+        self.assertTrue(self.refresher.refresh('other', lambda: calls.append('other')))
+        release.set()
+        self._wait_for_refreshes()
+
+        self.assertEqual({'slow', 'other'}, set(calls))
+
+    def test_failed_refresh_releases_its_lock(self):
+        def failing_refresh():
+            raise ValueError('Upstream failed')
+
+        self.refresher.refresh('key', failing_refresh)
+        self._wait_for_refreshes()
+
+        self.assertIsNone(self.redis_client.get(cache_key('refresh', 'key')))
+
+    def test_refresh_many_refreshes_the_entries_not_already_being_refreshed_in_one_call(self):
+        self.redis_client.set(cache_key('refresh', 'locked'), 'token')
+        calls = []
+
+        self.assertTrue(self.refresher.refresh_many({'key': 'a', 'locked': 'b', 'other': 'c'}, calls.append))
+        self._wait_for_refreshes()
+
+        self.assertEqual([['a', 'c']], calls)
+        self.assertEqual([b'token', None, None], self.redis_client.mget(
+            [cache_key('refresh', 'locked'), cache_key('refresh', 'key'), cache_key('refresh', 'other')]
+        ))
+
+    def test_refresh_many_without_any_entry_to_refresh_schedules_nothing(self):
+        self.redis_client.set(cache_key('refresh', 'locked'), 'token')
+
+        self.assertFalse(self.refresher.refresh_many({'locked': 'b'}, lambda identifiers: None))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+"""Module for testing the in-process BloomFilter."""
+import time
+import unittest
+
+from app.services.bloom_filter import BloomFilter
+from test.utils.isbn_utils import generate_random_isbn13
+
+
+class BloomFilterTestCase(unittest.TestCase):
+    """Tests for the BloomFilter."""
+
+    def test_added_keys_are_always_found(self):
+        bloom_filter = BloomFilter(capacity=1000, error_rate=0.001, max_age=60)
+        isbns = [generate_random_isbn13() for _ in range(1000)]
+        for isbn in isbns:
+            bloom_filter.add(isbn)
+
+        self.assertTrue(all(isbn in bloom_filter for isbn in isbns))
+
+    def test_false_positive_rate_stays_near_error_rate(self):
+        bloom_filter = BloomFilter(capacity=1000, error_rate=0.01, max_age=60)
+        for i in range(1000):
+            bloom_filter.add(f'missing-{i}')
+
+        false_positives = sum(1 for i in range(10000) if f'known-{i}' in bloom_filter)
+        self.assertLess(false_positives, 300)
+
+    def test_filter_is_cleared_after_max_age(self):
+        bloom_filter = BloomFilter(capacity=10, error_rate=0.01, max_age=0.01)
+        bloom_filter.add('9780061120084')
+        time.sleep(0.02)
+
+        self.assertFalse('9780061120084' in bloom_filter)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,213 @@
+"""Module for testing how BookService answers from its caches, and when it calls ISBNdb."""
+import time
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+import fakeredis
+
+from app.config import BULK_BOOKS_ENDPOINT, GET_BOOK_ENDPOINT, SEARCH_ENDPOINT
+from app.exceptions.invalid_request_error import InvalidRequestError
+from app.services.bloom_filter import BloomFilter
+from app.services.book_service import BookService
+from app.services.cache_codec import (
+    alias_key,
+    book_key,
+    encode_book,
+    encode_search_page,
+    expiry_times,
+    missing_key,
+    search_key,
+)
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.local_cache import LocalCache
+from app.services.single_flight import SingleFlight
+from app.utils.isbn_utils import isbn10_to_isbn13
+from test.services.recording_refresher import RecordingRefresher
+from test.services.stub_isbndb_client import StubIsbndbClient, json_book
+
+CACHED, UNKNOWN = (isbn10_to_isbn13(f'{i:09d}') for i in range(2))
+
+
+class BookServiceTestCase(unittest.TestCase):
+    """Tests for BookService."""
+
+    def setUp(self):
+        self.redis_client = fakeredis.FakeRedis()
+        self.http_client = StubIsbndbClient()
+        self.missing_isbns = BloomFilter(capacity=100, error_rate=0.001, max_age=60)
+        self.refresher = RecordingRefresher()
+        self.service = BookService(
+            redis_client=self.redis_client,
+            http_client=self.http_client,
+            local_cache=LocalCache(name='book', redis_client=fakeredis.FakeRedis(), max_entries=16, ttl=60),
+            single_flight=SingleFlight(),
+            refresher=self.refresher,
+            missing_isbns=self.missing_isbns,
+            rate_limiter=SimpleNamespace(acquire=lambda endpoint: None),
+            circuit_breaker=CircuitBreaker(
+                name='isbndb',
+                failure_threshold=10,
+                reset_timeout=30,
+                retries=0,
+                retry_base_delay=0,
+                retry_max_delay=0,
+            ),
+        )
+        fresh_until, expiry_time = expiry_times(60)
+        self.redis_client.set(book_key(CACHED), encode_book(json_book(CACHED), fresh_until), ex=expiry_time)
+
+    def test_fetch_book_serves_a_false_positive_of_the_missing_isbns_filter(self):
+        self.missing_isbns.add(CACHED)
+
+        self.assertEqual(f'Book {CACHED}', self.service.fetch_book(None, isbn13=CACHED)['title'])
+
+    def test_fetch_book_answers_404_for_a_confirmed_missing_book_without_calling_isbndb(self):
+        self.missing_isbns.add(UNKNOWN)
+        self.redis_client.set(missing_key(UNKNOWN), b'1')
+
+        with self.assertRaises(InvalidRequestError) as context:
+            self.service.fetch_book(None, isbn13=UNKNOWN)
+
+        self.assertEqual(404, context.exception.code)
+        self.assertEqual([], self.http_client.calls)
+
+    def test_fetch_book_remembers_a_book_isbndb_does_not_know(self):
+        with self.assertRaises(InvalidRequestError):
+            self.service.fetch_book(None, isbn13=UNKNOWN)
+
+        self.assertEqual([('GET', GET_BOOK_ENDPOINT + UNKNOWN)], self.http_client.calls)
+        self.assertIn(UNKNOWN, self.missing_isbns)
+        self.assertTrue(self.redis_client.exists(missing_key(UNKNOWN)))
+
+    def test_fetch_books_bulk_serves_a_false_positive_of_the_missing_isbns_filter(self):
+        self.missing_isbns.add(CACHED)
+
+        self.assertEqual([CACHED], list(self.service.fetch_books_bulk([CACHED])))
+
+    def test_fetch_books_bulk_omits_a_book_missing_for_another_worker_without_calling_isbndb(self):
+        self.redis_client.set(missing_key(UNKNOWN), b'1')
+
+        self.assertEqual([CACHED], list(self.service.fetch_books_bulk([CACHED, UNKNOWN])))
+        self.assertEqual([], self.http_client.calls)
+        self.assertIn(UNKNOWN, self.missing_isbns)
+
+    def test_fetch_books_bulk_requests_only_the_books_missing_from_redis(self):
+        first, second = (isbn10_to_isbn13(f'{i:09d}') for i in range(2, 4))
+        self.http_client.books = {first: json_book(first), second: json_book(second)}
+
+        books = self.service.fetch_books_bulk([CACHED, first, second])
+
+        self.assertEqual({CACHED, first, second}, set(books))
+        self.assertEqual([[first, second]], self.http_client.bulk_requests)
+        self.assertEqual([('POST', BULK_BOOKS_ENDPOINT)], self.http_client.calls)
+
+    def test_fetch_books_bulk_requests_the_misses_in_chunks(self):
+        isbn13s = [isbn10_to_isbn13(f'{i:09d}') for i in range(2, 7)]
+        self.http_client.books = {isbn13: json_book(isbn13) for isbn13 in isbn13s}
+
+        with mock.patch('app.services.book_service.ISBNDB_BULK_CHUNK_SIZE', 2):
+            books = self.service.fetch_books_bulk(isbn13s)
+
+        self.assertEqual(set(isbn13s), set(books))
+        self.assertEqual([isbn13s[0:2], isbn13s[2:4], isbn13s[4:]], self.http_client.bulk_requests)
+
+    def test_fetch_books_bulk_writes_the_fetched_books_and_the_unknown_isbns_back_to_redis(self):
+        known = isbn10_to_isbn13('000000002')
+        self.http_client.books = {known: json_book(known)}
+
+        self.service.fetch_books_bulk([known, UNKNOWN])
+
+        self.assertIsNotNone(self.redis_client.get(book_key(known)))
+        self.assertTrue(self.redis_client.exists(missing_key(UNKNOWN)))
+        self.service.local_cache.clear()
+        self.assertEqual([known], list(self.service.fetch_books_bulk([known, UNKNOWN])))
+        self.assertEqual(1, len(self.http_client.bulk_requests))
+
+    def test_fetch_books_bulk_serves_a_book_isbndb_returned_under_another_isbn13_from_its_alias(self):
+        other_edition = isbn10_to_isbn13('000000002')
+        self.http_client.books = {UNKNOWN: dict(json_book(other_edition), isbn=UNKNOWN)}
+
+        self.assertEqual([UNKNOWN], list(self.service.fetch_books_bulk([UNKNOWN])))
+        self.assertEqual(other_edition.encode(), self.redis_client.get(alias_key(UNKNOWN)))
+        self.assertIsNotNone(self.redis_client.get(book_key(other_edition)))
+
+        self.service.local_cache.clear()
+        self.assertEqual(f'Book {other_edition}', self.service.fetch_books_bulk([UNKNOWN])[UNKNOWN]['title'])
+        self.assertEqual(1, len(self.http_client.bulk_requests))
+
+    def test_search_books_sends_the_query_as_typed_and_caches_the_page_under_the_normalized_query(self):
+        found = isbn10_to_isbn13('000000002')
+        self.http_client.books = {found: json_book(found)}
+
+        first = self.service.search_books('The  Hobbit', page=1, limit=10)
+        second = self.service.search_books('the hobbit', page=1, limit=10)
+
+        self.assertEqual([('GET', SEARCH_ENDPOINT + 'The  Hobbit?page=1&pageSize=10')], self.http_client.calls)
+        self.assertEqual(first, second)
+        self.assertEqual(1, second['total_results'])
+        self.assertIsNotNone(self.redis_client.get(search_key('the hobbit', 1, 10)))
+
+    def test_search_books_caches_the_pages_of_a_query_apart(self):
+        self.service.search_books('hobbit', page=1, limit=10)
+        self.service.search_books('hobbit', page=2, limit=10)
+
+        self.assertEqual(2, len(self.http_client.calls))
+
+    def test_search_books_writes_the_books_found_through_to_the_book_cache(self):
+        found = isbn10_to_isbn13('000000002')
+        self.http_client.books = {found: json_book(found)}
+
+        self.service.search_books('hobbit', page=1, limit=10)
+        self.service.local_cache.clear()
+
+        self.assertEqual(f'Book {found}', self.service.fetch_book(None, isbn13=found)['title'])
+        self.assertEqual(1, len(self.http_client.calls))
+
+    def test_search_books_serves_a_stale_page_while_refreshing_it_in_the_background(self):
+        page_key = search_key('hobbit', 1, 10)
+        self.redis_client.set(page_key, encode_search_page(1, [json_book(CACHED)], int(time.time()) - 1))
+
+        self.assertEqual(1, self.service.search_books('Hobbit', page=1, limit=10)['total_results'])
+        self.assertEqual([page_key], self.refresher.refreshed)
+        self.assertEqual([], self.http_client.calls)
+
+    def test_caching_books_invalidates_only_the_books_replaced_in_redis(self):
+        with mock.patch.object(self.service.local_cache, 'invalidate_many') as invalidate_many:
+            self.service._cache_books({CACHED: json_book(CACHED), UNKNOWN: json_book(UNKNOWN)})
+
+        invalidate_many.assert_called_once_with([CACHED, f'{CACHED}:json'])
+        self.assertEqual(f'Book {UNKNOWN}', self.service.fetch_book(None, isbn13=UNKNOWN)['title'])
+
+    def test_aliased_book_is_read_from_the_entry_of_its_alias_until_both_expire(self):
+        self.service._cache_books({UNKNOWN: json_book(CACHED)}, aliases={UNKNOWN: CACHED})
+        self.service.local_cache.clear()
+
+        books, misses = self.service.get_cached_books([UNKNOWN])
+
+        self.assertEqual({UNKNOWN: json_book(CACHED)}, books)
+        self.assertEqual([], misses)
+        self.assertGreater(self.redis_client.ttl(alias_key(UNKNOWN)), 0)
+        self.assertLessEqual(self.redis_client.ttl(alias_key(UNKNOWN)), self.redis_client.ttl(book_key(CACHED)) + 1)
+
+    def test_fetch_book_serves_a_stale_book_while_refreshing_it_in_the_background(self):
+        self.redis_client.set(book_key(CACHED), encode_book(json_book(CACHED), int(time.time()) - 1))
+
+        self.assertEqual(f'Book {CACHED}', self.service.fetch_book(None, isbn13=CACHED)['title'])
+        self.assertEqual([book_key(CACHED)], self.refresher.refreshed)
+        self.assertEqual([], self.http_client.calls)
+
+    def test_fetch_books_bulk_serves_stale_books_while_refreshing_them_in_the_background(self):
+        self.redis_client.set(book_key(CACHED), encode_book(json_book(CACHED), int(time.time()) - 1))
+
+        self.assertEqual([CACHED], list(self.service.fetch_books_bulk([CACHED])))
+        self.assertEqual([book_key(CACHED)], self.refresher.refreshed)
+
+    def test_fresh_book_is_not_refreshed(self):
+        self.service.fetch_book(None, isbn13=CACHED)
+
+        self.assertEqual([], self.refresher.refreshed)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+"""Module for testing the Redis cache format."""
+import time
+import unittest
+
+from app.config import CACHE_SCHEMA_VERSION, CACHE_STALE_FACTOR, CACHE_STALE_MAX_TIME, CACHE_TTL_JITTER
+from app.services.cache_codec import (
+    book_key,
+    decode_body,
+    decode_book,
+    decode_book_responses,
+    encode_body,
+    encode_book,
+    encode_book_responses,
+    expiry_times,
+    is_stale,
+    nyt_key,
+    stale_time,
+)
+
+FRESH_UNTIL = int(time.time()) + 3600
+
+
+class CacheCodecTestCase(unittest.TestCase):
+    """Tests for the cache codec."""
+
+    @staticmethod
+    def _book(synopsis: str):
+        return {
+            'isbn': '0393609642',
+            'isbn13': '9780393609646',
+            'title': "Asperger's Children",
+            'subtitle': '',
+            'authors': ['Edith Sheffer'],
+            'image': 'https://images.isbndb.com/covers/3177343482328.jpg',
+            'rating': 0.0,
+            'msrp': 27.95,
+            'language': 'en',
+            'synopsis': synopsis,
+            'pages': 320,
+            'subjects': ['History'],
+        }
+
+    def test_keys_are_namespaced_and_versioned(self):
+        self.assertEqual(f'adb:book:v{CACHE_SCHEMA_VERSION}:9780393609646', book_key('9780393609646'))
+        self.assertEqual(f'adb:nyt:v{CACHE_SCHEMA_VERSION}:fiction.json', nyt_key('fiction.json'))
+
+    def test_encode_book_round_trip(self):
+        book = self._book(synopsis='Short synopsis.')
+        data = encode_book(book, FRESH_UNTIL)
+
+        self.assertEqual(CACHE_SCHEMA_VERSION, data[0])
+        self.assertEqual(0, data[1])
+        self.assertEqual(book, decode_book(data))
+
+    def test_encode_book_compresses_large_entries(self):
+        book = self._book(synopsis='A groundbreaking exploration of history. ' * 50)
+        data = encode_book(book, FRESH_UNTIL)
+
+        self.assertEqual(1, data[1])
+        self.assertLess(len(data), len(book['synopsis']))
+        self.assertEqual(book, decode_book(data))
+
+    def test_encode_book_drops_shelf(self):
+        book = self._book(synopsis='Short synopsis.')
+        data = encode_book({**book, 'shelf': 'read'}, FRESH_UNTIL)
+
+        self.assertEqual(book, decode_book(data))
+
+    def test_encode_book_responses_round_trip(self):
+        books = [
+            {'isbn13': '9781638932253', 'isbn10': '', 'title': 'CAUGHT UP', 'authors': ['Navessa Allen'], 'image': 'a.jpg'},
+            {'isbn13': '9781250320520', 'title': 'BURY OUR BONES', 'authors': ['V.E. Schwab'], 'image': 'b.jpg'},
+        ]
+
+        self.assertEqual(books, decode_book_responses(encode_book_responses(books, FRESH_UNTIL)))
+
+    def test_encode_body_round_trip_with_the_isbn13s_of_its_books(self):
+        body = b'{"books":[{"isbn13":"9781638932253","title":"CAUGHT\\nUP"}]}'
+
+        self.assertEqual((body, ['9781638932253']), decode_body(encode_body(body, ['9781638932253'], FRESH_UNTIL)))
+        self.assertEqual((b'{"books":[]}', []), decode_body(encode_body(b'{"books":[]}', [], FRESH_UNTIL)))
+
+    def test_decode_body_of_an_entry_without_isbn13s(self):
+        data = bytes((CACHE_SCHEMA_VERSION, 0, 0, 0, 0, 0)) + b'{"books":[]}'
+
+        self.assertEqual((b'{"books":[]}', None), decode_body(data))
+
+    def test_is_stale_after_fresh_until(self):
+        book = self._book(synopsis='Short synopsis.')
+
+        self.assertFalse(is_stale(encode_book(book, FRESH_UNTIL)))
+        self.assertTrue(is_stale(encode_book(book, int(time.time()) - 1)))
+
+    def test_expiry_times_are_jittered_and_keep_stale_window(self):
+        now = time.time()
+        fresh_until, expiry_time = expiry_times(3600)
+
+        self.assertAlmostEqual(now + 3600, fresh_until, delta=3600 * CACHE_TTL_JITTER + 1)
+        self.assertGreater(expiry_time, fresh_until - now + 3600 * CACHE_STALE_FACTOR * (1 - CACHE_TTL_JITTER) - 1)
+
+    def test_stale_window_is_proportional_to_the_ttl_up_to_its_maximum(self):
+        self.assertLessEqual(stale_time(300), 300 * CACHE_STALE_FACTOR * (1 + CACHE_TTL_JITTER) + 1)
+        self.assertGreaterEqual(stale_time(7 * 86400), CACHE_STALE_MAX_TIME * (1 - CACHE_TTL_JITTER) - 1)
+        self.assertLessEqual(stale_time(7 * 86400), CACHE_STALE_MAX_TIME * (1 + CACHE_TTL_JITTER) + 1)
+
+    def test_decode_rejects_other_versions(self):
+        data = bytes((CACHE_SCHEMA_VERSION + 1, 0, 0, 0, 0, 0)) + b'[]'
+
+        with self.assertRaises(ValueError):
+            decode_book(data)
+
+
+if __name__ == '__main__':
+    unittest.main()
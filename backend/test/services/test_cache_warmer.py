@@ -0,0 +1,68 @@
+"""Module for testing that CacheWarmer fetches sorted batches, resumes from its checkpoint and stops while degraded."""
+import unittest
+
+import fakeredis
+import requests
+
+from app.exceptions.invalid_request_error import InvalidRequestError
+from app.services.cache_warmer import CacheWarmer, warm_checkpoint_key
+from test.services.recording_book_service import RecordingBookService
+
+
+class CacheWarmerTestCase(unittest.TestCase):
+    """Tests for CacheWarmer."""
+
+    isbn13s = {'9780000000002', '9780000000019', '9780000000026', '9780000000033', '9780000000040'}
+
+    def setUp(self):
+        self.redis_client = fakeredis.FakeRedis()
+
+    def _warmer(self, book_service):
+        return CacheWarmer(book_service=book_service, redis_client=self.redis_client, batch_size=2, checkpoint_ttl=60)
+
+    def test_warms_sorted_batches_and_clears_the_checkpoint(self):
+        book_service = RecordingBookService()
+        warmer = self._warmer(book_service)
+        warmed = []
+
+        finished = warmer.warm(warmer.pending(self.isbn13s), on_batch=warmed.append)
+
+        self.assertTrue(finished)
+        self.assertEqual(sorted(self.isbn13s), [isbn for batch in book_service.batches for isbn in batch])
+        self.assertEqual([2, 2, 1], warmed)
+        self.assertIsNone(self.redis_client.get(warm_checkpoint_key()))
+
+    def test_interrupted_run_resumes_after_the_last_batch(self):
+        interrupted = self._warmer(RecordingBookService(fail_at=1))
+        with self.assertRaises(InvalidRequestError):
+            interrupted.warm(interrupted.pending(self.isbn13s))
+
+        book_service = RecordingBookService()
+        self._warmer(book_service).warm(self._warmer(book_service).pending(self.isbn13s))
+
+        self.assertEqual(sorted(self.isbn13s)[2:], [isbn for batch in book_service.batches for isbn in batch])
+
+    def test_run_interrupted_by_a_failed_isbndb_request_resumes_after_the_last_batch(self):
+        interrupted = self._warmer(RecordingBookService(fail_at=1, error=requests.HTTPError('401 Client Error')))
+        with self.assertRaises(requests.HTTPError):
+            interrupted.warm(interrupted.pending(self.isbn13s))
+
+        self.assertEqual(sorted(self.isbn13s)[2:], self._warmer(RecordingBookService()).pending(self.isbn13s))
+
+    def test_stops_without_checkpointing_while_degraded(self):
+        warmer = self._warmer(RecordingBookService(degrade_at=0))
+
+        finished = warmer.warm(warmer.pending(self.isbn13s))
+
+        self.assertFalse(finished)
+        self.assertEqual(sorted(self.isbn13s), warmer.pending(self.isbn13s))
+
+    def test_restart_ignores_the_checkpoint(self):
+        self.redis_client.set(warm_checkpoint_key(), sorted(self.isbn13s)[2])
+
+        self.assertEqual(sorted(self.isbn13s)[3:], self._warmer(RecordingBookService()).pending(self.isbn13s))
+        self.assertEqual(sorted(self.isbn13s), self._warmer(RecordingBookService()).pending(self.isbn13s, restart=True))
+
+
+if __name__ == '__main__':
+    unittest.main()
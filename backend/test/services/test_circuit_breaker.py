@@ -0,0 +1,96 @@
+"""Module for testing the retries and the circuit breaker of the upstream calls."""
+import time
+import unittest
+from types import SimpleNamespace
+
+import requests
+
+from app.services.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+
+class CircuitBreakerTestCase(unittest.TestCase):
+    """Tests for CircuitBreaker."""
+
+    def _circuit_breaker(self, failure_threshold=2, reset_timeout=0.1, retries=0):
+        return CircuitBreaker(
+            name='isbndb',
+            failure_threshold=failure_threshold,
+            reset_timeout=reset_timeout,
+            retries=retries,
+            retry_base_delay=0.001,
+            retry_max_delay=0.002,
+        )
+
+    @staticmethod
+    def _response(status_code):
+        return SimpleNamespace(status_code=status_code)
+
+    @staticmethod
+    def _fail():
+        raise requests.ConnectionError('connection refused')
+
+    def test_retries_transient_failures(self):
+        circuit_breaker = self._circuit_breaker(retries=2)
+        responses = iter([self._response(503), self._response(429), self._response(200)])
+
+        response = circuit_breaker.call(lambda: next(responses))
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(CircuitBreaker.CLOSED, circuit_breaker.state)
+
+    def test_does_not_retry_client_errors(self):
+        circuit_breaker = self._circuit_breaker(retries=2)
+        calls = []
+
+        response = circuit_breaker.call(lambda: calls.append(1) or self._response(404))
+
+        self.assertEqual(404, response.status_code)
+        self.assertEqual(1, len(calls))
+
+    def test_returns_last_transient_response_after_retries(self):
+        circuit_breaker = self._circuit_breaker(retries=1)
+
+        response = circuit_breaker.call(lambda: self._response(502))
+
+        self.assertEqual(502, response.status_code)
+        self.assertEqual(1, circuit_breaker.stats()['failures'])
+
+    def test_opens_after_threshold_and_fails_fast(self):
+        circuit_breaker = self._circuit_breaker(failure_threshold=2)
+        for _ in range(2):
+            with self.assertRaises(requests.ConnectionError):
+                circuit_breaker.call(self._fail)
+
+        calls = []
+        with self.assertRaises(CircuitOpenError) as context:
+            circuit_breaker.call(lambda: calls.append(1) or self._response(200))
+
+        self.assertEqual(503, context.exception.code)
+        self.assertEqual([], calls)
+        self.assertTrue(circuit_breaker.is_open)
+
+    def test_successful_probe_closes_the_circuit(self):
+        circuit_breaker = self._circuit_breaker(failure_threshold=1, reset_timeout=0.05)
+        with self.assertRaises(requests.ConnectionError):
+            circuit_breaker.call(self._fail)
+
+        time.sleep(0.06)
+        self.assertEqual(CircuitBreaker.HALF_OPEN, circuit_breaker.state)
+        circuit_breaker.call(lambda: self._response(200))
+
+        self.assertEqual({'state': CircuitBreaker.CLOSED, 'failures': 0}, circuit_breaker.stats())
+
+    def test_failed_probe_opens_the_circuit_again(self):
+        circuit_breaker = self._circuit_breaker(failure_threshold=1, reset_timeout=0.05)
+        with self.assertRaises(requests.ConnectionError):
+            circuit_breaker.call(self._fail)
+
+        time.sleep(0.06)
+        with self.assertRaises(requests.ConnectionError):
+            circuit_breaker.call(self._fail)
+
+        self.assertTrue(circuit_breaker.is_open)
+
+
+if __name__ == '__main__':
+    unittest.main()
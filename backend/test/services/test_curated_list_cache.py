@@ -0,0 +1,71 @@
+"""Module for testing that CuratedListCache never serves a response built before the last curator write."""
+import unittest
+
+import fakeredis
+
+from app.services.curated_list_cache import CuratedListCache, curated_list_key
+
+
+class CuratedListCacheTestCase(unittest.TestCase):
+    """Tests for CuratedListCache."""
+
+    def setUp(self):
+        self.redis_client = fakeredis.FakeRedis()
+        self.cache = CuratedListCache(redis_client=self.redis_client, ttl=60)
+
+    def test_serves_the_response_built_at_the_current_version(self):
+        _, _, version = self.cache.get(1)
+        self.cache.put(1, version, b'{"books":[{"isbn13":"9780000000002"}]}', ['9780000000002'])
+
+        self.assertEqual((b'{"books":[{"isbn13":"9780000000002"}]}', ['9780000000002'], version), self.cache.get(1))
+        self.assertEqual((None, [], 0), self.cache.get(2))
+
+    def test_response_without_books_has_no_isbn13s(self):
+        self.cache.put(1, self.cache.get(1)[2], b'{"books":[]}', [])
+
+        self.assertEqual((b'{"books":[]}', [], 0), self.cache.get(1))
+
+    def test_bump_invalidates_the_response(self):
+        self.cache.put(1, self.cache.get(1)[2], b'{"books":[]}', [])
+
+        self.cache.bump(1)
+
+        self.assertEqual((None, [], 1), self.cache.get(1))
+
+    def test_response_built_before_a_bump_is_never_served(self):
+        _, _, version = self.cache.get(1)
+        self.cache.bump(1)
+        self.cache.put(1, version, b'{"books":["outdated"]}', [])
+
+        self.assertIsNone(self.cache.get(1)[0])
+
+    def test_pages_are_kept_apart_and_invalidated_with_the_list(self):
+        _, _, version = self.cache.get(1, page='1:10')
+        self.cache.put(1, version, b'{"books":["page"]}', [], page='1:10')
+
+        self.assertIsNone(self.cache.get(1)[0])
+        self.assertEqual(b'{"books":["page"]}', self.cache.get(1, page='1:10')[0])
+
+        self.cache.bump(1)
+
+        self.assertIsNone(self.cache.get(1, page='1:10')[0])
+
+    def test_bump_drops_the_responses_of_every_page(self):
+        for page in ('1:10', '2:10', '1:20'):
+            self.cache.put(1, 0, b'{"books":[]}', [], page=page)
+
+        self.cache.bump(1)
+
+        self.assertEqual({b'version': b'1'}, self.redis_client.hgetall(curated_list_key(1)))
+
+    def test_put_does_not_push_the_expiry_of_the_list_forward(self):
+        self.cache.put(1, 0, b'{"books":[]}', [], page='1:10')
+        self.redis_client.expire(curated_list_key(1), 5)
+
+        self.cache.put(1, 0, b'{"books":[]}', [], page='2:10')
+
+        self.assertLessEqual(self.redis_client.ttl(curated_list_key(1)), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
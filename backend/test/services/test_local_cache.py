@@ -0,0 +1,64 @@
+"""Module for testing the in-process LocalCache."""
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from app.services.local_cache import LocalCache, _process_id
+
+
+class LocalCacheTestCase(unittest.TestCase):
+    """Tests for the LocalCache."""
+
+    def setUp(self):
+        self.redis_client = MagicMock()
+        self.cache = LocalCache(name='test', redis_client=self.redis_client, max_entries=2, ttl=60)
+
+    def test_get_returns_cached_value_and_counts_hits_and_misses(self):
+        self.assertIsNone(self.cache.get('9780061120084'))
+        self.cache.set('9780061120084', {'title': 'Test Title'})
+
+        self.assertEqual({'title': 'Test Title'}, self.cache.get('9780061120084'))
+        stats = self.cache.stats()
+        self.assertEqual(1, stats['hits'])
+        self.assertEqual(1, stats['misses'])
+
+    def test_set_evicts_least_recently_used_entry(self):
+        self.cache.set('a', 1)
+        self.cache.set('b', 2)
+        self.cache.get('a')
+        self.cache.set('c', 3)
+
+        self.assertEqual(1, self.cache.get('a'))
+        self.assertIsNone(self.cache.get('b'))
+        self.assertEqual(3, self.cache.get('c'))
+
+    def test_get_returns_none_when_entry_expired(self):
+        self.cache.set('a', 1, ttl=0.01)
+        time.sleep(0.02)
+
+        self.assertIsNone(self.cache.get('a'))
+        self.assertEqual(0, self.cache.stats()['size'])
+
+    def test_invalidate_drops_entry_and_publishes_key(self):
+        self.cache.set('a', 1)
+        self.cache.invalidate('a')
+
+        self.assertIsNone(self.cache.get('a'))
+        self.redis_client.publish.assert_called_once_with('adb:cache:invalidate:test', f'{_process_id} a')
+
+    def test_invalidation_message_drops_entry(self):
+        self.cache.set('a', 1)
+        self.cache._on_invalidation({'type': 'message', 'data': b'other-process a'})
+
+        self.assertIsNone(self.cache.get('a'))
+
+    def test_own_invalidation_message_is_ignored(self):
+        self.cache.invalidate('a')
+        self.cache.set('a', 2)
+        self.cache._on_invalidation({'type': 'message', 'data': self.redis_client.publish.call_args.args[1].encode()})
+
+        self.assertEqual(2, self.cache.get('a'))
+
+
+if __name__ == '__main__':
+    unittest.main()
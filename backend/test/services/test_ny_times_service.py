@@ -0,0 +1,151 @@
+"""Module for testing that NyTimesService paginates the lists, caches their pages, and falls back on their snapshots."""
+import json
+import time
+import unittest
+from datetime import datetime, timedelta, timezone
+
+import fakeredis
+
+from app.config import REDIS_EXPIRY_TIME
+from app.services.cache_codec import decode_body, is_stale, nyt_key, nyt_pages_key, page_field, read_fresh_until
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.ny_times_service import NyTimesService
+from test.services.in_memory_snapshot_store import InMemorySnapshotStore
+from test.services.recording_refresher import RecordingRefresher
+from test.services.stub_ny_times_client import StubNyTimesClient
+
+
+class NyTimesServiceTestCase(unittest.TestCase):
+    """Tests for NyTimesService."""
+
+    path = 'combined-print-and-e-book-fiction.json'
+
+    def setUp(self):
+        self.redis_client = fakeredis.FakeRedis()
+        self.http_client = StubNyTimesClient(size=15)
+        self.snapshot_store = InMemorySnapshotStore()
+        self.refresher = RecordingRefresher()
+        self.service = NyTimesService(
+            redis_client=self.redis_client,
+            http_client=self.http_client,
+            refresher=self.refresher,
+            circuit_breaker=CircuitBreaker(
+                name='ny_times',
+                failure_threshold=1,
+                reset_timeout=30,
+                retries=0,
+                retry_base_delay=0,
+                retry_max_delay=0,
+            ),
+            snapshot_store=self.snapshot_store,
+        )
+
+    def test_returns_only_the_requested_page(self):
+        response = self.service.fetch_books(self.path, page=2, limit=10)
+
+        self.assertEqual(['Book 10', 'Book 11', 'Book 12', 'Book 13', 'Book 14'],
+                         [book['title'] for book in response['books']])
+        self.assertEqual(15, response['total_results'])
+
+    def test_precomputes_the_pages_of_common_limits(self):
+        self.service.fetch_books(self.path, page=1, limit=5)
+
+        self.assertEqual({b'1:10', b'2:10', b'1:20'}, set(self.redis_client.hkeys(nyt_pages_key(self.path))))
+
+    def test_precomputed_pages_are_served_without_the_list(self):
+        first = self.service.fetch_books(self.path, page=1, limit=10)
+
+        self.redis_client.delete(nyt_key(self.path))
+        precomputed = self.service.fetch_books(self.path, page=1, limit=10)
+        self.redis_client.hdel(nyt_pages_key(self.path), page_field(1, 10))
+        self.snapshot_store.snapshots.clear()
+        self.service.fetch_books(self.path, page=1, limit=3)
+
+        self.assertEqual(first, precomputed)
+        self.assertEqual(2, self.http_client.calls)
+
+    def test_precomputed_page_body_is_returned_as_stored(self):
+        self.service.fetch_books(self.path, page=1, limit=10)
+
+        stored = self.redis_client.hget(nyt_pages_key(self.path), page_field(2, 10))
+        body, isbn13s = self.service.fetch_books_body(self.path, page=2, limit=10)
+
+        self.assertEqual(decode_body(stored), (body, isbn13s))
+        self.assertEqual([book['isbn13'] for book in json.loads(body)['books']], isbn13s)
+        self.assertEqual(5, len(isbn13s))
+
+    def test_page_past_the_end_is_empty(self):
+        response = self.service.fetch_books(self.path, page=3, limit=10)
+
+        self.assertEqual([], response['books'])
+        self.assertEqual(15, response['total_results'])
+
+    def test_list_is_fresh_until_its_next_publication(self):
+        next_published = datetime.now(timezone.utc) + timedelta(days=3)
+        self.http_client.next_published_date = next_published.strftime('%Y-%m-%d')
+
+        self.service.fetch_books(self.path, page=1, limit=10)
+
+        expected = next_published.replace(hour=0, minute=0, second=0, microsecond=0).timestamp()
+        self.assertAlmostEqual(expected, read_fresh_until(self.redis_client.get(nyt_key(self.path))), delta=1)
+
+    def test_list_without_upcoming_publication_is_fresh_for_an_hour(self):
+        self.http_client.next_published_date = '2020-01-05'
+
+        self.service.fetch_books(self.path, page=1, limit=10)
+
+        fresh_for = read_fresh_until(self.redis_client.get(nyt_key(self.path))) - time.time()
+        self.assertLess(fresh_for, REDIS_EXPIRY_TIME * 2)
+
+    def test_overview_fills_only_the_catalog(self):
+        names = self.service.fetch_list_names()
+
+        self.assertEqual({'hardcover-fiction': 'Hardcover Fiction', 'young-adult': 'Young Adult'}, names)
+        self.assertEqual(1, self.http_client.calls)
+        self.assertIsNone(self.redis_client.get(nyt_key('hardcover-fiction.json')))
+        self.assertEqual({}, self.snapshot_store.snapshots)
+
+    def test_list_of_the_catalog_is_fetched_in_full_once(self):
+        self.service.fetch_list_names()
+        first = self.service.fetch_books('hardcover-fiction.json', page=1, limit=10)
+        second = self.service.fetch_books('hardcover-fiction.json', page=2, limit=10)
+
+        self.assertEqual(15, first['total_results'])
+        self.assertEqual(['Book 10', 'Book 11', 'Book 12', 'Book 13', 'Book 14'], [book['title'] for book in second['books']])
+        self.assertEqual(2, self.http_client.calls)
+        self.assertIn('hardcover-fiction.json', self.snapshot_store.snapshots)
+
+    def test_books_without_an_isbn_are_skipped(self):
+        self.http_client.books[1]['primary_isbn13'] = None
+
+        books = self.service.fetch_books(self.path, page=1, limit=20)['books']
+
+        self.assertEqual(14, len(books))
+        self.assertNotIn('Book 1', [book['title'] for book in books])
+
+    def test_list_missing_from_redis_is_loaded_from_its_snapshot(self):
+        next_published = (datetime.now(timezone.utc) + timedelta(days=3)).strftime('%Y-%m-%d')
+        self.http_client.next_published_date = next_published
+        first = self.service.fetch_books(self.path, page=1, limit=10)
+
+        self.redis_client.flushall()
+        restored = self.service.fetch_books(self.path, page=1, limit=10)
+
+        self.assertEqual(first, restored)
+        self.assertEqual(1, self.http_client.calls)
+        self.assertEqual([], self.refresher.refreshed)
+        self.assertFalse(is_stale(self.redis_client.get(nyt_key(self.path))))
+
+    def test_outdated_snapshot_is_served_while_refreshed(self):
+        self.http_client.next_published_date = '2020-01-05'
+        self.service.fetch_books(self.path, page=1, limit=10)
+
+        self.redis_client.flushall()
+        self.service.fetch_books(self.path, page=1, limit=10)
+
+        self.assertEqual(1, self.http_client.calls)
+        self.assertEqual([nyt_key(self.path)], self.refresher.refreshed)
+
+
+if __name__ == '__main__':
+    unittest.main()
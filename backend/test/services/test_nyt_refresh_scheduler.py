@@ -0,0 +1,78 @@
+"""Module for testing that only the leading NytRefreshScheduler refreshes the NYT lists missing or going stale."""
+import time
+import unittest
+
+import fakeredis
+
+from app.services.cache_codec import encode_book_responses, nyt_key
+from app.services.nyt_refresh_scheduler import NytRefreshScheduler
+from test.services.recording_ny_times_service import RecordingNyTimesService
+
+
+class NytRefreshSchedulerTestCase(unittest.TestCase):
+    """Tests for NytRefreshScheduler."""
+
+    paths = ('fiction.json', 'non-fiction.json')
+
+    def setUp(self):
+        self.server = fakeredis.FakeServer()
+        self.redis_client = fakeredis.FakeRedis(server=self.server)
+
+    def _scheduler(self, refresh_ahead=60, fresh_for=3600):
+        redis_client = fakeredis.FakeRedis(server=self.server)
+        return NytRefreshScheduler(
+            nyt_service=RecordingNyTimesService(redis_client, fresh_for=fresh_for),
+            redis_client=redis_client,
+            paths=self.paths,
+            interval=0.01,
+            refresh_ahead=refresh_ahead,
+            leader_ttl=1,
+            retry_after=60,
+        )
+
+    def test_refreshes_missing_lists_and_lists_going_stale(self):
+        self.redis_client.set(nyt_key('fiction.json'), encode_book_responses([], int(time.time()) + 30))
+        scheduler = self._scheduler(refresh_ahead=60)
+
+        self.assertEqual(list(self.paths), scheduler.run_once())
+        self.assertEqual([], scheduler.run_once())
+
+    def test_list_refreshed_ahead_of_its_unchanged_publication_is_not_refetched_on_the_next_check(self):
+        scheduler = self._scheduler(refresh_ahead=60, fresh_for=30)
+
+        self.assertEqual(list(self.paths), scheduler.run_once())
+        self.assertEqual([], scheduler.run_once())
+        self.assertEqual(list(self.paths), scheduler.nyt_service.refreshed)
+
+    def test_list_refreshed_lately_is_refreshed_again_once_missing(self):
+        scheduler = self._scheduler(refresh_ahead=60, fresh_for=30)
+        scheduler.run_once()
+
+        self.redis_client.delete(nyt_key('fiction.json'))
+
+        self.assertEqual(['fiction.json'], scheduler.run_once())
+
+    def test_only_the_leader_refreshes(self):
+        leader = self._scheduler()
+        follower = self._scheduler()
+
+        leader.run_once()
+        self.redis_client.delete(nyt_key('fiction.json'))
+
+        self.assertEqual([], follower.run_once())
+        self.assertFalse(follower.is_leader)
+        self.assertEqual(['fiction.json'], leader.run_once())
+
+    def test_another_scheduler_takes_over_after_resign(self):
+        leader = self._scheduler()
+        follower = self._scheduler()
+        leader.run_once()
+
+        leader.resign()
+
+        self.assertEqual([], follower.run_once())
+        self.assertTrue(follower.is_leader)
+
+
+if __name__ == '__main__':
+    unittest.main()
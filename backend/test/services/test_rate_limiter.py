@@ -0,0 +1,88 @@
+"""Module for testing that RateLimiter paces, queues and refuses upstream calls, and shares its budget across workers."""
+import time
+import unittest
+
+import fakeredis
+
+from app.exceptions.invalid_request_error import InvalidRequestError
+from app.services.rate_limiter import RateLimiter
+
+
+class RateLimiterTestCase(unittest.TestCase):
+    """Tests for RateLimiter."""
+
+    def setUp(self):
+        self.server = fakeredis.FakeServer()
+        self.redis_client = fakeredis.FakeRedis(server=self.server)
+
+    def _rate_limiter(self, rate=20, burst=2, daily_quota=0, max_wait=1.0, redis_client=None):
+        return RateLimiter(
+            redis_client=redis_client or self.redis_client,
+            name='isbndb',
+            rate=rate,
+            burst=burst,
+            daily_quota=daily_quota,
+            max_wait=max_wait,
+            ledger_ttl=60,
+        )
+
+    def test_burst_is_granted_without_waiting(self):
+        rate_limiter = self._rate_limiter(rate=1, burst=3)
+        start = time.monotonic()
+
+        for _ in range(3):
+            rate_limiter.acquire('book')
+
+        self.assertLess(time.monotonic() - start, 0.5)
+
+    def test_calls_over_the_rate_queue(self):
+        rate_limiter = self._rate_limiter(rate=20, burst=1)
+        start = time.monotonic()
+
+        for _ in range(4):
+            rate_limiter.acquire('book')
+
+        # Three calls over the burst, each waiting 1/20 s for its token.
+        self.assertGreaterEqual(time.monotonic() - start, 0.14)
+
+    def test_calls_that_would_wait_too_long_are_refused(self):
+        rate_limiter = self._rate_limiter(rate=1, burst=1, max_wait=0.5)
+        rate_limiter.acquire('book')
+
+        with self.assertRaises(InvalidRequestError) as context:
+            rate_limiter.acquire('book')
+
+        self.assertEqual(429, context.exception.code)
+
+    def test_ledger_counts_calls_per_endpoint(self):
+        rate_limiter = self._rate_limiter(rate=100, burst=10)
+
+        rate_limiter.acquire('book')
+        rate_limiter.acquire('book')
+        rate_limiter.acquire('search')
+
+        self.assertEqual({'book': 2, 'search': 1, 'total': 3}, rate_limiter.usage())
+
+    def test_calls_over_the_daily_quota_are_refused(self):
+        rate_limiter = self._rate_limiter(rate=100, burst=10, daily_quota=2)
+        rate_limiter.acquire('book')
+        rate_limiter.acquire('books')
+
+        with self.assertRaises(InvalidRequestError) as context:
+            rate_limiter.acquire('search')
+
+        self.assertEqual(429, context.exception.code)
+        self.assertEqual(2, rate_limiter.usage()['total'])
+
+    def test_workers_share_the_bucket(self):
+        worker_1 = self._rate_limiter(rate=1, burst=1, max_wait=0.5)
+        worker_2 = self._rate_limiter(rate=1, burst=1, max_wait=0.5,
+                                      redis_client=fakeredis.FakeRedis(server=self.server))
+        worker_1.acquire('book')
+
+        with self.assertRaises(InvalidRequestError):
+            worker_2.acquire('book')
+
+
+if __name__ == '__main__':
+    unittest.main()
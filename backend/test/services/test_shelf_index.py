@@ -0,0 +1,84 @@
+"""Module for testing that ShelfIndex is rebuilt once, kept in sync by shelf writes, and annotates book bodies."""
+import json
+import unittest
+
+import fakeredis
+
+from app.services.shelf_index import ShelfIndex, shelf_index_key
+from app.utils.json_body import to_json_bytes
+
+
+class ShelfIndexTestCase(unittest.TestCase):
+    """Tests for ShelfIndex."""
+
+    user_id = 'auth0|user'
+
+    def setUp(self):
+        self.redis_client = fakeredis.FakeRedis(decode_responses=True)
+        self.stored = {'9780000000002': 'read', '9780000000019': 'want-to-read'}
+        self.loads = 0
+        self.shelf_index = ShelfIndex(redis_client=self.redis_client, load_shelves=self._load_shelves, ttl=60)
+
+    def _load_shelves(self, user_id):
+        self.loads += 1
+        return dict(self.stored) if user_id == self.user_id else {}
+
+    def test_missing_index_is_rebuilt_once_from_the_database(self):
+        first = self.shelf_index.shelves(self.user_id, ['9780000000002', '9780000000026'])
+        second = self.shelf_index.shelves(self.user_id, ['9780000000019'])
+
+        self.assertEqual({'9780000000002': 'read'}, first)
+        self.assertEqual({'9780000000019': 'want-to-read'}, second)
+        self.assertEqual(1, self.loads)
+
+    def test_user_without_books_is_not_rebuilt_every_lookup(self):
+        self.shelf_index.shelves('auth0|other', ['9780000000002'])
+        self.shelf_index.shelves('auth0|other', ['9780000000002'])
+
+        self.assertEqual(1, self.loads)
+
+    def test_writes_keep_the_index_in_sync(self):
+        self.shelf_index.shelves(self.user_id, [])
+
+        self.shelf_index.set_shelf(self.user_id, '9780000000026', 'currently-reading')
+        self.shelf_index.set_shelf(self.user_id, '9780000000002', 'want-to-read')
+        self.shelf_index.remove(self.user_id, '9780000000019')
+
+        self.assertEqual(
+            {'9780000000002': 'want-to-read', '9780000000026': 'currently-reading'},
+            self.shelf_index.shelves(self.user_id, ['9780000000002', '9780000000019', '9780000000026']),
+        )
+        self.assertEqual(1, self.loads)
+
+    def test_writes_to_a_missing_index_do_not_make_it_complete(self):
+        self.shelf_index.set_shelf(self.user_id, '9780000000026', 'read')
+
+        self.assertEqual({'9780000000019': 'want-to-read'}, self.shelf_index.shelves(self.user_id, ['9780000000019']))
+        self.assertEqual(1, self.loads)
+
+    def test_annotates_books_in_place(self):
+        books = [{'isbn13': '9780000000002'}, {'isbn13': '9780000000026'}, {'title': 'No ISBN'}]
+
+        annotated = self.shelf_index.annotate(self.user_id, books)
+
+        self.assertTrue(annotated)
+        self.assertEqual([{'isbn13': '9780000000002', 'shelf': 'read'}, {'isbn13': '9780000000026'}, {'title': 'No ISBN'}],
+                         books)
+
+    def test_body_without_books_on_a_shelf_is_returned_as_given(self):
+        # Not decoded: the shelves are looked up by the ISBN-13s stored along with the body.
+        body = b'not decoded'
+
+        self.assertIs(body, self.shelf_index.annotate_body(self.user_id, body, ['9780000000026']))
+        self.assertEqual(60, self.redis_client.ttl(shelf_index_key(self.user_id)))
+
+    def test_body_with_books_on_a_shelf_is_annotated(self):
+        body = to_json_bytes({'books': [{'isbn13': '9780000000002'}, {'isbn13': '9780000000026'}]})
+
+        books = json.loads(self.shelf_index.annotate_body(self.user_id, body, ['9780000000002', '9780000000026']))['books']
+
+        self.assertEqual([{'isbn13': '9780000000002', 'shelf': 'read'}, {'isbn13': '9780000000026'}], books)
+
+
+if __name__ == '__main__':
+    unittest.main()
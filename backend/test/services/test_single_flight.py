@@ -0,0 +1,54 @@
+"""Module for testing the request coalescing helpers."""
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+from app.services.single_flight import SingleFlight, acquire_lock
+
+
+class SingleFlightTestCase(unittest.TestCase):
+    """Tests for SingleFlight and the Redis lock helpers."""
+
+    def test_concurrent_calls_for_same_key_share_one_call(self):
+        single_flight = SingleFlight()
+        calls = []
+        started = threading.Event()
+
+        def fetch():
+            calls.append(1)
+            started.set()
+            time.sleep(0.1)
+            return {'isbn13': '9780061120084'}
+
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            leader = executor.submit(single_flight.do, '9780061120084', fetch)
+            started.wait()
+            followers = [executor.submit(single_flight.do, '9780061120084', fetch) for _ in range(4)]
+            results = [leader.result()] + [f.result() for f in followers]
+
+        self.assertEqual(1, len(calls))
+        self.assertTrue(all(result == {'isbn13': '9780061120084'} for result in results))
+
+    def test_exception_is_raised_and_key_released(self):
+        single_flight = SingleFlight()
+
+        def fail():
+            raise ValueError('upstream error')
+
+        with self.assertRaises(ValueError):
+            single_flight.do('9780061120084', fail)
+
+        self.assertEqual(1, single_flight.do('9780061120084', lambda: 1))
+
+    def test_acquire_lock_returns_none_when_held(self):
+        redis_client = MagicMock()
+        redis_client.set.return_value = None
+
+        self.assertIsNone(acquire_lock(redis_client, 'lock', ttl=1))
+        redis_client.set.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+"""Module for testing the timeouts and the connection pool statistics of UpstreamClient."""
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import requests
+
+from app.services import upstream_client
+from app.services.upstream_client import UpstreamClient, get_upstream_client, upstream_pool_stats
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Answers every request with a short body, after a second on /slow; keeps the connection alive."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        if self.path == '/slow':
+            time.sleep(1)
+        self.send_response(200)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'ok')
+
+    def log_message(self, format, *args):
+        pass
+
+
+class UpstreamClientTestCase(unittest.TestCase):
+    """Tests for UpstreamClient, calling an HTTP server of the test process."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        cls.server.daemon_threads = True
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.url = f'http://127.0.0.1:{cls.server.server_port}'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.client = UpstreamClient(name='test', connect_timeout=1, read_timeout=0.2, pool_connections=1, pool_maxsize=2)
+        self.addCleanup(self.client.session.close)
+
+    def test_request_applies_the_read_timeout_of_the_upstream(self):
+        with self.assertRaises(requests.ReadTimeout):
+            self.client.get(f'{self.url}/slow')
+
+    def test_request_timeout_can_be_overridden_per_call(self):
+        self.assertEqual(b'ok', self.client.get(f'{self.url}/slow', timeout=(1, 3)).content)
+
+    def test_pool_stats_count_the_requests_served_over_a_kept_alive_connection(self):
+        self.client.get(self.url)
+        self.client.get(self.url)
+
+        self.assertEqual({
+            'connect_timeout': 1,
+            'read_timeout': 0.2,
+            'hosts': {
+                f'http://127.0.0.1:{self.server.server_port}': {
+                    'maxsize': 2,
+                    'idle': 1,
+                    'connections_opened': 1,
+                    'requests': 2,
+                },
+            },
+        }, self.client.pool_stats())
+
+    def test_pool_stats_without_requests_have_no_hosts(self):
+        self.assertEqual({}, self.client.pool_stats()['hosts'])
+
+    def test_get_upstream_client_creates_one_client_per_upstream(self):
+        with mock.patch.dict(upstream_client._clients, clear=True):
+            client = get_upstream_client('isbndb')
+
+            self.assertIs(client, get_upstream_client('isbndb'))
+            self.assertEqual(['isbndb'], list(upstream_pool_stats()))
+
+
+if __name__ == '__main__':
+    unittest.main()
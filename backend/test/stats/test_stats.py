@@ -0,0 +1,33 @@
+import unittest
+from unittest import mock
+
+from app.di import di_config
+from test.base_test_case import BaseTestCase
+
+
+class StatsTestCase(BaseTestCase):
+
+    def test_stats_success(self):
+        with mock.patch.object(di_config.isbndb_rate_limiter, 'usage', return_value={'total': 0}):
+            res = self.client.get('/stats', headers=self._get_headers(["stats:get"]))
+
+        self.assertEqual(res.status_code, 200)
+        data = res.get_json()
+        self.assertTrue(data['success'])
+        self.assertIn('upstreams', data)
+        self.assertEqual({'total': 0}, data['quotas']['isbndb'])
+        self.assertIn('circuits', data)
+
+    def test_stats_401_without_token(self):
+        res = self.client.get('/stats')
+
+        self.assert_error(res, expect_status_code=401, expect_message='Authorization header is expected.')
+
+    def test_stats_403_for_missing_permission(self):
+        res = self.client.get('/stats', headers=self._get_headers(["booklist:get"]))
+
+        self.assert_error(res, expect_status_code=403, expect_message='Permission not found.')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,26 @@
+"""Module for testing the ISBN conversion helpers."""
+import unittest
+
+from app.utils.isbn_utils import isbn10_to_isbn13, to_isbn13
+
+
+class IsbnUtilsTestCase(unittest.TestCase):
+    """Tests for the ISBN conversion helpers."""
+
+    def test_isbn10_to_isbn13(self):
+        self.assertEqual('9780393609646', isbn10_to_isbn13('0393609642'))
+        self.assertEqual('9780471958697', isbn10_to_isbn13('0471958697'))
+
+    def test_isbn10_to_isbn13_with_x_check_digit(self):
+        self.assertEqual('9781234567897', isbn10_to_isbn13('123456789X'))
+
+    def test_to_isbn13_keeps_isbn13(self):
+        self.assertEqual('9791032305690', to_isbn13('9791032305690'))
+
+    def test_to_isbn13_rejects_invalid_isbn(self):
+        self.assertIsNone(to_isbn13('1234567890'))
+        self.assertIsNone(to_isbn13(None))
+
+
+if __name__ == '__main__':
+    unittest.main()
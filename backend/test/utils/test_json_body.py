@@ -0,0 +1,47 @@
+"""Module for testing the pre-serialized JSON response body helpers."""
+import json
+import unittest
+
+from flask import Flask, jsonify
+
+from app.utils.json_body import book_body, json_body_response, mark_degraded, to_json_bytes
+
+
+class JsonBodyTestCase(unittest.TestCase):
+    """Tests for the pre-serialized JSON response body helpers."""
+
+    book = {'isbn13': '9780393609646', 'title': 'Être et temps', 'authors': ['Martin Heidegger']}
+
+    def setUp(self):
+        self.app = Flask(__name__)
+
+    def test_to_json_bytes_matches_jsonify(self):
+        with self.app.app_context():
+            self.assertEqual(jsonify({'success': True, 'book': self.book}).get_data(),
+                             to_json_bytes({'success': True, 'book': self.book}) + b'\n')
+
+    def test_book_body_splices_the_shelf(self):
+        body = book_body(to_json_bytes(self.book), 'read')
+
+        self.assertEqual({'success': True, 'book': {**self.book, 'shelf': 'read'}}, json.loads(body))
+
+    def test_book_body_without_shelf(self):
+        body = book_body(to_json_bytes(self.book), None)
+
+        self.assertEqual({'success': True, 'book': {**self.book, 'shelf': None}}, json.loads(body))
+
+    def test_mark_degraded(self):
+        body = mark_degraded(to_json_bytes({'success': True}))
+
+        self.assertEqual({'success': True, 'degraded': True}, json.loads(body))
+
+    def test_json_body_response(self):
+        with self.app.app_context():
+            response = json_body_response(b'{"success":true}')
+
+        self.assertEqual('application/json', response.mimetype)
+        self.assertEqual({'success': True}, response.get_json())
+
+
+if __name__ == '__main__':
+    unittest.main()
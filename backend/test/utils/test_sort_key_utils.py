@@ -0,0 +1,54 @@
+"""Module for testing the fractional sort key helpers."""
+import unittest
+
+from app.utils.sort_key_utils import is_sort_key, key_between, keys_between, spread_keys
+
+
+class SortKeyUtilsTestCase(unittest.TestCase):
+    """Tests for the fractional sort key helpers."""
+
+    def test_key_between_sorts_between_its_bounds(self):
+        self.assertTrue('i' < key_between('i', 'j') < 'j')
+        self.assertTrue('az' < key_between('az', 'b') < 'b')
+        self.assertTrue(key_between(None, '1') < '1')
+        self.assertTrue('z' < key_between('z', None))
+
+    def test_repeated_moves_to_the_same_spot_keep_the_order(self):
+        sort_keys = ['9', 'i']
+        for _ in range(50):
+            sort_keys.insert(1, key_between(sort_keys[0], sort_keys[1]))
+
+        self.assertEqual(sorted(sort_keys), sort_keys)
+        self.assertEqual(len(sort_keys), len(set(sort_keys)))
+        self.assertLessEqual(max(len(sort_key) for sort_key in sort_keys), 12)
+
+    def test_key_between_rejects_unordered_bounds(self):
+        with self.assertRaises(ValueError):
+            key_between('j', 'i')
+
+    def test_keys_between_are_ordered_within_their_bounds_and_short(self):
+        sort_keys = keys_between('i', 'j', 100)
+
+        self.assertEqual(sorted(sort_keys), sort_keys)
+        self.assertEqual(100, len(set(sort_keys)))
+        self.assertTrue('i' < sort_keys[0] and sort_keys[-1] < 'j')
+        self.assertLessEqual(max(len(sort_key) for sort_key in sort_keys), 4)
+        self.assertEqual([], keys_between(None, None, 0))
+
+    def test_is_sort_key(self):
+        self.assertTrue(is_sort_key('0i'))
+        self.assertFalse(is_sort_key(''))
+        self.assertFalse(is_sort_key('i0'))
+        self.assertFalse(is_sort_key('I'))
+
+    def test_spread_keys_are_ordered_and_short(self):
+        sort_keys = spread_keys(100)
+
+        self.assertEqual(sorted(sort_keys), sort_keys)
+        self.assertEqual(100, len(set(sort_keys)))
+        self.assertLessEqual(max(len(sort_key) for sort_key in sort_keys), 2)
+        self.assertEqual([], spread_keys(0))
+
+
+if __name__ == '__main__':
+    unittest.main()